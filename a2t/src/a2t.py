@@ -27,6 +27,11 @@ from cliargs import cli_parser
 from component_analysis import ComponentAnalysis
 from stack_analysis import StackAnalysis
 from test_runner import start_tests
+from connection_pool import ConnectionPool, CONNECTION_WARM
+from dump_writer import DumpWriter
+from telemetry import Telemetry, TelemetryReporter
+from compare import run_comparison
+from distributed import Coordinator, serve_forever, authkey, AUTHKEY_VARIABLE
 
 
 # current version of this tool
@@ -65,6 +70,47 @@ def check_system(api):
         check_auth_token(api)
 
 
+def prepare_connection_pool(cfg):
+    """Prepare pool of keep-alive connections, but only when warm connections are selected."""
+    if cfg["connection"] != CONNECTION_WARM:
+        return None
+    return ConnectionPool(cfg["pool_size"], cfg["pool_per_host"])
+
+
+def prepare_dump_writer(cli_arguments):
+    """Prepare writer for REST API responses, but only when dumping is enabled."""
+    if not cli_arguments.dump_results:
+        return None
+    dump_writer = DumpWriter()
+    log.info("REST API responses will be dumped into '{d}/{p}_*'".format(
+        d=dump_writer.directory, p=dump_writer.prefix))
+    return dump_writer
+
+
+def prepare_coordinator(cli_arguments, cfg, component_analysis, stack_analysis):
+    """Start or connect to workers if the load is to be generated by more processes."""
+    if cli_arguments.workers:
+        coordinator = Coordinator.connect_to_workers(cli_arguments.workers.split(","),
+                                                     require_authkey())
+    elif cli_arguments.processes > 0:
+        log.info("Starting {n} worker processes".format(n=cli_arguments.processes))
+        coordinator = Coordinator.start_local_workers(cli_arguments.processes)
+    else:
+        return None
+    coordinator.setup(cfg, component_analysis, stack_analysis)
+    return coordinator
+
+
+def require_authkey():
+    """Return the key shared by coordinator and workers, exit when it is not set."""
+    key = authkey()
+    if key is None:
+        log.error("Fatal: {v} environment variable needs to be set to a secret key "
+                  "when workers on other hosts are used".format(v=AUTHKEY_VARIABLE))
+        sys.exit(1)
+    return key
+
+
 def show_version():
     """Show A2T version."""
     print("A2T version {major}.{minor}".format(major=VERSION_MAJOR, minor=VERSION_MINOR))
@@ -77,14 +123,22 @@ def main():
     if cli_arguments.version:
         show_version()
         sys.exit(0)
+    elif cli_arguments.command == "compare":
+        sys.exit(run_comparison(cli_arguments))
+    elif cli_arguments.worker:
+        serve_forever(cli_arguments.worker, require_authkey())
     else:
         cfg = setup(cli_arguments)
 
         coreapi_url = os.environ.get('F8A_SERVER_API_URL', None)
+        connection_pool = prepare_connection_pool(cfg)
+        dump_writer = prepare_dump_writer(cli_arguments)
         component_analysis = ComponentAnalysis(coreapi_url,
-                                               cfg["access_token"], cfg["user_key"], True)
+                                               cfg["access_token"], cfg["user_key"], dump_writer,
+                                               connection_pool)
         stack_analysis = StackAnalysis(coreapi_url,
-                                       cfg["access_token"], cfg["user_key"], True)
+                                       cfg["access_token"], cfg["user_key"], dump_writer,
+                                       connection_pool, cfg["polling"])
 
         check_system(component_analysis)
 
@@ -95,10 +149,24 @@ def main():
             log.error(e)
             sys.exit(0)
 
+        coordinator = prepare_coordinator(cli_arguments, cfg, component_analysis, stack_analysis)
+        cfg["coordinator"] = coordinator
+
+        cfg["telemetry"] = Telemetry(track_in_flight=coordinator is None)
+        reporter = TelemetryReporter(cfg["telemetry"], cfg["telemetry_interval"],
+                                     cfg["telemetry_port"])
+        reporter.start()
+
         t1 = time()
         tags = cfg["tags"]
         start_tests(cfg, tests, tags, component_analysis, stack_analysis)
         t2 = time()
+        reporter.stop()
+
+        if coordinator is not None:
+            coordinator.shutdown()
+        if dump_writer is not None:
+            dump_writer.close()
         log.info("Start time: {}".format(t1))
         log.info("End time:   {}".format(t2))
         log.info("Duration:   {}".format(t2 - t1))
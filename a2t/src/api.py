@@ -16,10 +16,30 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import json
 import requests
 from fastlog import log
 
 
+class BufferedResponse:
+    """Response read by the asynchronous HTTP client, mimicking requests.Response interface."""
+
+    def __init__(self, status_code, content, headers=None):
+        """Store the status code, the whole response body, and headers."""
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def json(self):
+        """Parse the response body as JSON."""
+        return json.loads(self.content.decode("utf-8"))
+
+    def raise_for_status(self):
+        """Raise an exception if the server returned HTTP error code."""
+        if self.status_code >= 400:
+            raise Exception("HTTP error {c}".format(c=self.status_code))
+
+
 class Api:
     """Class representing common API."""
 
@@ -27,12 +47,20 @@ class Api:
     # please note that we use version1 of API
     _API_ENDPOINT = 'api/v1'
 
-    def __init__(self, url, token=None, user_key=None):
+    def __init__(self, url, token=None, user_key=None, connection_pool=None):
         """Set the API endpoint and store the authorization token if provided."""
         self.url = Api.add_slash(url)
         # optional on devcluster, but used on stage and on production as well
         self.token = token
         self.user_key = user_key
+        # when no pool is set, each call opens a new ("cold") connection
+        self.connection_pool = connection_pool
+
+    def http(self):
+        """Return object used to perform HTTP requests: pooled session or requests module."""
+        if self.connection_pool is None:
+            return requests
+        return self.connection_pool.session()
 
     def is_api_running(self):
         """Check if the API is available for calls."""
@@ -74,15 +102,44 @@ class Api:
     def perform_get_request(self, endpoint):
         """Perform the HTTP GET request."""
         if self.user_key is None:
-            return requests.get(endpoint, headers=self.authorization())
+            return self.http().get(endpoint, headers=self.authorization())
         else:
             endpoint += "?user_key=" + self.user_key
-            return requests.get(endpoint)
+            return self.http().get(endpoint)
 
-    def perform_post_request(self, endpoint, files):
-        """Perform the HTTP POST request."""
+    def perform_post_request(self, endpoint, body, content_type):
+        """Perform the HTTP POST request with already encoded body."""
+        headers = dict(self.request_headers(), **{"Content-Type": content_type})
+        return self.http().post(self.user_key_endpoint(endpoint), data=body, headers=headers)
+
+    def readiness_url(self):
+        """Construct URL for the readiness endpoint."""
+        return self.user_key_endpoint(self.url + 'api/v1/readiness')
+
+    def user_key_endpoint(self, endpoint):
+        """Add user key to endpoint URL if the user key is used instead of token."""
         if self.user_key is None:
-            return requests.post(endpoint, files=files, headers=self.authorization())
-        else:
-            endpoint += "?user_key=" + self.user_key
-            return requests.post(endpoint, files=files, headers={"user_key": self.user_key})
+            return endpoint
+        return endpoint + "?user_key=" + self.user_key
+
+    def request_headers(self):
+        """Return HTTP headers to be used by the asynchronous HTTP client."""
+        if self.user_key is None:
+            return self.authorization()
+        return {"user_key": self.user_key}
+
+    async def perform_get_request_async(self, session, endpoint):
+        """Perform the HTTP GET request via the shared asynchronous HTTP client."""
+        endpoint = self.user_key_endpoint(endpoint)
+        headers = self.authorization() if self.user_key is None else None
+        async with session.get(endpoint, headers=headers) as response:
+            content = await response.read()
+            return BufferedResponse(response.status, content, response.headers)
+
+    async def perform_post_request_async(self, session, endpoint, body, content_type):
+        """Perform the HTTP POST request with already encoded body via the shared HTTP client."""
+        endpoint = self.user_key_endpoint(endpoint)
+        headers = dict(self.request_headers(), **{"Content-Type": content_type})
+        async with session.post(endpoint, data=body, headers=headers) as response:
+            content = await response.read()
+            return BufferedResponse(response.status, content, response.headers)
@@ -0,0 +1,98 @@
+"""Asynchronous engine that runs component and stack analyses as coroutines.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import aiohttp
+from time import time
+from fastlog import log
+
+from connection_pool import CONNECTION_COLD, CONNECTION_WARM, DEFAULT_POOL_PER_HOST
+from scheduler import COMPONENT_ANALYSIS
+
+
+async def bounded_call(semaphore, coroutine):
+    """Await the coroutine, but only when the concurrency limit allows it."""
+    async with semaphore:
+        return await coroutine
+
+
+def prepare_connector(concurrency, connection, per_host):
+    """Prepare connector for the shared HTTP client according to selected connection mode."""
+    if connection == CONNECTION_WARM:
+        return aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host)
+    # cold connections: new TCP+TLS handshake for each call
+    return aiohttp.TCPConnector(limit=concurrency, force_close=True)
+
+
+async def warm_up(session, api, connections):
+    """Open the given number of keep-alive connections before the measurement starts."""
+    coroutines = [api.perform_get_request_async(session, api.url + 'api/v1/readiness')
+                  for _ in range(connections)]
+    await asyncio.gather(*coroutines, return_exceptions=True)
+
+
+def log_call_failure(task):
+    """Log exception raised by the finished call, if any."""
+    if not task.cancelled() and task.exception() is not None:
+        log.error("Call failed: {e}".format(e=task.exception()))
+
+
+async def run_calls(queue, component_analysis, stack_analysis, calls, concurrency,
+                    connection, per_host):
+    """Run all calls over one shared HTTP client with bounded number of in-flight calls.
+
+    Calls with intended start time are issued at that time (open-loop load),
+    other calls are issued immediately.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = prepare_connector(concurrency, connection, per_host)
+    timeout = aiohttp.ClientTimeout(total=None)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        if connection == CONNECTION_WARM:
+            log.info("Opening {n} keep-alive connections".format(n=min(concurrency, per_host)))
+            await warm_up(session, component_analysis, min(concurrency, per_host))
+
+        tasks = set()
+        for scheduled, kind, call in calls:
+            if scheduled is not None:
+                delay = scheduled - time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            api = component_analysis if kind == COMPONENT_ANALYSIS else stack_analysis
+            coroutine = api.start_async(session, *call, queue=queue, scheduled=scheduled)
+            task = asyncio.ensure_future(bounded_call(semaphore, coroutine))
+            task.add_done_callback(log_call_failure)
+            task.add_done_callback(tasks.discard)
+            tasks.add(task)
+
+        log.info("Waiting for all {n} calls to finish".format(n=len(tasks)))
+        if tasks:
+            await asyncio.wait(tasks)
+
+
+def run_benchmarks_async(queue, component_analysis, stack_analysis, calls, concurrency,
+                         connection=CONNECTION_COLD, per_host=DEFAULT_POOL_PER_HOST):
+    """Run component and stack analysis benchmarks in the asyncio engine."""
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run_calls(queue, component_analysis, stack_analysis, calls,
+                                          concurrency, connection, per_host))
+    finally:
+        loop.close()
+    log.success("Done")
@@ -39,3 +39,126 @@ cli_parser.add_argument('-D', '--dry',
 cli_parser.add_argument('-d', '--dump-results',
                         help='dump REST API results into JSON files',
                         action='store_true')
+
+cli_parser.add_argument('-e', '--engine',
+                        help='engine used to perform REST API calls (threads or asyncio)',
+                        choices=['threads', 'asyncio'], default='threads')
+
+cli_parser.add_argument('-c', '--concurrency',
+                        help='maximum number of in-flight calls for the asyncio engine '
+                             '(default=1000)',
+                        type=int, default=1000)
+
+cli_parser.add_argument('--connection',
+                        help='measure with new connection per call (cold) or with '
+                             'pool of keep-alive connections (warm)',
+                        choices=['cold', 'warm'], default='cold')
+
+cli_parser.add_argument('--pool-size',
+                        help='number of per-host connection pools (default=10)',
+                        type=int, default=10)
+
+cli_parser.add_argument('--pool-per-host',
+                        help='maximum number of connections to one host (default=100)',
+                        type=int, default=100)
+
+cli_parser.add_argument('--poll-initial',
+                        help='first interval between polls for stack analysis results, '
+                             'in seconds (default=0.5)',
+                        type=float, default=0.5)
+
+cli_parser.add_argument('--poll-max',
+                        help='the longest interval between polls for stack analysis results, '
+                             'in seconds (default=15)',
+                        type=float, default=15)
+
+cli_parser.add_argument('--poll-backoff',
+                        help='factor used to prolong interval after each poll (default=1.5)',
+                        type=float, default=1.5)
+
+cli_parser.add_argument('--poll-jitter',
+                        help='relative amount of random jitter added to poll intervals '
+                             '(default=0.1)',
+                        type=float, default=0.1)
+
+cli_parser.add_argument('--poll-timeout',
+                        help='maximum time to wait for stack analysis results, in seconds '
+                             '(default=600)',
+                        type=float, default=600)
+
+cli_parser.add_argument('--concurrent',
+                        help='run all selected tests at the same time',
+                        action='store_true')
+
+cli_parser.add_argument('--baseline',
+                        help='run tests one after another before running them concurrently '
+                             'and compare latencies',
+                        action='store_true', dest='isolated_baseline')
+
+cli_parser.add_argument('--workload',
+                        help='specify CSV file with weighted E/P/V triples used by component '
+                             'analysis (default=workload.csv)',
+                        action='store')
+
+cli_parser.add_argument('-s', '--seed',
+                        help='seed for the workload, the same seed gives the same sequence '
+                             'of requests (default=42)',
+                        type=int)
+
+cli_parser.add_argument('--cache-hit-ratio',
+                        help='ratio of components marked as cached in the workload '
+                             '(0.0 to 1.0, default=given by weights only)',
+                        type=float)
+
+cli_parser.add_argument('--telemetry-interval',
+                        help='interval between telemetry lines shown on terminal, in seconds, '
+                             '0 disables them (default=1)',
+                        type=float, default=1.0)
+
+cli_parser.add_argument('--telemetry-port',
+                        help='serve telemetry in Prometheus text format (/metrics) and as JSON '
+                             '(/json) on given localhost port',
+                        type=int)
+
+cli_parser.add_argument('-p', '--processes',
+                        help='split tests between given number of local worker processes',
+                        type=int, default=0)
+
+cli_parser.add_argument('-w', '--workers',
+                        help='split tests between workers running on other hosts '
+                             '(comma separated list of [host:]port, A2T_AUTHKEY needs to be set)',
+                        action='store')
+
+cli_parser.add_argument('-W', '--worker',
+                        help='run as worker listening on given [host:]port, host defaults to '
+                             'localhost (A2T_AUTHKEY needs to be set)',
+                        action='store')
+
+subparsers = cli_parser.add_subparsers(dest='command')
+
+compare_parser = subparsers.add_parser('compare',
+                                       help='compare latencies of two runs and check for '
+                                            'significant regressions')
+
+compare_parser.add_argument('baseline',
+                            help='directory with results of the baseline run')
+
+compare_parser.add_argument('candidate',
+                            help='directory with results of the compared run')
+
+compare_parser.add_argument('--percentile',
+                            help='latency percentile compared between runs (default=50)',
+                            type=float, default=50)
+
+compare_parser.add_argument('--threshold',
+                            help='relative slowdown of the percentile tolerated '
+                                 '(default=0.1, i.e. 10%%)',
+                            type=float, default=0.1)
+
+compare_parser.add_argument('--alpha',
+                            help='significance level of Mann-Whitney U test (default=0.05)',
+                            type=float, default=0.05)
+
+compare_parser.add_argument('-o', '--output',
+                            help='export comparison into given CSV file',
+                            action='store')
@@ -0,0 +1,203 @@
+"""Comparison of latencies measured by two runs of A2T.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import csv
+import os
+from math import ceil, erfc, sqrt
+
+from fastlog import log
+
+from latency_statistic import TestStatistic
+
+
+# reports in result directory that don't contain results of one test
+SKIPPED_REPORTS = {"summary.csv", "interference.csv"}
+
+# minimal number of calls for both runs needed to decide about regression
+MIN_SAMPLES = 5
+
+VERDICT_OK = "ok"
+VERDICT_FASTER = "faster"
+VERDICT_REGRESSION = "REGRESSION"
+VERDICT_NOT_ENOUGH_DATA = "not enough data"
+
+
+def read_test_latencies(filename):
+    """Read latencies of all successful calls from one test report, grouped by endpoint."""
+    latencies = {}
+    with open(filename, 'r', encoding='utf8', newline='') as fin:
+        columns = None
+        for row in csv.reader(fin):
+            if columns is None:
+                # results follow the row with column names, that starts with '#'
+                if row and row[0] == "#":
+                    columns = {name: i for i, name in enumerate(row)}
+                continue
+            if row[columns["Status code"]] != "200":
+                continue
+            endpoint = TestStatistic.ENDPOINTS.get(
+                (row[columns["Test name"]], row[columns["Method"]]), row[columns["Test name"]])
+            # older reports don't contain latency measured from scheduled start time
+            value = row[columns["Latency"]] if "Latency" in columns else \
+                row[columns["Duration"]]
+            latencies.setdefault(endpoint, []).append(float(value))
+    return latencies
+
+
+def read_results(directory):
+    """Read latencies from all test reports in directory, test name -> endpoint -> values."""
+    results = {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".csv") or filename in SKIPPED_REPORTS:
+            continue
+        results[filename[:-len(".csv")]] = read_test_latencies(os.path.join(directory, filename))
+    return results
+
+
+def value_at_percentile(sorted_values, p):
+    """Return value at given percentile (0..100) using the nearest rank method."""
+    rank = max(1, int(ceil(p / 100.0 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def mann_whitney_u(baseline, candidate):
+    """Compute p-value of one-sided Mann-Whitney U test.
+
+    The alternative hypothesis is that candidate values tend to be greater
+    than baseline values. Normal approximation with tie correction is used.
+    """
+    n1 = len(candidate)
+    n2 = len(baseline)
+    n = n1 + n2
+    values = sorted([(v, 1) for v in candidate] + [(v, 0) for v in baseline])
+
+    # sum of ranks of candidate values, ties get the average rank
+    rank_sum = 0.0
+    tie_correction = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and values[j + 1][0] == values[i][0]:
+            j += 1
+        ties = j - i + 1
+        average_rank = (i + j) / 2.0 + 1
+        rank_sum += average_rank * sum(values[k][1] for k in range(i, j + 1))
+        tie_correction += ties ** 3 - ties
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2.0
+    mean = n1 * n2 / 2.0
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_correction / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    # continuity correction
+    z = (u - mean - 0.5) / sqrt(variance)
+    return 0.5 * erfc(z / sqrt(2))
+
+
+def compare_endpoint(baseline, candidate, threshold, alpha, p):
+    """Compare latencies of one endpoint, return (baseline, candidate, p-value, verdict).
+
+    Regression is reported only when the candidate is significantly slower
+    and the selected percentile is worse by more than the threshold.
+    """
+    if len(baseline) < MIN_SAMPLES or len(candidate) < MIN_SAMPLES:
+        return None, None, None, VERDICT_NOT_ENOUGH_DATA
+    baseline_value = value_at_percentile(sorted(baseline), p)
+    candidate_value = value_at_percentile(sorted(candidate), p)
+    p_value = mann_whitney_u(baseline, candidate)
+    change = candidate_value / baseline_value - 1.0 if baseline_value else 0.0
+    if p_value < alpha and change > threshold:
+        verdict = VERDICT_REGRESSION
+    elif mann_whitney_u(candidate, baseline) < alpha and change < -threshold:
+        verdict = VERDICT_FASTER
+    else:
+        verdict = VERDICT_OK
+    return baseline_value, candidate_value, p_value, verdict
+
+
+def compare_results(baseline_directory, candidate_directory, threshold, alpha, p):
+    """Compare all tests and endpoints found in both directories.
+
+    Return list of (test name, endpoint, baseline calls, candidate calls,
+    baseline value, candidate value, p-value, verdict) tuples.
+    """
+    baseline = read_results(baseline_directory)
+    candidate = read_results(candidate_directory)
+    comparison = []
+    for test_name in sorted(set(baseline) & set(candidate)):
+        endpoints = set(baseline[test_name]) & set(candidate[test_name])
+        for endpoint in sorted(endpoints):
+            b = baseline[test_name][endpoint]
+            c = candidate[test_name][endpoint]
+            comparison.append((test_name, endpoint, len(b), len(c)) +
+                              compare_endpoint(b, c, threshold, alpha, p))
+    for test_name in sorted(set(baseline) ^ set(candidate)):
+        log.warning("Test '{t}' is not present in both result directories".format(t=test_name))
+    return comparison
+
+
+def export_comparison(comparison, p, filename):
+    """Export comparison into CSV file."""
+    name = "p{p:g}".format(p=p)
+    with open(filename, 'w', encoding='utf8') as fout:
+        csv_writer = csv.writer(fout)
+        csv_writer.writerow(["Test name", "Endpoint", "Baseline calls", "Candidate calls",
+                             "Baseline " + name, "Candidate " + name, "p-value", "Verdict"])
+        for row in comparison:
+            csv_writer.writerow(row)
+
+
+def format_latency(value):
+    """Format latency that might not be available."""
+    return "N/A" if value is None else "{v:.3f} s".format(v=value)
+
+
+def run_comparison(cli_arguments):
+    """Compare two result directories, return exit code: 0 for pass, 1 for regression."""
+    p = cli_arguments.percentile
+    log.info("Comparing '{b}' (baseline) with '{c}' (candidate)".format(
+        b=cli_arguments.baseline, c=cli_arguments.candidate))
+    with log.indent():
+        log.info("Percentile: p{p:g}, threshold: {t:.1%}, alpha: {a}".format(
+            p=p, t=cli_arguments.threshold, a=cli_arguments.alpha))
+        comparison = compare_results(cli_arguments.baseline, cli_arguments.candidate,
+                                     cli_arguments.threshold, cli_arguments.alpha, p)
+        for test_name, endpoint, _, _, b, c, p_value, verdict in comparison:
+            message = "{t} / {e}: {b} -> {c}: {v}".format(
+                t=test_name, e=endpoint, b=format_latency(b), c=format_latency(c), v=verdict)
+            if p_value is not None:
+                message += " (p-value {p:.4f})".format(p=p_value)
+            if verdict == VERDICT_REGRESSION:
+                log.error(message)
+            else:
+                log.info(message)
+
+    if cli_arguments.output:
+        log.info("Exporting comparison into file '{f}'".format(f=cli_arguments.output))
+        export_comparison(comparison, p, cli_arguments.output)
+
+    if not comparison:
+        log.error("FAIL: no test results to compare")
+        return 1
+    regressions = sum(1 for row in comparison if row[-1] == VERDICT_REGRESSION)
+    if regressions:
+        log.error("FAIL: {n} significant regression(s) found".format(n=regressions))
+        return 1
+    log.success("PASS: no significant regression found")
+    return 0
@@ -18,24 +18,24 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import datetime
 from time import time
-import json
 import re
 from urllib.parse import urljoin
 
 from api import Api
 
 
-# directory where the API results needs to be dumped
-API_RESULTS_DIRECTORY = "api_results"
-
-
 class ComponentAnalysis(Api):
     """Implementation of component analysis."""
 
-    def __init__(self, url, token, user_key, dump_json_responses):
+    def __init__(self, url, token, user_key, dump_writer=None, connection_pool=None):
         """Set the API endpoint and store the authorization token if provided."""
-        super().__init__(url, token, user_key)
-        self._dump_json_responses = dump_json_responses
+        super().__init__(url, token, user_key, connection_pool)
+        self.dump_writer = dump_writer
+
+    @property
+    def dump_json_responses(self):
+        """Getter to retrieve the flag if JSON responses dumps are enabled."""
+        return self.dump_writer is not None
 
     def analysis_url(self, ecosystem, component, version):
         """Construct URL for the component analyses REST API call."""
@@ -53,17 +53,6 @@ class ComponentAnalysis(Api):
             self.print_error_response(response, "error")
         return response.status_code == 200
 
-    def dump_analysis(self, ecosystem, component, version, json_response):
-        """Dump the component analysis result into a file."""
-        timestamp_str = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f")
-        filename = API_RESULTS_DIRECTORY + "/"
-        filename += "component_analysis_{e}_{c}_{v}_{t}.json".format(e=ecosystem,
-                                                                     c=component,
-                                                                     v=version,
-                                                                     t=timestamp_str)
-        with open(filename, 'w') as fout:
-            json.dump(json_response, fout)
-
     def check_analysis(self, analysis, ecosystem, package, version):
         """Check the results of component analysis."""
         try:
@@ -227,32 +216,26 @@ class ComponentAnalysis(Api):
         self.compare_packages(p, package)
         self.compare_versions(v, version)
 
-    def dump_response_if_enabled(self, ecosystem, component, version, response):
+    def dump_response_if_enabled(self, ecosystem, component, version, json_response):
         """Dump response gathered from server, but only if dumping is enabled."""
-        if self._dump_json_responses:
-            try:
-                self.dump_analysis(ecosystem, component, version, response.json())
-            except Exception:
-                self.print_error_response(response, "error")
-                # not need to fail there - we'll fail later properly
-
-    def start(self, thread_id=None, ecosystem=None, component=None, version=None, queue=None):
-        """Start the component analysis and check the status code."""
-        start_time = time()
-        endpoint = self.analysis_url(ecosystem, component, version)
-        response = self.perform_get_request(endpoint)
-
-        self.dump_response_if_enabled(ecosystem, component, version, response)
+        if self.dump_writer is not None:
+            self.dump_writer.dump("component_analysis", json_response,
+                                  ecosystem=ecosystem, package=component, version=version)
 
+    def process_response(self, thread_id, ecosystem, component, version, response,
+                         start_time, end_time, queue, scheduled=None):
+        """Check the response from server and store the result into the queue."""
         status_code = response.status_code
-        end_time = time()
         duration = end_time - start_time
+        # intended start time, used to compute latency free of coordinated omission
+        scheduled = scheduled or start_time
 
         json_response = ""
         check = "N/A"
 
         try:
             json_response = response.json()
+            self.dump_response_if_enabled(ecosystem, component, version, json_response)
             if status_code == 200:
                 check = self.check_analysis(json_response, ecosystem, component, version)
             else:
@@ -271,6 +254,8 @@ class ComponentAnalysis(Api):
              "started": start_time,
              "finished": end_time,
              "duration": duration,
+             "scheduled": scheduled,
+             "latency": end_time - scheduled,
              "analysis": check,
              "manifest": "N/A"
              }
@@ -280,3 +265,23 @@ class ComponentAnalysis(Api):
 
         # return both component analysis status and debug data (durations) as well
         return r
+
+    def start(self, thread_id=None, ecosystem=None, component=None, version=None, queue=None,
+              scheduled=None):
+        """Start the component analysis and check the status code."""
+        start_time = time()
+        endpoint = self.analysis_url(ecosystem, component, version)
+        response = self.perform_get_request(endpoint)
+        end_time = time()
+        return self.process_response(thread_id, ecosystem, component, version, response,
+                                     start_time, end_time, queue, scheduled)
+
+    async def start_async(self, session, thread_id=None, ecosystem=None, component=None,
+                          version=None, queue=None, scheduled=None):
+        """Start the component analysis as a coroutine using the shared HTTP client."""
+        start_time = time()
+        endpoint = self.analysis_url(ecosystem, component, version)
+        response = await self.perform_get_request_async(session, endpoint)
+        end_time = time()
+        return self.process_response(thread_id, ecosystem, component, version, response,
+                                     start_time, end_time, queue, scheduled)
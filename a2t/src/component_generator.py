@@ -1,341 +0,0 @@
-"""Module with class that generates component specifications for the component analysis.
-
-Copyright (c) 2019 Red Hat Inc.
-
-This program is free software: you can redistribute it and/or modify
-it under the terms of the GNU General Public License as published by
-the Free Software Foundation, either version 3 of the License, or
-(at your option) any later version.
-
-This program is distributed in the hope that it will be useful,
-but WITHOUT ANY WARRANTY; without even the implied warranty of
-MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-GNU General Public License for more details.
-
-You should have received a copy of the GNU General Public License
-along with this program.  If not, see <http://www.gnu.org/licenses/>.
-"""
-
-
-class ComponentGenerator:
-    """Class that generates component specifications for the component analysis."""
-
-    components = {
-        "pypi": {
-            "clojure_py": ["0.1.0g", "0.2.0", "0.2.1", "0.2.2", "0.2.3",
-                           "0.2.4"],
-            "six": ["0.9.0", "0.9.1", "0.9.2", "1.0b1", "1.0.0", "1.1.0",
-                    "1.2.0", "1.3.0", "1.4.0", "1.4.1", "1.5.0", "1.5.1",
-                    "1.5.2", "1.6.0", "1.6.1", "1.7.0", "1.7.1", "1.7.2",
-                    "1.7.3", "1.8.0", "1.9.0", "1.10.0"],
-            "ansicolors": ["1.0", "1.0.1", "1.0.2", "1.1.5", "1.1.6", "1.1.7",
-                           "1.1.8"],
-            "flask": ["1.0.2", "1.0.1", "1.0", "0.12.4", "0.12.3", "0.12.2",
-                      "0.12.1", "0.12", "0.11.1", "0.11", "0.10.1", "0.10",
-                      "0.9", "0.8.1", "0.8", "0.7.2", "0.7.1", "0.7", "0.6.1",
-                      "0.6", "0.5.2", "0.5.1", "0.5", "0.4", "0.3.1", "0.3",
-                      "0.2", "0.1"],
-            "numpy": ["1.16.3", "1.16.2", "1.16.1", "1.16.0", "1.16.0rc2gc",
-                      "1.16.0rc1gc", "1.15.4", "1.15.3", "1.15.2", "1.15.1",
-                      "1.15.0", "1.15.0rc2gc", "1.15.0rc1", "1.14.6", "1.14.5",
-                      "1.14.4", "1.14.3", "1.14.2", "1.14.1", "1.14.0",
-                      "1.14.0rc1gc", "1.13.3", "1.13.1", "1.13.0",
-                      "1.13.0rc2gc", "1.13.0rc1", "1.12.1", "1.12.1rc1gc",
-                      "1.12.0", "1.12.0rc2", "1.12.0rc1gc", "1.12.0b1",
-                      "1.11.3", "1.11.2", "1.11.2rc1gc", "1.11.1", "1.11.1rc1",
-                      "1.11.0", "1.11.0rc2gc", "1.11.0rc1"],
-            "scipy": ["1.2.1", "1.2.0", "1.2.0rc2", "1.2.0rc1", "1.1.0",
-                      "1.1.0rc1", "1.0.1", "1.0.0", "1.0.0rc2", "1.0.0rc1",
-                      "1.0.0b1", "0.19.1", "0.19.0", "0.18.1", "0.18.0",
-                      "0.18.0rc2", "0.17.1", "0.17.0", "0.16.1", "0.16.0",
-                      "0.15.1", "0.15.0", "0.14.1", "0.14.1rc1", "0.14.0",
-                      "0.13.3", "0.13.2", "0.13.1", "0.13.0", "0.12.1",
-                      "0.12.0", "0.11.0", "0.10.1", "0.10.0", "0.9.0", "0.8.0",
-                      "0.7.2", "0.7.0", "0.6.0", "0.5.2", "0.4.4",
-                      "0.14.1rc1.dev-205726a", "0.14.1rc1.dev-52fb336"],
-            "pygame": ["1.9.6rc2gc", "1.9.6rc1", "1.9.5",
-                       "1.9.5rc2gc", "1.9.5rc1", "1.9.5.dev0", "1.9.4",
-                       "1.9.4rc1gc", "1.9.4.dev0", "1.9.3", "1.9.2",
-                       "1.9.2rc1gc", "1.9.2b8", "1.9.2b7gc", "1.9.2b6",
-                       "1.9.2b5", "1.9.2b4gc", "1.9.2b3", "1.9.2b2",
-                       "1.9.2b1gc", "1.9.2.dev1", "1.8.1", "1.8.0", "1.7.1"],
-            "pyglet": ["1.4.0b1gc", "1.4.0a1", "1.3.2", "1.3.1",
-                       "1.3.0", "1.3.0rc2gc", "1.3.0rc1", "1.3.0b1gc", "1.2.4",
-                       "1.2.4b1", "1.2.3", "1.2.3b1gc", "1.2.3a2", "1.2.3a1",
-                       "1.2.2", "1.2.1", "1.2.0", "1.2.0rc3gc", "1.2.0rc2gc",
-                       "1.1.4", "1.1.2", "1.1.1", "1.1", "1.0", "1.0beta3gc",
-                       "1.0beta2"],
-            "requests": ["2.21.0", "2.20.1", "2.20.0", "2.19.1", "2.19.0",
-                         "2.18.4", "2.18.3", "2.18.2", "2.18.1", "2.18.0",
-                         "2.17.3", "2.17.2", "2.17.1", "2.17.0", "2.16.5",
-                         "2.16.4", "2.16.3", "2.16.2", "2.16.1", "2.16.0",
-                         "2.15.1", "2.15.0", "2.14.2", "2.14.1", "2.14.0",
-                         "2.13.0", "2.12.5", "2.12.4", "2.12.3", "2.12.2",
-                         "2.12.1", "2.12.0", "2.11.1", "2.11.0", "2.10.0",
-                         "2.9.2", "2.9.1", "2.9.0", "2.8.1", "2.8.0", "2.7.0",
-                         "2.6.2", "2.6.1", "2.6.0", "2.5.3", "2.5.2", "2.5.1",
-                         "2.5.0", "2.4.3"],
-            "dash": ["1.0.0a1", "0.43.0rc3", "0.43.0rc2", "0.43.0rc1",
-                     "0.41.0", "0.40.0", "0.40.0rc1", "0.39.0", "0.38.0",
-                     "0.38.0rc1", "0.37.0", "0.37.0rc2", "0.37.0rc1", "0.36.0",
-                     "0.36.0rc1", "0.35.3", "0.35.2", "0.35.1", "0.35.0",
-                     "0.35.0rc1", "0.34.0", "0.32.2", "0.32.1", "0.32.0",
-                     "0.32.0rc2", "0.32.0rc1", "0.31.1", "0.31.0", "0.31.0rc2",
-                     "0.31.0rc1", "0.30.0", "0.30.0rc5", "0.30.0rc4",
-                     "0.30.0rc3", "0.30.0rc2", "0.30.0rc1", "0.29.0",
-                     "0.29.0rc8", "0.29rc7", "0.29.0rc6", "0.29.0rc5",
-                     "0.29.0rc4", "0.29.0rc3", "0.29.0rc2", "0.29.0rc1",
-                     "0.28.7", "0.28.6", "0.28.5", "0.28.4", "0.28.3",
-                     "0.28.2", "0.28.1", "0.28.0", "0.27.0", "0.27.0rc9",
-                     "0.27.0rc8", "0.27.0rc7", "0.27.0rc6", "0.27.0rc5",
-                     "0.27.0rc4", "0.27.0rc3", "0.27.0rc2", "0.27.0rc1",
-                     "0.26.6", "0.26.5", "0.26.4", "0.26.3", "0.26.2",
-                     "0.26.1"],
-            "pudb": ["2018.1", "2017.1.4", "2017.1.3", "2017.1.2", "2017.1.1",
-                     "2017.1", "2016.2", "2016.1", "2015.4.1", "2015.4",
-                     "2015.3", "2015.2", "2015.1", "2014.1", "2013.5.1",
-                     "2013.5", "2013.4", "2013.3.6", "2013.3.5", "2013.3.4",
-                     "2013.3.3", "2013.3.2", "2013.3.1", "2013.3", "2013.2",
-                     "2013.1", "2012.3", "2012.2.1", "2012.2", "2012.1",
-                     "2011.3.1", "2011.3", "2011.2", "2011.1", "0.93.1",
-                     "0.93", "0.92.15", "0.92.14", "0.92.13", "0.92.12",
-                     "0.92.11", "0.92.10", "0.92.9", "0.92.8", "0.92.7",
-                     "0.92.6", "0.92.5", "0.92.4", "0.92.3", "0.92.2",
-                     "0.92.1", "0.92", "0.91.5", "0.91.4", "0.91.3", "0.91.2",
-                     "0.91.1", "0.91", "0.90.6", "0.90.5", "0.90.4", "0.90.3",
-                     "0.90.2", "0.90.1", "0.90"],
-            "pytest": ["2.0.0", "2.0.1", "2.0.2", "2.0.3", "2.1.0", "2.1.1",
-                       "2.1.2", "2.1.3", "2.2.0", "2.2.1", "2.2.2", "2.2.3",
-                       "2.2.4", "2.3.0", "2.3.1", "2.3.2", "2.3.3", "2.3.4",
-                       "2.3.5", "2.4.0", "2.4.1", "2.4.2", "2.5.0", "2.5.1",
-                       "2.5.2", "2.6.0", "2.6.1", "2.6.2", "2.6.3", "2.6.4",
-                       "2.7.0", "2.7.1", "2.7.2", "2.7.3", "2.8.0", "2.8.1",
-                       "2.8.2", "2.8.3", "2.8.4", "2.8.5", "2.8.6", "2.8.7",
-                       "2.9.0", "2.9.1", "2.9.2", "3.0.0", "3.0.1", "3.0.2",
-                       "3.0.3", "3.0.4", "3.0.5", "3.0.6", "3.0.7", "3.1.0",
-                       "3.1.1", "3.1.2", "3.1.3", "3.2.0", "3.2.1", "3.2.2"]
-        },
-        "maven": {
-            "io.vertx:vertx-core": ["3.7.0", "3.6.3", "3.6.2", "3.6.1",
-                                    "3.6.0", "3.6.0.CR2", "3.6.0.CR1", "3.5.4",
-                                    "3.5.3", "3.5.3.CR1", "3.5.2", "3.5.2.CR3",
-                                    "3.5.2.CR2", "3.5.2.CR1", "3.5.1", "3.5.0",
-                                    "3.5.0.Beta1", "3.4.2", "3.4.1", "3.4.0",
-                                    "3.4.0.Beta1", "3.3.3", "3.3.2", "3.3.1",
-                                    "3.3.0", "3.3.0.CR2", "3.3.0.CR1", "3.2.1",
-                                    "3.2.0", "3.1.0", "3.0.0",
-                                    "3.0.0-milestone6", "3.0.0-milestone5",
-                                    "3.0.0-milestone4", "3.0.0-milestone3",
-                                    "3.0.0-milestone2", "2.1.6", "2.1.5",
-                                    "2.1.4", "2.1.3", "2.1.2", "2.1.1", "2.1",
-                                    "2.1RC3", "2.1RC2", "2.1RC1", "2.1M5",
-                                    "2.1M4", "2.1M3", "2.1M2", "2.1M1",
-                                    "2.0.2-final", "2.0.1-final",
-                                    "2.0.0-final", "2.0.0-CR3", "2.0.0-CR2",
-                                    "2.0.0-CR1", "2.0.0-beta5", "2.0.0-beta4",
-                                    "2.0.0-beta3", "2.0.0-beta2",
-                                    "2.0.0-beta1"],
-            "io.vertx:vertx-stack": ["3.7.0", "3.6.3", "3.6.2", "3.6.1", "3.6.0",
-                                     "3.6.0.CR2", "3.6.0.CR1", "3.5.4",
-                                     "3.5.3", "3.5.3.CR1", "3.5.2",
-                                     "3.5.2.CR3", "3.5.2.CR2", "3.5.2.CR1",
-                                     "3.5.1", "3.5.0", "3.5.0.Beta1", "3.4.2",
-                                     "3.4.1", "3.4.0"],
-            "org.json:json": ["20180813", "20180130", "20171018", "20170516",
-                              "20160810", "20160807", "20160212", "20151123",
-                              "20150729", "20141113", "20140107", "20131018",
-                              "20090211", "20080701", "20070829"],
-            "org.python:jython": ["2.7.1b3", "2.7.1b2", "2.7.1b1", "2.7.0",
-                                  "2.7-rc3", "2.7-rc2", "2.7-rc1", "2.7-b4",
-                                  "2.7-b3", "2.7-b2", "2.7-b1", "2.5.4-rc1",
-                                  "2.5.3", "2.5.3-rc1", "2.5.0", "2.2.1",
-                                  "2.2", "2.2-rc3", "2.2-rc1", "2.2-beta2",
-                                  "2.2-beta1"],
-            "org.clojure:clojure": ["1.10.1-beta2", "1.10.1-beta1", "1.10.0",
-                                    "1.10.0-RC5", "1.10.0-RC4", "1.10.0-RC3",
-                                    "1.10.0-RC2", "1.10.0-RC1", "1.10.0-beta8",
-                                    "1.10.0-beta7", "1.10.0-beta6",
-                                    "1.10.0-beta5", "1.10.0-beta4",
-                                    "1.10.0-beta3", "1.10.0-beta2",
-                                    "1.10.0-beta1", "1.10.0-alpha9",
-                                    "1.10.0-alpha8", "1.10.0-alpha7",
-                                    "1.10.0-alpha6", "1.10.0-alpha5",
-                                    "1.10.0-alpha4", "1.10.0-alpha3",
-                                    "1.10.0-alpha2", "1.10.0-alpha1", "1.9.0",
-                                    "1.9.0-RC2", "1.9.0-RC1", "1.9.0-beta4",
-                                    "1.9.0-beta3", "1.9.0-beta2",
-                                    "1.9.0-beta1", "1.9.0-alpha20",
-                                    "1.9.0-alpha19", "1.9.0-alpha18",
-                                    "1.9.0-alpha17", "1.9.0-alpha16",
-                                    "1.9.0-alpha15", "1.9.0-alpha14",
-                                    "1.9.0-alpha13", "1.9.0-alpha12",
-                                    "1.9.0-alpha11", "1.9.0-alpha10",
-                                    "1.9.0-alpha9", "1.9.0-alpha8",
-                                    "1.9.0-alpha7", "1.9.0-alpha6",
-                                    "1.9.0-alpha5", "1.9.0-alpha4",
-                                    "1.9.0-alpha3", "1.9.0-alpha2",
-                                    "1.9.0-alpha1", "1.8.0", "1.8.0-RC5",
-                                    "1.8.0-RC4", "1.8.0-RC3", "1.8.0-RC2",
-                                    "1.8.0-RC1", "1.8.0-beta2", "1.8.0-beta1",
-                                    "1.8.0-alpha5", "1.8.0-alpha4",
-                                    "1.8.0-alpha3", "1.8.0-alpha2",
-                                    "1.8.0-alpha1", "1.7.0", "1.7.0-RC2",
-                                    "1.7.0-RC1", "1.7.0-beta3", "1.7.0-beta2",
-                                    "1.7.0-beta1", "1.7.0-alpha6",
-                                    "1.7.0-alpha5", "1.7.0-alpha4",
-                                    "1.7.0-alpha3", "1.7.0-alpha2",
-                                    "1.7.0-alpha1", "1.6.0", "1.6.0-RC4",
-                                    "1.6.0-RC3", "1.6.0-RC2", "1.6.0-RC1",
-                                    "1.6.0-beta2", "1.6.0-beta1",
-                                    "1.6.0-alpha3", "1.6.0-alpha2",
-                                    "1.6.0-alpha1", "1.5.1", "1.5.0",
-                                    "1.5.0-RC17", "1.5.0-RC16", "1.5.0-RC15",
-                                    "1.5.0-RC14", "1.5.0-RC6", "1.5.0-RC5",
-                                    "1.5.0-RC4", "1.5.0-RC3", "1.5.0-RC2",
-                                    "1.5.0-RC1", "1.5.0-beta13",
-                                    "1.5.0-beta12", "1.5.0-beta11",
-                                    "1.5.0-beta10", "1.5.0-beta9",
-                                    "1.5.0-beta8", "1.5.0-beta7",
-                                    "1.5.0-beta2", "1.5.0-beta1",
-                                    "1.5.0-alpha7", "1.5.0-alpha6",
-                                    "1.5.0-alpha5", "1.5.0-alpha4",
-                                    "1.5.0-alpha3", "1.5.0-alpha2",
-                                    "1.5.0-alpha1", "1.4.0", "1.4.0-beta7",
-                                    "1.4.0-beta6", "1.4.0-beta5",
-                                    "1.4.0-beta4", "1.4.0-beta3",
-                                    "1.4.0-beta2", "1.4.0-beta1",
-                                    "1.4.0-alpha5", "1.4.0-alpha4",
-                                    "1.4.0-alpha3", "1.4.0-alpha2",
-                                    "1.4.0-alpha1", "1.3.0", "1.3.0-RC0",
-                                    "1.3.0-beta3", "1.3.0-beta2",
-                                    "1.3.0-beta1", "1.3.0-alpha8",
-                                    "1.3.0-alpha7", "1.3.0-alpha6",
-                                    "1.3.0-alpha5", "1.2.1", "1.2.0", "1.1.0",
-                                    "1.0.0"],
-        },
-        "npm": {
-            "aargh": ["1.1.0", "1.0.0", "0.2.0", "0.1.0"],
-            "arrays": ["0.1.0", "0.1.1"],
-            "jquery": ["3.4.0", "3.3.1", "3.3.0", "3.2.1", "3.2.0", "3.1.1",
-                       "3.1.0", "3.0.0", "3.0.0-rc1", "2.2.4", "1.12.4",
-                       "2.2.3", "1.12.3", "2.2.2", "1.12.2", "2.2.1", "1.12.1",
-                       "3.0.0-beta1", "2.2.0", "1.12.0", "3.0.0-alpha1",
-                       "1.11.3", "2.1.4", "2.1.3", "1.11.2", "2.1.2", "1.9.1",
-                       "1.11.1", "2.1.1", "1.11.1-rc2", "2.1.1-rc2",
-                       "1.11.1-rc1", "2.1.1-rc1", "1.11.1-beta1",
-                       "2.1.1-beta1", "2.1.0", "1.11.0", "2.1.0-rc1",
-                       "1.11.0-rc1", "1.11.0-beta3", "2.1.0-beta3",
-                       "2.1.0-beta2"],
-            "mocha": ["6.1.4", "6.1.3", "6.1.2", "6.0.2", "6.0.1", "6.0.0",
-                      "6.0.0-1", "6.0.0-0", "5.2.0", "5.1.1", "5.1.0", "5.0.5",
-                      "5.0.4", "5.0.3", "5.0.2", "5.0.1", "5.0.0", "4.1.0",
-                      "4.0.1", "4.0.0", "3.5.3", "3.5.2", "3.5.1", "3.5.0",
-                      "3.4.2", "3.4.1", "3.3.0", "3.2.0", "3.1.2", "3.1.1",
-                      "3.1.0", "3.0.2", "3.0.1", "3.0.0", "3.0.0-2", "3.0.0-1",
-                      "3.0.0-0", "2.5.3", "2.5.2", "2.5.1", "2.4.5", "2.4.4",
-                      "2.4.3", "2.4.2", "2.4.1", "2.3.4", "2.3.3", "2.3.2",
-                      "2.3.1", "2.3.0", "2.2.5", "2.2.4", "2.2.3", "2.2.1",
-                      "2.2.0", "2.1.0", "2.0.1", "2.0.0", "1.21.5", "1.21.4",
-                      "1.21.3", "1.21.2", "1.21.1", "1.21.0", "1.20.1",
-                      "1.20.0", "1.19.0", "1.18.2", "1.18.1", "1.18.0",
-                      "1.17.1", "1.17.0", "1.16.2", "1.16.1", "1.16.0",
-                      "1.15.1", "1.15.0", "1.14.0", "1.13.0", "1.12.1",
-                      "1.12.0", "1.11.0", "1.10.0", "1.9.0", "1.8.2", "1.8.1",
-                      "1.8.0", "1.7.4", "1.7.3", "1.7.2", "1.7.1", "1.7.0",
-                      "1.6.0", "1.5.0", "1.4.3", "1.4.2", "1.4.1", "1.4.0",
-                      "1.3.2", "1.3.1", "1.3.0", "1.2.2", "1.2.1", "1.2.0",
-                      "1.1.0", "1.0.3", "1.0.2", "1.0.1", "1.0.0", "0.14.1",
-                      "0.14.0", "0.13.0", "0.12.1", "0.12.0", "0.11.0",
-                      "0.10.2", "0.10.1", "0.10.0", "0.9.0", "0.8.1", "0.8.0",
-                      "0.7.1", "0.7.0", "0.6.0", "0.5.0", "0.4.0", "0.3.6",
-                      "0.3.4", "0.3.3", "0.3.2", "0.3.1", "0.3.0", "0.2.0",
-                      "0.1.0", "0.0.8", "0.0.7", "0.0.6", "0.0.5", "0.0.4",
-                      "0.0.3", "0.0.2", "0.0.1", "0.0.1-alpha6",
-                      "0.0.1-alpha5", "0.0.1-alpha4", "0.0.1-alpha3",
-                      "0.0.1-alpha2", "0.0.1-alpha1"],
-            "underscore": ["1.9.1", "1.9.0", "1.8.3", "1.8.2", "1.8.1",
-                           "1.8.0", "1.7.0", "1.6.0", "1.5.2", "1.5.1",
-                           "1.5.0", "1.4.4", "1.4.3", "1.4.2", "1.4.1",
-                           "1.4.0", "1.3.3", "1.3.2", "1.3.1", "1.3.0",
-                           "1.2.4", "1.1.7", "1.2.3", "1.1.0", "1.2.1",
-                           "1.2.0", "1.0.4", "1.1.6", "1.1.5", "1.1.4",
-                           "1.1.3", "1.1.2", "1.1.1", "1.0.3", "1.2.2"],
-            "lodash": ["4.17.11", "4.17.10", "4.17.9", "4.17.5", "4.17.4",
-                       "4.17.3", "4.17.2", "4.17.1", "4.17.0", "4.16.6",
-                       "4.16.5", "4.16.4", "4.16.3", "4.16.2", "4.16.1",
-                       "4.16.0", "4.15.0", "4.14.2", "4.14.1", "4.14.0",
-                       "4.13.1", "4.13.0", "4.12.0", "4.11.2", "4.11.1",
-                       "4.11.0", "4.10.0", "4.9.0", "4.8.2", "4.8.1", "4.8.0",
-                       "4.7.0", "4.6.1", "4.6.0", "4.5.1", "4.5.0", "4.4.0",
-                       "4.3.0", "4.2.1", "4.2.0", "4.1.0", "4.0.1", "4.0.0"],
-            "babel-core": ["6.26.3", "6.26.2", "7.0.0-bridge.0",
-                           "7.0.0-beta.3", "7.0.0-beta.2", "7.0.0-beta.1",
-                           "7.0.0-beta.0", "7.0.0-alpha.20", "6.26.0",
-                           "7.0.0-alpha.19", "7.0.0-alpha.18",
-                           "7.0.0-alpha.17", "7.0.0-alpha.16",
-                           "7.0.0-alpha.15", "7.0.0-alpha.14", "6.25.0",
-                           "7.0.0-alpha.12", "7.0.0-alpha.11",
-                           "7.0.0-alpha.10", "7.0.0-alpha.9", "7.0.0-alpha.8",
-                           "6.24.1", "7.0.0-alpha.7", "7.0.0-alpha.6",
-                           "7.0.0-alpha.3", "6.24.0", "7.0.0-alpha.2",
-                           "7.0.0-alpha.1", "6.23.1", "6.23.0", "6.22.1",
-                           "6.22.0", "6.21.0", "6.20.0", "6.18.2", "6.18.0",
-                           "6.17.0", "6.16.0", "6.14.0", "6.13.2", "6.13.1",
-                           "6.13.0", "6.11.4", "6.10.4", "6.9.1", "6.9.0",
-                           "6.8.0", "6.7.7", "6.7.6", "6.7.5", "6.7.4",
-                           "5.8.38", "6.7.2", "6.7.0", "6.6.5", "6.6.4",
-                           "6.6.0", "6.5.2-canary.ab7533ed", "6.5.2", "6.5.1",
-                           "6.5.0-1", "6.5.0", "5.8.35", "6.4.5", "6.4.0",
-                           "6.3.26", "6.3.21", "6.3.17", "6.3.15", "6.3.13",
-                           "6.3.2", "6.2.4", "6.2.1", "6.2.0", "6.1.21",
-                           "6.1.20", "6.1.19", "6.1.18", "6.1.17", "6.1.16",
-                           "6.1.15", "6.1.14", "6.1.13", "6.1.12", "6.1.11",
-                           "6.1.10", "6.1.9", "6.1.8", "6.1.7", "6.1.6",
-                           "6.1.5", "5.8.34", "6.1.4", "6.1.2", "6.0.20",
-                           "6.0.19", "6.0.18", "6.0.17", "6.0.16", "6.0.15",
-                           "6.0.14", "6.0.12", "6.0.2", "6.0.1", "6.0.0",
-                           "5.0.0-beta4", "5.0.0-beta3", "5.0.0-beta2",
-                           "4.7.16", "4.7.15", "4.7.14", "4.7.13", "4.7.12",
-                           "4.7.11", "4.7.10", "4.7.9", "4.7.8", "4.7.7",
-                           "4.7.6", "4.7.5", "4.7.4", "4.7.3", "4.7.2",
-                           "4.7.1", "4.7.0", "4.6.6", "4.6.5", "4.6.4",
-                           "4.6.3", "4.6.1", "4.6.0", "4.5.5", "4.5.4",
-                           "4.5.3", "4.5.2", "4.5.1", "4.5.0", "4.4.6",
-                           "4.4.5", "4.4.4", "4.4.3", "4.4.2", "4.4.1",
-                           "4.3.0", "4.2.1", "4.2.0", "4.1.1", "4.0.2",
-                           "4.0.1"],
-            "react": ["0.0.0-4221565e1", "0.0.0-9ebe1768a", "0.0.0-a9eff329c",
-                      "16.9.0-alpha.0", "0.0.0-c35e37aab", "16.8.6",
-                      "0.0.0-297165f1e", "16.8.5", "0.0.0-f9e41e3a5",
-                      "0.0.0-679402a66", "16.8.4", "0.0.0-741aa17a3", "16.8.3",
-                      "0.0.0-29b7b775f", "0.0.0-b668168d4", "16.8.2",
-                      "0.0.0-dfabb77a9", "0.0.0-0e4135e8c", "16.8.1",
-                      "0.0.0-11565a207", "16.8.0", "0.0.0-d1326f466",
-                      "0.0.0-267ed9814", "0.0.0-fec00a869", "16.8.0-alpha.1",
-                      "0.0.0-3e15b1c69", "16.8.0-alpha.0", "0.0.0-f22621f88",
-                      "16.7.0", "0.0.0-4a1072194", "0.0.0-7325ebe4d",
-                      "0.0.0-c5b7d26c7", "0.0.0-88ada9819", "0.0.0-ed4c4a51c",
-                      "16.7.0-alpha.2", "16.7.0-alpha.1", "16.6.3",
-                      "0.0.0-0c756fb-f7f79fd", "0.0.0-0c756fb-697f004",
-                      "0.0.0-8b3c1e4-1d1a717", "0.0.0-a8988e4-1d1a717",
-                      "0.0.0-d5e1bf0-aee1b84", "16.6.1", "16.7.0-alpha.0",
-                      "16.6.0", "16.6.0-alpha.8af6728", "16.6.0-alpha.f47a958",
-                      "16.6.0-alpha.400d197", "16.5.2", "16.6.0-alpha.0",
-                      "16.5.1", "16.5.0", "16.4.2", "16.4.1"],
-            "wisp": ["0.11.1", "0.11.0", "0.10.0", "0.9.0-beta3", "0.9.0-beta2",
-                     "0.9.0-beta1", "0.9.0-alpha2", "0.9.0-alpha1",
-                     "0.9.0-dev", "0.8.0", "0.7.1", "0.7.0", "0.6.7", "0.6.6",
-                     "0.6.5", "0.6.4", "0.6.3", "0.6.2", "0.6.1", "0.6.0",
-                     "0.5.0", "0.4.1", "0.4.0", "0.3.3", "0.3.2", "0.3.1",
-                     "0.3.0", "0.2.0", "0.0.4", "0.1.2", "0.1.1", "0.1.0",
-                     "0.0.3", "0.0.2", "0.0.1"]
-        },
-    }
-
-    def generator_for_ecosystem(self, ecosystem='pypi'):
-        """Provide generator for component specifications for selected ecosystem."""
-        components_for_ecosystem = ComponentGenerator.components[ecosystem]
-        while True:
-            for component, versions in components_for_ecosystem.items():
-                for version in versions:
-                    yield (ecosystem, component, version)
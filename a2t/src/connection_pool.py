@@ -0,0 +1,76 @@
+"""Shared pool of keep-alive HTTP connections used by all API instances.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# connection modes that can be selected from command line
+CONNECTION_COLD = "cold"
+CONNECTION_WARM = "warm"
+
+# number of per-host pools that are cached by the pool
+DEFAULT_POOL_SIZE = 10
+
+# maximum number of connections kept open to one host
+DEFAULT_POOL_PER_HOST = 100
+
+
+class ConnectionPool:
+    """Shared, thread-safe pool of keep-alive HTTP connections.
+
+    All threads share one HTTP adapter, so TCP and TLS connections made by
+    one thread are reused by others. Each thread gets its own session object
+    because sessions are not thread-safe, but the adapter (and the urllib3
+    pool manager inside it) is.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, per_host=DEFAULT_POOL_PER_HOST):
+        """Create the shared HTTP adapter with given pool size and per-host limit."""
+        self.pool_size = pool_size
+        self.per_host = per_host
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=per_host,
+                                    pool_block=True)
+        self._local = threading.local()
+
+    def session(self):
+        """Return session for the current thread that uses the shared adapter."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            self._local.session = session
+        return session
+
+    def warm_up(self, url, connections):
+        """Open the given number of connections to the URL so they are reused later."""
+        threads = [threading.Thread(target=self._warm_up_connection, args=(url,))
+                   for _ in range(min(connections, self.per_host))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def _warm_up_connection(self, url):
+        """Open one connection to the URL by performing a GET request."""
+        try:
+            self.session().get(url)
+        except requests.exceptions.ConnectionError:
+            pass
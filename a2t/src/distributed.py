@@ -0,0 +1,346 @@
+"""Coordinator and workers used to generate load from more processes or hosts.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import threading
+from time import time, sleep
+from multiprocessing import AuthenticationError, get_context
+from multiprocessing.connection import Client, Listener, wait
+
+from fastlog import log
+
+from component_analysis import ComponentAnalysis
+from stack_analysis import StackAnalysis
+from connection_pool import ConnectionPool, CONNECTION_WARM
+from dump_writer import DumpWriter, dump_prefix
+from scheduler import is_open_loop_test, column_value
+from test_runner import execute_test
+
+
+# environment variable with key used to authenticate coordinator and workers on other hosts,
+# workers accept pickled messages, so the key must be secret
+AUTHKEY_VARIABLE = "A2T_AUTHKEY"
+
+# host the worker listens on when only port is specified
+DEFAULT_WORKER_HOST = "localhost"
+
+# number of round trips used to estimate the clock offset of each worker
+CLOCK_SAMPLES = 10
+
+# time given to all workers to receive the test before the test starts
+START_DELAY = 1.0
+
+# attributes of results that contain timestamps
+TIME_ATTRIBUTES = ("started", "finished", "scheduled")
+
+# configuration options that are sent to workers
+WORKER_CFG_KEYS = ("engine", "concurrency", "connection", "pool_size", "pool_per_host",
+                   "polling", "workload", "seed", "cache_hit_ratio")
+
+
+class ForwardingSink:
+    """Sink used by workers to send results to coordinator instead of storing them."""
+
+    def __init__(self, connection, worker_id):
+        """Remember the connection to the coordinator and ID of this worker."""
+        self._connection = connection
+        self._worker_id = worker_id
+        self._lock = threading.Lock()
+        self._count = 0
+
+    def put(self, result):
+        """Send one result to the coordinator, payload is dropped as it has been checked."""
+        result = dict(result, json=None)
+        result["thread_id"] = "{w}:{t}".format(w=self._worker_id, t=result["thread_id"])
+        with self._lock:
+            self._connection.send(("result", result))
+            self._count += 1
+
+    def qsize(self):
+        """Return number of results sent to the coordinator."""
+        return self._count
+
+
+def prepare_apis(setup):
+    """Construct component analysis and stack analysis APIs from setup sent by coordinator."""
+    cfg = setup["cfg"]
+    connection_pool = None
+    if cfg["connection"] == CONNECTION_WARM:
+        connection_pool = ConnectionPool(cfg["pool_size"], cfg["pool_per_host"])
+    dump_writer = None
+    if setup["dump"]:
+        dump_writer = DumpWriter(prefix=dump_prefix(setup["worker_id"]))
+    component_analysis = ComponentAnalysis(setup["url"], setup["token"], setup["user_key"],
+                                           dump_writer, connection_pool)
+    stack_analysis = StackAnalysis(setup["url"], setup["token"], setup["user_key"],
+                                   dump_writer, connection_pool, cfg["polling"])
+    return component_analysis, stack_analysis
+
+
+def serve_connection(connection):
+    """Perform commands sent by coordinator until it asks the worker to quit."""
+    component_analysis = stack_analysis = cfg = None
+    worker_id = None
+    while True:
+        command, payload = connection.recv()
+        if command == "clock":
+            connection.send(("clock", time()))
+        elif command == "setup":
+            worker_id = payload["worker_id"]
+            cfg = dict(payload["cfg"], worker_id=worker_id)
+            component_analysis, stack_analysis = prepare_apis(payload)
+            log.info("Worker #{w} is ready".format(w=worker_id))
+        elif command == "test":
+            sink = ForwardingSink(connection, worker_id)
+            delay = payload["start_at"] - time()
+            if delay > 0:
+                sleep(delay)
+            try:
+                counts = execute_test(cfg, payload["test"], sink,
+                                      component_analysis, stack_analysis)
+            except Exception as e:
+                log.error("Test failed: {e}".format(e=e))
+                counts = (0, 0)
+            connection.send(("done", counts))
+        elif command == "quit":
+            if component_analysis is not None and component_analysis.dump_writer is not None:
+                component_analysis.dump_writer.close()
+            connection.close()
+            return
+
+
+def authkey():
+    """Read the key used to authenticate coordinator and workers, None when it is not set."""
+    key = os.environ.get(AUTHKEY_VARIABLE)
+    return key.encode("utf-8") if key else None
+
+
+def worker_address(address):
+    """Parse address in [host:]port format, host defaults to localhost."""
+    if ":" in address:
+        host, port = address.rsplit(":", 1)
+    else:
+        host, port = DEFAULT_WORKER_HOST, address
+    return host or DEFAULT_WORKER_HOST, int(port)
+
+
+def serve_forever(address, key):
+    """Listen on given address and serve coordinators one after another."""
+    host, port = worker_address(address)
+    with Listener((host, port), authkey=key) as listener:
+        log.info("Worker is listening on {h}:{p}".format(h=host, p=port))
+        while True:
+            try:
+                connection = listener.accept()
+            except (AuthenticationError, OSError) as e:
+                log.warning("Connection rejected: {e}".format(e=e))
+                continue
+            with connection:
+                log.info("Coordinator connected from {a}".format(a=listener.last_accepted))
+                try:
+                    serve_connection(connection)
+                except EOFError:
+                    log.warning("Coordinator disconnected")
+
+
+def estimate_clock_offset(connection):
+    """Estimate offset between worker clock and coordinator clock.
+
+    The round trip with the shortest duration is used, assuming that the
+    worker read its clock in the middle of the round trip.
+    """
+    best_round_trip = None
+    offset = 0.0
+    for _ in range(CLOCK_SAMPLES):
+        sent = time()
+        connection.send(("clock", None))
+        _, worker_time = connection.recv()
+        received = time()
+        round_trip = received - sent
+        if best_round_trip is None or round_trip < best_round_trip:
+            best_round_trip = round_trip
+            offset = worker_time - (sent + received) / 2.0
+    return offset
+
+
+def split_count(count, parts, index):
+    """Compute share of given count for the part with given index."""
+    return count // parts + (1 if index < count % parts else 0)
+
+
+def split_test(test, parts, index):
+    """Prepare share of the test that is to be run by one worker.
+
+    Number of calls is split between workers for ordinary tests, rate is split for
+    open-loop tests (where number of calls specifies just ratio between analyses).
+    """
+    share = dict(test)
+    if is_open_loop_test(test):
+        share["Rate"] = str(float(test["Rate"]) / parts)
+    else:
+        for column in ("Component analysis", "Stack analysis"):
+            share[column] = str(split_count(int(test[column]), parts, index))
+    return share
+
+
+def arrival_shift(test, parts, index):
+    """Compute delay of the schedule of worker with given index.
+
+    Each worker of open-loop test issues calls with rate Rate / parts, so
+    worker i is delayed by i / Rate to interleave calls of all workers
+    evenly instead of issuing them in bursts.
+    """
+    if parts < 2 or not is_open_loop_test(test):
+        return 0.0
+    return index / column_value(test, "Rate")
+
+
+def count_result(counts, result):
+    """Update [component analyses, stack analyses] counts by one result received from worker.
+
+    Stack analysis produces two results, it is counted by the GET one.
+    """
+    if result["name"] == "component_analysis":
+        counts[0] += 1
+    elif result["method"] == "GET":
+        counts[1] += 1
+
+
+class Coordinator:
+    """Coordinator that splits tests between workers and merges their results."""
+
+    def __init__(self, connections, processes=None):
+        """Remember connections to all workers and estimate their clock offsets."""
+        self.connections = connections
+        self.processes = processes or []
+        # indexes of workers that disconnected, they don't get any further tests
+        self.failed = set()
+        self.offsets = [estimate_clock_offset(c) for c in connections]
+        for i, offset in enumerate(self.offsets):
+            log.info("Worker #{w} clock offset: {o:.6f} s".format(w=i, o=offset))
+
+    @staticmethod
+    def start_local_workers(count):
+        """Start given number of worker processes on this machine.
+
+        Workers are spawned, not forked, as threads of the coordinator (dump
+        writer, telemetry) might hold locks at the time of fork.
+        """
+        context = get_context("spawn")
+        connections = []
+        processes = []
+        for _ in range(count):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(target=serve_connection, args=(child_connection,),
+                                      daemon=True)
+            process.start()
+            connections.append(parent_connection)
+            processes.append(process)
+        return Coordinator(connections, processes)
+
+    @staticmethod
+    def connect_to_workers(addresses, key):
+        """Connect to workers running on other hosts, addresses are in [host:]port format."""
+        connections = []
+        for address in addresses:
+            log.info("Connecting to worker {a}".format(a=address))
+            connections.append(Client(worker_address(address), authkey=key))
+        return Coordinator(connections)
+
+    def setup(self, cfg, component_analysis, stack_analysis):
+        """Send API setup and configuration to all workers."""
+        worker_cfg = {key: cfg[key] for key in WORKER_CFG_KEYS}
+        for i, connection in enumerate(self.connections):
+            connection.send(("setup", {"worker_id": i,
+                                       "cfg": worker_cfg,
+                                       "url": component_analysis.url,
+                                       "token": component_analysis.token,
+                                       "user_key": component_analysis.user_key,
+                                       "dump": component_analysis.dump_json_responses}))
+
+    def to_coordinator_clock(self, worker, result):
+        """Convert all timestamps in result from worker clock to coordinator clock."""
+        for attribute in TIME_ATTRIBUTES:
+            result[attribute] -= self.offsets[worker]
+        return result
+
+    def worker_failed(self, worker, error):
+        """Log the failed worker and exclude it from further tests."""
+        log.error("Worker #{w} failed, its remaining results are lost: {e}".format(
+            w=worker, e=str(error) or "connection closed"))
+        self.failed.add(worker)
+
+    def start_test(self, test):
+        """Send the test to all live workers, return connections of workers that got it."""
+        live = [i for i in range(len(self.connections)) if i not in self.failed]
+        start_at = time() + START_DELAY
+        workers = {}
+        for part, i in enumerate(live):
+            connection = self.connections[i]
+            try:
+                connection.send(("test", {"test": split_test(test, len(live), part),
+                                          "start_at": start_at + self.offsets[i] +
+                                          arrival_shift(test, len(live), part)}))
+            except OSError as e:
+                self.worker_failed(i, e)
+                continue
+            workers[connection] = i
+        return workers
+
+    def run_test(self, test, queue):
+        """Run test on all workers and store their results into the queue.
+
+        Workers that disconnect during the test are dropped, results that
+        arrived from them are kept and counted as the analyses they started.
+        Return number of component analyses and stack analyses started by
+        all workers.
+        """
+        workers = self.start_test(test)
+        if not workers:
+            log.error("No worker is available, the test is skipped")
+        # analyses whose results arrived, used for workers that don't report their counts
+        arrived = {connection: [0, 0] for connection in workers}
+        component_analysis_count = stack_analysis_count = 0
+        while workers:
+            for connection in wait(list(workers)):
+                try:
+                    message, payload = connection.recv()
+                except (EOFError, OSError) as e:
+                    self.worker_failed(workers.pop(connection), e)
+                    message, payload = "done", arrived[connection]
+                if message == "result":
+                    queue.put(self.to_coordinator_clock(workers[connection], payload))
+                    count_result(arrived[connection], payload)
+                elif message == "done":
+                    if connection in workers:
+                        log.info("Worker #{w} finished".format(w=workers.pop(connection)))
+                    component_analysis_count += payload[0]
+                    stack_analysis_count += payload[1]
+        return component_analysis_count, stack_analysis_count
+
+    def shutdown(self):
+        """Ask all workers to quit and wait for local worker processes."""
+        for i, connection in enumerate(self.connections):
+            if i not in self.failed:
+                try:
+                    connection.send(("quit", None))
+                except OSError as e:
+                    log.warning("Worker #{w} can't be asked to quit: {e}".format(w=i, e=e))
+            connection.close()
+        for process in self.processes:
+            process.join()
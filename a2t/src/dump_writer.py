@@ -0,0 +1,149 @@
+"""Background writer that dumps API responses into rotating compressed archives.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import csv
+import datetime
+import gzip
+import json
+import os
+import queue
+import threading
+from time import time
+
+from fastlog import log
+
+
+# directory where the API results needs to be dumped
+API_RESULTS_DIRECTORY = "api_results"
+
+# number of responses stored in one segment before new segment is started
+DEFAULT_SEGMENT_SIZE = 10000
+
+# maximum number of responses written by background thread at once
+BATCH_SIZE = 100
+
+# columns of the index file, key attributes not relevant for given response are left empty
+INDEX_COLUMNS = ("timestamp", "type", "ecosystem", "package", "version", "manifest", "job_id",
+                 "segment", "line")
+
+
+def dump_prefix(worker_id=None):
+    """Prepare prefix of all files written in one run, workers use their own files."""
+    prefix = "responses_" + datetime.datetime.utcnow().strftime("%Y-%m-%dT%H-%M-%S")
+    if worker_id is not None:
+        prefix += "_worker{w}".format(w=worker_id)
+    return prefix
+
+
+class DumpWriter:
+    """Writer that dumps API responses from background thread.
+
+    Responses are just put into the in-memory queue by the threads that
+    perform REST API calls, so the dumping does not add any latency to the
+    measured calls. The background thread writes responses in batches into
+    JSONL.gz segments and records each response into CSV index, so the
+    response can be found by E/P/V or by job ID without decompressing all
+    segments.
+    """
+
+    def __init__(self, directory=API_RESULTS_DIRECTORY, prefix=None,
+                 segment_size=DEFAULT_SEGMENT_SIZE):
+        """Open the index file and start the background thread."""
+        self.directory = directory
+        self.prefix = prefix or dump_prefix()
+        self.segment_size = segment_size
+        self.dropped = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._queue = queue.Queue()
+        self._segment = None
+        self._segment_number = 0
+        self._segment_lines = 0
+        # files are opened with the first response, so no empty files are left behind
+        self._index = None
+        self._index_writer = None
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def dump(self, type, json_response, **key):
+        """Schedule one response to be dumped, key contains E/P/V, manifest, or job ID."""
+        self._queue.put((time(), type, key, json_response))
+
+    def close(self):
+        """Write all scheduled responses and close all files."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._segment is not None:
+            self._segment.close()
+            self._index.close()
+        if self.dropped:
+            log.warning("{n} responses could not be dumped".format(n=self.dropped))
+
+    def segment_filename(self):
+        """Return name of file with current segment."""
+        return "{p}_{n:05d}.jsonl.gz".format(p=self.prefix, n=self._segment_number)
+
+    def _next_segment(self):
+        """Close the current segment, if any, and open new one."""
+        if self._segment is not None:
+            self._segment.close()
+        else:
+            self._index = open(os.path.join(self.directory, self.prefix + "_index.csv"), 'w',
+                               encoding='utf8', newline='')
+            self._index_writer = csv.writer(self._index)
+            self._index_writer.writerow(INDEX_COLUMNS)
+        self._segment_number += 1
+        self._segment_lines = 0
+        self._segment = gzip.open(os.path.join(self.directory, self.segment_filename()),
+                                  'wt', encoding='utf8')
+
+    def _write(self, item):
+        """Write one response into the current segment and record it into the index."""
+        timestamp, type, key, json_response = item
+        try:
+            line = json.dumps({"timestamp": timestamp, "type": type, "key": key,
+                               "json": json_response})
+        except (TypeError, ValueError):
+            self.dropped += 1
+            return
+        if self._segment is None or self._segment_lines >= self.segment_size:
+            self._next_segment()
+        self._segment.write(line)
+        self._segment.write("\n")
+        self._index_writer.writerow((timestamp, type, key.get("ecosystem"), key.get("package"),
+                                     key.get("version"), key.get("manifest"),
+                                     key.get("job_id"), self.segment_filename(),
+                                     self._segment_lines))
+        self._segment_lines += 1
+
+    def _run(self):
+        """Write scheduled responses in batches until the writer is closed."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for item in batch:
+                if item is None:
+                    return
+                self._write(item)
+            if self._index is not None:
+                self._index.flush()
@@ -0,0 +1,154 @@
+"""Latency histograms and statistic computed for each test and each endpoint.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from math import ceil, exp, floor, log
+
+
+# percentiles exported into reports
+PERCENTILES = (50, 90, 95, 99, 99.9)
+
+# relative precision of values stored in histogram (0.1%)
+DEFAULT_PRECISION = 0.001
+
+# lowest value that can be distinguished from zero (one microsecond)
+DEFAULT_LOWEST_VALUE = 1e-6
+
+
+class LatencyHistogram:
+    """HDR-style histogram with log-linear buckets.
+
+    Each bucket covers interval of values whose width is proportional to
+    the value itself, so all recorded values are kept with the same relative
+    precision while the memory needed does not depend on number of values.
+    """
+
+    def __init__(self, precision=DEFAULT_PRECISION, lowest=DEFAULT_LOWEST_VALUE):
+        """Prepare empty histogram with given relative precision."""
+        self._log_base = log(1.0 + precision)
+        self._lowest = lowest
+        self._buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _bucket_index(self, value):
+        """Compute index of bucket for given value."""
+        if value < self._lowest:
+            return 0
+        return 1 + int(floor(log(value / self._lowest) / self._log_base))
+
+    def _bucket_value(self, index):
+        """Compute the highest value that is stored in bucket with given index."""
+        if index == 0:
+            return self._lowest
+        return self._lowest * exp(self._log_base * index)
+
+    def record(self, value):
+        """Record one value into the histogram."""
+        index = self._bucket_index(value)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Add all values recorded in other histogram into this one."""
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def mean(self):
+        """Compute mean of all recorded values."""
+        return self.total / self.count if self.count else None
+
+    def value_at_percentile(self, percentile):
+        """Return the value at given percentile (0..100)."""
+        if self.count == 0:
+            return None
+        rank = max(1, int(ceil(percentile / 100.0 * self.count)))
+        cumulative = 0
+        for index in sorted(self._buckets):
+            cumulative += self._buckets[index]
+            if cumulative >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+
+class EndpointStatistic:
+    """Latency histogram and status codes gathered for one endpoint."""
+
+    def __init__(self):
+        """Prepare empty statistic."""
+        self.histogram = LatencyHistogram()
+        self.status_codes = {}
+
+    def record(self, latency, status_code):
+        """Record latency and status code of one call."""
+        self.histogram.record(latency)
+        status_code = str(status_code)
+        self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+
+    def errors(self):
+        """Compute number of calls that did not end with HTTP code 2xx."""
+        return sum(count for status_code, count in self.status_codes.items()
+                   if not status_code.startswith("2"))
+
+    def error_rate(self):
+        """Compute ratio of calls that did not end with HTTP code 2xx."""
+        count = self.histogram.count
+        return self.errors() / count if count else 0.0
+
+    def throughput(self, duration):
+        """Compute number of calls per second for given test duration."""
+        return self.histogram.count / duration if duration > 0 else 0.0
+
+    def status_codes_as_str(self):
+        """Convert counts for all status codes into string like '200:10 500:1'."""
+        return " ".join("{c}:{n}".format(c=c, n=n) for c, n in sorted(self.status_codes.items()))
+
+
+class TestStatistic:
+    """Statistic for all endpoints called during one test."""
+
+    # endpoint names for all calls performed by A2T
+    ENDPOINTS = {
+        ("component_analysis", "GET"): "component GET",
+        ("stack_analysis", "POST"): "stack POST",
+        ("stack_analysis", "GET"): "stack GET",
+    }
+
+    def __init__(self):
+        """Prepare empty statistic for all endpoints."""
+        self.endpoints = {}
+
+    def record(self, result):
+        """Record the result of one API call."""
+        key = (result["name"], result["method"])
+        endpoint = TestStatistic.ENDPOINTS.get(key, " ".join(key))
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = EndpointStatistic()
+        self.endpoints[endpoint].record(result["latency"], result["status_code"])
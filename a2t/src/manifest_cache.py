@@ -0,0 +1,75 @@
+"""Cache of manifest payloads sent to the stack analysis.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+
+from urllib3.filepost import encode_multipart_formdata
+
+
+# directory with all manifests that can be sent to the stack analysis
+MANIFEST_DIRECTORY = "data"
+
+# extension -> (ecosystem, standard manifest name)
+MANIFEST_TYPES = {
+    ".txt": ("pypi", "requirements.txt"),
+    ".xml": ("maven", "pom.xml"),
+    ".json": ("npm", "package.json"),
+}
+
+
+class ManifestPayload:
+    """Multipart body with one manifest, encoded once and shared by all POST calls."""
+
+    def __init__(self, ecosystem, filename, manifest_name, content, path_to_manifest_file):
+        """Encode the manifest content into multipart body."""
+        self.ecosystem = ecosystem
+        self.filename = filename
+        self.body, self.content_type = encode_multipart_formdata(
+            [("manifest[]", (manifest_name, content)),
+             ("filePath[]", path_to_manifest_file)])
+
+
+class ManifestCache:
+    """All manifests found in the manifest directory, read into memory just once."""
+
+    def __init__(self, directory=MANIFEST_DIRECTORY):
+        """Read all manifests with known extension from the directory."""
+        self.directory = directory
+        self.payloads = {}
+        path_to_manifest_file = os.path.abspath(directory)
+        for filename in sorted(os.listdir(directory)):
+            extension = os.path.splitext(filename)[1]
+            if extension not in MANIFEST_TYPES:
+                continue
+            ecosystem, manifest_name = MANIFEST_TYPES[extension]
+            with open(os.path.join(directory, filename), 'rb') as fin:
+                content = fin.read()
+            self.payloads[filename] = ManifestPayload(ecosystem, filename, manifest_name,
+                                                      content, path_to_manifest_file)
+
+    def payload(self, filename):
+        """Return payload for the manifest stored in the given file."""
+        try:
+            return self.payloads[filename]
+        except KeyError:
+            raise Exception("Unknown manifest: {f}".format(f=filename))
+
+    def manifests(self, ecosystems):
+        """Return list of (ecosystem, filename) pairs for all manifests of given ecosystems."""
+        return [(payload.ecosystem, filename) for filename, payload in self.payloads.items()
+                if payload.ecosystem in ecosystems]
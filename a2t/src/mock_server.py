@@ -0,0 +1,353 @@
+"""Mock analytics server used to measure overhead and throughput of the load generator itself.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import json
+import random
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from time import time, sleep
+from urllib.parse import urlparse, unquote
+from uuid import uuid4
+
+from fastlog import log
+
+
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 5000
+
+# error codes returned when error injection is enabled and no codes are specified
+DEFAULT_ERROR_CODES = "500,503"
+
+# value of Retry-After header sent together with injected 429 Too Many Requests
+RETRY_AFTER = 1
+
+# maximum number of pending connections, the default one is too low for cold connections
+REQUEST_QUEUE_SIZE = 1024
+
+
+class LatencyDistribution:
+    """Distribution of latencies specified by string in the form 'name:parameters'.
+
+    Supported distributions (all values are in seconds):
+        const:value
+        uniform:min,max
+        normal:mean,deviation
+        exp:mean
+        lognormal:median,sigma
+    """
+
+    DISTRIBUTIONS = {
+        "const": 1,
+        "uniform": 2,
+        "normal": 2,
+        "exp": 1,
+        "lognormal": 2,
+    }
+
+    def __init__(self, spec):
+        """Parse the distribution specification."""
+        name, _, parameters = spec.partition(":")
+        if name not in LatencyDistribution.DISTRIBUTIONS:
+            raise ValueError("Unknown distribution '{n}'".format(n=name))
+        self.name = name
+        self.parameters = [float(p) for p in parameters.split(",") if p]
+        if len(self.parameters) != LatencyDistribution.DISTRIBUTIONS[name]:
+            raise ValueError("Distribution '{n}' expects {c} parameter(s)".format(
+                n=name, c=LatencyDistribution.DISTRIBUTIONS[name]))
+
+    def sample(self, rng):
+        """Return one latency drawn from the distribution, never negative."""
+        p = self.parameters
+        if self.name == "const":
+            value = p[0]
+        elif self.name == "uniform":
+            value = rng.uniform(p[0], p[1])
+        elif self.name == "normal":
+            value = rng.gauss(p[0], p[1])
+        elif self.name == "exp":
+            value = rng.expovariate(1.0 / p[0]) if p[0] > 0 else 0.0
+        else:
+            value = p[0] * rng.lognormvariate(0.0, p[1])
+        return max(value, 0.0)
+
+    def __str__(self):
+        """Return the distribution specification."""
+        return "{n}:{p}".format(n=self.name, p=",".join(str(p) for p in self.parameters))
+
+
+class MockAnalytics:
+    """State of the mock server: latencies, error injection, and running stack analyses."""
+
+    def __init__(self, latencies, stack_analysis_duration, error_rate, error_codes, seed=None):
+        """Store configuration, latencies is a dict endpoint -> LatencyDistribution."""
+        self.latencies = latencies
+        self.stack_analysis_duration = stack_analysis_duration
+        self.error_rate = error_rate
+        self.error_codes = error_codes
+        self.rng = random.Random(seed)
+        # job ID -> time when the stack analysis will be finished
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def wait(self, endpoint):
+        """Simulate the processing time of given endpoint."""
+        latency = self.latencies[endpoint].sample(self.rng)
+        if latency > 0:
+            sleep(latency)
+
+    def injected_error(self):
+        """Return HTTP code of injected error, or None when the call should succeed."""
+        if self.error_rate > 0 and self.rng.random() < self.error_rate:
+            return self.rng.choice(self.error_codes)
+        return None
+
+    def start_job(self):
+        """Start new stack analysis and return its ID."""
+        job_id = uuid4().hex
+        finished = time() + self.stack_analysis_duration.sample(self.rng)
+        with self.lock:
+            self.jobs[job_id] = finished
+        return job_id
+
+    def job_status(self, job_id):
+        """Return HTTP code for the stack analysis: 202 while running, 200 when finished.
+
+        Finished jobs are forgotten, so the memory does not grow during long tests.
+        """
+        with self.lock:
+            finished = self.jobs.get(job_id)
+            if finished is None:
+                return 404
+            if time() < finished:
+                return 202
+            del self.jobs[job_id]
+            return 200
+
+
+def component_analysis_response(ecosystem, package, version):
+    """Prepare response for component analysis with the same structure as the real one."""
+    return {"result": {"recommendation": {},
+                       "data": [{"package": {"ecosystem": [ecosystem],
+                                             "name": [package]},
+                                 "version": {"pecosystem": [ecosystem],
+                                             "pname": [package],
+                                             "version": [version]}}]}}
+
+
+def stack_analysis_response(job_id):
+    """Prepare response for finished stack analysis."""
+    return {"request_id": job_id,
+            "result": [{"recommendation": {"alternate": [], "companion": []},
+                        "user_stack_info": {"analyzed_dependencies": []}}]}
+
+
+class MockAnalyticsHandler(BaseHTTPRequestHandler):
+    """Handler for all requests sent to the mock server."""
+
+    # keep-alive connections are needed to measure warm connections
+    protocol_version = "HTTP/1.1"
+
+    API_PREFIX = "/api/v1/"
+
+    def log_message(self, format, *args):
+        """Don't log each request, it would slow down the server considerably."""
+
+    def send_json(self, status_code, payload, headers=None):
+        """Send response with JSON payload."""
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_response(self, status_code):
+        """Send response with given error code."""
+        headers = {"Retry-After": str(RETRY_AFTER)} if status_code == 429 else None
+        self.send_json(status_code, {"error": "injected error {c}".format(c=status_code)},
+                       headers)
+
+    def read_body(self):
+        """Read and drop the request body, both fixed-size and chunked ones are supported."""
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                self.rfile.read(size + 2)
+                if size == 0:
+                    break
+        else:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def endpoint(self):
+        """Return path parts after the API prefix, or None for unknown paths."""
+        path = urlparse(self.path).path
+        if not path.startswith(MockAnalyticsHandler.API_PREFIX):
+            return None
+        return [unquote(part) for part in path[len(MockAnalyticsHandler.API_PREFIX):].split("/")]
+
+    def get_readiness(self, mock, parts):
+        """Handle readiness probe."""
+        mock.wait("readiness")
+        self.send_json(200, {})
+
+    def get_component_analysis(self, mock, parts):
+        """Handle component analysis for ecosystem, package, and version."""
+        mock.wait("component")
+        error = mock.injected_error()
+        if error is not None:
+            self.send_error_response(error)
+        else:
+            self.send_json(200, component_analysis_response(*parts[1:]))
+
+    def get_stack_analysis(self, mock, parts):
+        """Handle stack analysis result, 202 is returned while the analysis is running."""
+        mock.wait("stack_get")
+        error = mock.injected_error()
+        if error is not None:
+            self.send_error_response(error)
+            return
+        job_id = parts[1]
+        status_code = mock.job_status(job_id)
+        if status_code == 200:
+            self.send_json(200, stack_analysis_response(job_id))
+        elif status_code == 202:
+            self.send_json(202, {"status": "Analysis for request ID '{i}' is in progress".
+                                 format(i=job_id)})
+        else:
+            self.send_json(404, {"error": "unknown request ID"})
+
+    # (first path part, number of path parts) -> handler of GET request
+    GET_ROUTES = {
+        ("readiness", 1): get_readiness,
+        ("component-analyses", 4): get_component_analysis,
+        ("stack-analyses", 2): get_stack_analysis,
+    }
+
+    def do_GET(self):
+        """Handle readiness, component analysis, and stack analysis results."""
+        if urlparse(self.path).path == "/":
+            # used by a2t to check that the tested system is available
+            self.send_json(200, {"paths": [MockAnalyticsHandler.API_PREFIX]})
+            return
+        parts = self.endpoint()
+        handler = MockAnalyticsHandler.GET_ROUTES.get((parts[0], len(parts))) if parts else None
+        if handler is None:
+            self.send_json(404, {"error": "unknown endpoint"})
+        else:
+            handler(self, self.server.mock, parts)
+
+    def do_POST(self):
+        """Handle request to start new stack analysis."""
+        mock = self.server.mock
+        self.read_body()
+
+        if self.endpoint() != ["stack-analyses"]:
+            self.send_json(404, {"error": "unknown endpoint"})
+            return
+
+        mock.wait("stack_post")
+        error = mock.injected_error()
+        if error is not None:
+            self.send_error_response(error)
+        else:
+            self.send_json(200, {"id": mock.start_job(), "status": "success"})
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """HTTP server handling each request in its own thread (http.server has it since 3.7 only)."""
+
+    daemon_threads = True
+
+
+class MockAnalyticsServer(ThreadingHTTPServer):
+    """HTTP server handling each connection in its own thread."""
+
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+    def __init__(self, address, mock):
+        """Bind to the address and remember the state shared by all handlers."""
+        super().__init__(address, MockAnalyticsHandler)
+        self.mock = mock
+
+
+def prepare_cli_parser():
+    """Prepare parser for command line arguments of the mock server."""
+    parser = argparse.ArgumentParser(
+        description="Mock analytics server. Latencies are specified as const:value, "
+                    "uniform:min,max, normal:mean,deviation, exp:mean, or "
+                    "lognormal:median,sigma (all values in seconds).")
+    parser.add_argument('--host', help='host to listen on (default=localhost)',
+                        default=DEFAULT_HOST)
+    parser.add_argument('--port', help='port to listen on (default=5000)',
+                        type=int, default=DEFAULT_PORT)
+    parser.add_argument('--readiness-latency', help='latency of readiness endpoint',
+                        type=LatencyDistribution, default="const:0")
+    parser.add_argument('--component-latency', help='latency of component analysis',
+                        type=LatencyDistribution, default="lognormal:0.05,0.5")
+    parser.add_argument('--stack-post-latency', help='latency of stack analysis request',
+                        type=LatencyDistribution, default="lognormal:0.1,0.5")
+    parser.add_argument('--stack-get-latency', help='latency of stack analysis result',
+                        type=LatencyDistribution, default="lognormal:0.02,0.5")
+    parser.add_argument('--stack-duration', help='time until stack analysis is finished',
+                        type=LatencyDistribution, default="uniform:1,5")
+    parser.add_argument('--error-rate', help='ratio of calls ending with error (default=0)',
+                        type=float, default=0.0)
+    parser.add_argument('--error-codes', help='HTTP codes of injected errors, 429 is sent '
+                                              'with Retry-After header (default=500,503)',
+                        default=DEFAULT_ERROR_CODES)
+    parser.add_argument('--seed', help='seed for latencies and errors', type=int)
+    return parser
+
+
+def main():
+    """Start the mock server and serve until interrupted."""
+    cli_arguments = prepare_cli_parser().parse_args()
+
+    latencies = {"readiness": cli_arguments.readiness_latency,
+                 "component": cli_arguments.component_latency,
+                 "stack_post": cli_arguments.stack_post_latency,
+                 "stack_get": cli_arguments.stack_get_latency}
+    error_codes = [int(code) for code in cli_arguments.error_codes.split(",")]
+
+    mock = MockAnalytics(latencies, cli_arguments.stack_duration,
+                         cli_arguments.error_rate, error_codes, cli_arguments.seed)
+    server = MockAnalyticsServer((cli_arguments.host, cli_arguments.port), mock)
+
+    log.info("Mock analytics server")
+    with log.indent():
+        log.info("Listening on:     http://{h}:{p}/".format(
+            h=cli_arguments.host, p=cli_arguments.port))
+        for endpoint, latency in sorted(latencies.items()):
+            log.info("{e:18}{l}".format(e=endpoint + ":", l=latency))
+        log.info("Stack duration:   {d}".format(d=cli_arguments.stack_duration))
+        log.info("Error rate:       {r} ({c})".format(
+            r=cli_arguments.error_rate, c=cli_arguments.error_codes))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("Stopping")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
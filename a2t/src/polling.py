@@ -0,0 +1,84 @@
+"""Strategy used to poll for results of long running analyses.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+
+# first interval between two polls, in seconds
+DEFAULT_INITIAL_INTERVAL = 0.5
+
+# the longest interval between two polls, in seconds
+DEFAULT_MAXIMUM_INTERVAL = 15
+
+# factor used to prolong the interval after each poll
+DEFAULT_BACKOFF = 1.5
+
+# relative amount of random jitter added to each interval
+DEFAULT_JITTER = 0.1
+
+# maximum time to wait for results, in seconds
+DEFAULT_TIMEOUT = 10 * 60
+
+
+class PollingStrategy:
+    """Polling with short initial interval, exponential backoff, and jitter.
+
+    Jitter prevents all threads from polling the server in lockstep, server
+    hints sent in Retry-After header are honored as well.
+    """
+
+    def __init__(self, initial=DEFAULT_INITIAL_INTERVAL, maximum=DEFAULT_MAXIMUM_INTERVAL,
+                 backoff=DEFAULT_BACKOFF, jitter=DEFAULT_JITTER, timeout=DEFAULT_TIMEOUT):
+        """Set up intervals, backoff factor, jitter, and overall timeout."""
+        self.initial = initial
+        self.maximum = maximum
+        self.backoff = backoff
+        self.jitter = jitter
+        self.timeout = timeout
+
+    def intervals(self):
+        """Generate (infinite) sequence of intervals between polls."""
+        interval = self.initial
+        while True:
+            yield interval * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+            interval = min(interval * self.backoff, self.maximum)
+
+    @staticmethod
+    def retry_after(response):
+        """Read number of seconds from Retry-After header, if it is set."""
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            date = parsedate_to_datetime(value)
+            return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def interval_after_response(self, response, interval):
+        """Compute interval before next poll, server might ask us to wait longer."""
+        retry_after = PollingStrategy.retry_after(response)
+        if retry_after is None:
+            return interval
+        return max(interval, retry_after)
@@ -21,6 +21,8 @@ import os
 import sys
 import platform
 
+from latency_statistic import PERCENTILES
+
 
 def export_header(csv_writer):
     """Export CSV header."""
@@ -30,7 +32,8 @@ def export_header(csv_writer):
                          "Manifest",
                          "Thread#", "Status code",
                          "Analysis results",
-                         "Start time", "End time", "Duration"])
+                         "Start time", "End time", "Duration",
+                         "Scheduled time", "Latency"])
 
 
 def export_environment_info(csv_writer):
@@ -47,25 +50,34 @@ def export_test_setup(csv_writer, test):
     csv_writer.writerow(["Name", "Component analysis", "Stack analysis",
                          "Python payload", "Maven payload", "NPM payload",
                          "Improper payload", "Mix payloads",
-                         "Check responses", "Export responses", "Comment"])
+                         "Check responses", "Export responses", "Comment",
+                         "Rate", "Ramp up", "Duration", "Ramp down", "Concurrency"])
     csv_writer.writerow([test["Name"], test["Component analysis"], test["Stack analysis"],
                          test["Python payload"], test["Maven payload"], test["NPM payload"],
                          test["Improper payload"], test["Mix payloads"],
-                         test["Check responses"], test["Export responses"], test["Comment"]])
+                         test["Check responses"], test["Export responses"], test["Comment"],
+                         test.get("Rate", ""), test.get("Ramp up", ""),
+                         test.get("Duration", ""), test.get("Ramp down", ""),
+                         test.get("Concurrency", "")])
+
+
+def result_row(i, result):
+    """Convert result of one API call into row to be exported into CSV."""
+    return [i,
+            result["name"], result["method"],
+            result["ecosystem"], result["package"], result["version"],
+            result["manifest"],
+            result["thread_id"],
+            result["status_code"],
+            result["analysis"],
+            result["started"], result["finished"], result["duration"],
+            result["scheduled"], result["latency"]]
 
 
 def export_test_results(csv_writer, results):
-    """Export results for all tests/API calls."""
-    for i in range(results.qsize()):
-        result = results.get()
-        csv_writer.writerow([i + 1,
-                             result["name"], result["method"],
-                             result["ecosystem"], result["package"], result["version"],
-                             result["manifest"],
-                             result["thread_id"],
-                             result["status_code"],
-                             result["analysis"],
-                             result["started"], result["finished"], result["duration"]])
+    """Export results for all tests/API calls, rows are streamed from the result sink."""
+    for row in results.rows():
+        csv_writer.writerow(row)
 
 
 def export_totat_time(csv_writer, start, end, duration):
@@ -75,6 +87,35 @@ def export_totat_time(csv_writer, start, end, duration):
     csv_writer.writerow(["Duration", duration])
 
 
+def percentile_names():
+    """Names of columns with percentiles."""
+    return ["p{p:g}".format(p=p) for p in PERCENTILES]
+
+
+def statistic_header():
+    """Header for latency statistic computed for each endpoint."""
+    return ["Endpoint", "Calls", "Throughput", "Errors", "Error rate",
+            "Min"] + percentile_names() + ["Max", "Mean", "Status codes"]
+
+
+def statistic_row(endpoint, endpoint_statistic, duration):
+    """Convert latency statistic for one endpoint into row to be exported into CSV."""
+    histogram = endpoint_statistic.histogram
+    return [endpoint, histogram.count,
+            endpoint_statistic.throughput(duration),
+            endpoint_statistic.errors(), endpoint_statistic.error_rate(),
+            histogram.min] + \
+        [histogram.value_at_percentile(p) for p in PERCENTILES] + \
+        [histogram.max, histogram.mean(), endpoint_statistic.status_codes_as_str()]
+
+
+def export_latency_statistic(csv_writer, statistic, duration):
+    """Export latency percentiles, throughput, and error rates for all endpoints."""
+    csv_writer.writerow(statistic_header())
+    for endpoint, endpoint_statistic in sorted(statistic.endpoints.items()):
+        csv_writer.writerow(statistic_row(endpoint, endpoint_statistic, duration))
+
+
 def generate_csv_report(results, test, start, end, duration, filename):
     """Generate CSV report with all A2T tests."""
     with open(filename, 'w', encoding='utf8') as fout:
@@ -85,5 +126,71 @@ def generate_csv_report(results, test, start, end, duration, filename):
         csv_writer.writerow([])
         export_totat_time(csv_writer, start, end, duration)
         csv_writer.writerow([])
+        export_latency_statistic(csv_writer, results.statistic, duration)
+        csv_writer.writerow([])
         export_header(csv_writer)
         export_test_results(csv_writer, results)
+
+
+def generate_summary_report(summary, filename):
+    """Generate CSV report with latency statistic for all tests that have been run.
+
+    Summary is a list of (test name, test statistic, test duration) tuples.
+    """
+    with open(filename, 'w', encoding='utf8') as fout:
+        csv_writer = csv.writer(fout)
+        csv_writer.writerow(["Test name"] + statistic_header())
+        for test_name, statistic, duration in summary:
+            for endpoint, endpoint_statistic in sorted(statistic.endpoints.items()):
+                csv_writer.writerow([test_name] +
+                                    statistic_row(endpoint, endpoint_statistic, duration))
+
+
+def ratio(concurrent, isolated):
+    """Compute how many times the value has changed, N/A when there is no isolated value."""
+    return concurrent / isolated if isolated else "N/A"
+
+
+def interference_header():
+    """Prepare header for the report comparing tests run in isolation and concurrently."""
+    header = ["Test name", "Endpoint", "Isolated calls", "Concurrent calls",
+              "Isolated throughput", "Concurrent throughput",
+              "Isolated error rate", "Concurrent error rate"]
+    for name in percentile_names():
+        header += ["Isolated " + name, "Concurrent " + name, name + " ratio"]
+    return header
+
+
+def interference_row(test_name, endpoint, isolated, isolated_duration,
+                     concurrent, concurrent_duration):
+    """Compare statistic for one endpoint of test run in isolation and concurrently."""
+    row = [test_name, endpoint, isolated.histogram.count, concurrent.histogram.count,
+           isolated.throughput(isolated_duration), concurrent.throughput(concurrent_duration),
+           isolated.error_rate(), concurrent.error_rate()]
+    for p in PERCENTILES:
+        isolated_value = isolated.histogram.value_at_percentile(p)
+        concurrent_value = concurrent.histogram.value_at_percentile(p)
+        row += [isolated_value, concurrent_value, ratio(concurrent_value, isolated_value)]
+    return row
+
+
+def generate_interference_report(isolated, concurrent, suffix, filename):
+    """Generate CSV report showing how latencies change when tests compete with each other.
+
+    Both isolated and concurrent are lists of (test name, test statistic, test duration)
+    tuples, names of tests run in isolation end with given suffix.
+    """
+    isolated = {name[:-len(suffix)]: (statistic, duration)
+                for name, statistic, duration in isolated}
+    with open(filename, 'w', encoding='utf8') as fout:
+        csv_writer = csv.writer(fout)
+        csv_writer.writerow(interference_header())
+        for test_name, statistic, duration in concurrent:
+            if test_name not in isolated:
+                continue
+            isolated_statistic, isolated_duration = isolated[test_name]
+            for endpoint, endpoint_statistic in sorted(statistic.endpoints.items()):
+                if endpoint in isolated_statistic.endpoints:
+                    csv_writer.writerow(interference_row(
+                        test_name, endpoint, isolated_statistic.endpoints[endpoint],
+                        isolated_duration, endpoint_statistic, duration))
@@ -0,0 +1,82 @@
+"""Sink that streams results of API calls to disk so memory stays flat during test.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import csv
+import gzip
+import json
+import os
+import threading
+
+from report_generator import result_row
+from latency_statistic import TestStatistic
+
+
+class ResultSink:
+    """Sink that writes each result row to disk as soon as it is stored.
+
+    The sink can be used instead of queue.Queue by all analysis classes
+    as it provides the put() and qsize() methods. Only the result row is
+    written to the append-only spool file, full JSON payloads that have
+    been checked already are dropped or spilled to separate compressed
+    JSONL file when requested.
+    """
+
+    def __init__(self, spool_filename, payloads_filename=None, telemetry=None):
+        """Open the spool file and, optionally, the compressed file for payloads."""
+        self._lock = threading.Lock()
+        self._telemetry = telemetry
+        self._count = 0
+        self.statistic = TestStatistic()
+        self.spool_filename = spool_filename
+        self.payloads_filename = payloads_filename
+        self._spool = open(spool_filename, 'w', encoding='utf8', newline='')
+        self._csv_writer = csv.writer(self._spool)
+        self._payloads = None
+        if payloads_filename is not None:
+            self._payloads = gzip.open(payloads_filename, 'wt', encoding='utf8')
+
+    def put(self, result):
+        """Write one result into the spool file, spill the payload if enabled."""
+        with self._lock:
+            self._count += 1
+            self._csv_writer.writerow(result_row(self._count, result))
+            self.statistic.record(result)
+            if self._telemetry is not None:
+                self._telemetry.record(result)
+            if self._payloads is not None and result.get("json"):
+                json.dump({"#": self._count, "json": result["json"]}, self._payloads)
+                self._payloads.write("\n")
+
+    def qsize(self):
+        """Return number of results written into the sink."""
+        return self._count
+
+    def close(self):
+        """Flush and close all files opened by the sink."""
+        self._spool.close()
+        if self._payloads is not None:
+            self._payloads.close()
+
+    def rows(self):
+        """Read all result rows back from the spool file, one by one."""
+        with open(self.spool_filename, 'r', encoding='utf8', newline='') as fin:
+            yield from csv.reader(fin)
+
+    def remove(self):
+        """Remove the spool file, typically when the report has been generated."""
+        os.remove(self.spool_filename)
@@ -0,0 +1,197 @@
+"""Open-loop scheduler that issues calls at target rate with ramp-up and ramp-down stages.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from math import sqrt
+from queue import Queue
+from time import time, sleep
+from threading import Thread
+
+from fastlog import log
+
+
+# kind of calls issued by scheduler
+COMPONENT_ANALYSIS = "component_analysis"
+STACK_ANALYSIS = "stack_analysis"
+
+# time given to scheduler to prepare itself before the first call is issued
+SCHEDULER_LEAD_TIME = 0.5
+
+
+def column_value(test, column):
+    """Read numeric value from test description, empty or missing value means zero."""
+    value = test.get(column)
+    return float(value) if value else 0.0
+
+
+def is_open_loop_test(test):
+    """Check if the test is to be run with constant arrival rate."""
+    return column_value(test, "Rate") > 0
+
+
+def parse_stages(test):
+    """Parse load stages from the test description.
+
+    Each stage is represented by tuple (duration, start rate, end rate), rate is
+    linearly changed between start and end rate during the stage.
+    """
+    rate = column_value(test, "Rate")
+    ramp_up = column_value(test, "Ramp up")
+    duration = column_value(test, "Duration")
+    ramp_down = column_value(test, "Ramp down")
+
+    stages = []
+    if ramp_up > 0:
+        stages.append((ramp_up, 0.0, rate))
+    if duration > 0:
+        stages.append((duration, rate, rate))
+    if ramp_down > 0:
+        stages.append((ramp_down, rate, 0.0))
+    return stages
+
+
+def total_calls(stages):
+    """Compute number of calls issued during all stages."""
+    return int(sum(duration * (start_rate + end_rate) / 2.0
+                   for duration, start_rate, end_rate in stages) + 1e-9)
+
+
+def arrival_times(stages):
+    """Generate intended start times of all calls, relative to the test start.
+
+    The k-th call is issued at time t when the number of calls that should have
+    been issued (integral of rate over time) reaches k.
+    """
+    stage_start = 0.0
+    issued = 0.0
+    k = 1
+    for duration, start_rate, end_rate in stages:
+        acceleration = (end_rate - start_rate) / duration
+        while True:
+            remaining = k - issued
+            discriminant = start_rate * start_rate + 2.0 * acceleration * remaining
+            if discriminant < 0:
+                break
+            denominator = start_rate + sqrt(discriminant)
+            if denominator <= 0:
+                break
+            # numerically stable root of: acceleration/2 * t^2 + start_rate * t = remaining
+            offset = 2.0 * remaining / denominator
+            if offset > duration:
+                break
+            yield stage_start + offset
+            k += 1
+        stage_start += duration
+        issued += duration * (start_rate + end_rate) / 2.0
+
+
+def split_calls(stages, component_analysis_count, stack_analysis_count):
+    """Split calls issued during all stages between component and stack analyses.
+
+    Ratio between both analysis types is the same as ratio of counts specified in test.
+    """
+    total = total_calls(stages)
+    requested = component_analysis_count + stack_analysis_count
+    if requested == 0:
+        return 0, 0
+    component_analyses = round(total * component_analysis_count / requested)
+    return component_analyses, total - component_analyses
+
+
+def immediate_calls(component_analysis_calls, stack_analysis_calls):
+    """Generate all calls without intended start time, ie. calls to be issued at once."""
+    for call in component_analysis_calls:
+        yield None, COMPONENT_ANALYSIS, call
+    for call in stack_analysis_calls:
+        yield None, STACK_ANALYSIS, call
+
+
+def scheduled_calls(stages, component_analysis_calls, stack_analysis_calls,
+                    component_analysis_count, stack_analysis_count):
+    """Generate all calls together with their intended start time.
+
+    Calls of both types are interleaved evenly so the ratio is the same at any time.
+    The schedule starts when the first call is requested, not when generator is created.
+    """
+    base_time = schedule_start()
+    total = component_analysis_count + stack_analysis_count
+    issued_component_analyses = 0
+    for i, offset in enumerate(arrival_times(stages)):
+        if i >= total:
+            break
+        if issued_component_analyses * total < (i + 1) * component_analysis_count:
+            issued_component_analyses += 1
+            yield base_time + offset, COMPONENT_ANALYSIS, next(component_analysis_calls)
+        else:
+            yield base_time + offset, STACK_ANALYSIS, next(stack_analysis_calls)
+
+
+def run_open_loop(queue, threads, component_analysis_start, stack_analysis_start, calls):
+    """Start each call in a new thread at its intended start time."""
+    for scheduled, kind, call in calls:
+        wait_for(scheduled)
+        if kind == COMPONENT_ANALYSIS:
+            target = component_analysis_start
+        else:
+            target = stack_analysis_start
+        t = Thread(target=target, args=call + (queue, scheduled))
+        t.start()
+        threads.append(t)
+    log.info("All calls have been issued")
+
+
+def run_thread_pool(queue, concurrency, component_analysis_start, stack_analysis_start, calls):
+    """Perform all calls by fixed number of worker threads.
+
+    Calls with intended start time are handed to workers at that time, if all
+    workers are busy, the call waits and its latency includes the waiting.
+    """
+    targets = {COMPONENT_ANALYSIS: component_analysis_start, STACK_ANALYSIS: stack_analysis_start}
+    work = Queue()
+
+    def worker():
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            scheduled, kind, call = item
+            targets[kind](*(call + (queue, scheduled)))
+
+    workers = [Thread(target=worker) for _ in range(concurrency)]
+    for t in workers:
+        t.start()
+    for scheduled, kind, call in calls:
+        if scheduled is not None:
+            wait_for(scheduled)
+        work.put((scheduled, kind, call))
+    log.info("All calls have been issued")
+    # one stop mark for each worker, they are processed after all calls
+    for _ in workers:
+        work.put(None)
+    return workers
+
+
+def wait_for(scheduled):
+    """Wait until the intended start time of call."""
+    delay = scheduled - time()
+    if delay > 0:
+        sleep(delay)
+
+
+def schedule_start():
+    """Compute the time when the first stage starts."""
+    return time() + SCHEDULER_LEAD_TIME
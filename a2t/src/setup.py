@@ -21,12 +21,19 @@ import sys
 from fastlog import log
 
 from auth import retrieve_access_token
+from connection_pool import CONNECTION_WARM
+from polling import PollingStrategy
+from workload import WorkloadModel, DEFAULT_WORKLOAD_FILE_NAME, DEFAULT_SEED
 
 # The following endpoint is used to get the access token from OSIO AUTH service
 _AUTH_ENDPOINT = "/api/token/refresh"
 
 DEFAULT_INPUT_FILE_NAME = "scenarios.csv"
 
+# engines that can be used to perform REST API calls
+ENGINE_THREADS = "threads"
+ENGINE_ASYNCIO = "asyncio"
+
 
 def add_slash(url):
     """Add a slash at the end of URL if the slash is not already presented."""
@@ -113,6 +120,29 @@ def get_input_file(cli_arguments):
     return cli_arguments.input or DEFAULT_INPUT_FILE_NAME
 
 
+def get_workload_file(cli_arguments):
+    """Retrieve the workload file name."""
+    return cli_arguments.workload or DEFAULT_WORKLOAD_FILE_NAME
+
+
+def get_seed(cli_arguments):
+    """Retrieve the seed for the workload."""
+    return DEFAULT_SEED if cli_arguments.seed is None else cli_arguments.seed
+
+
+def cache_hit_ratio_as_str(cache_hit_ratio):
+    """Convert cache hit ratio settings into string."""
+    return "given by weights" if cache_hit_ratio is None else str(cache_hit_ratio)
+
+
+def telemetry_as_str(interval, port):
+    """Convert telemetry settings into string."""
+    output = "each {i} s".format(i=interval) if interval else "not shown"
+    if port:
+        output += ", served on port {p}".format(p=port)
+    return output
+
+
 def get_access_token(api_token, user_key, dry_run, refresh_token, license_service_url):
     """Get the access token, but only when user_key is not set."""
     if api_token is not None:
@@ -135,6 +165,15 @@ def setup(cli_arguments):
         input_file = get_input_file(cli_arguments)
         dry_run = cli_arguments.dry
         tags = parse_tags(cli_arguments.tags)
+        engine = cli_arguments.engine
+        concurrency = cli_arguments.concurrency
+        connection = cli_arguments.connection
+        workload_file = get_workload_file(cli_arguments)
+        cache_hit_ratio = cli_arguments.cache_hit_ratio
+
+        if cache_hit_ratio is not None and not 0.0 <= cache_hit_ratio <= 1.0:
+            log.error("Cache hit ratio needs to be in range 0.0 to 1.0")
+            sys.exit(-1)
 
         if not dry_run:
             check_api_tokens_presence()
@@ -153,8 +192,37 @@ def setup(cli_arguments):
         log.info("Input file:       " + input_file)
         log.info("Auth service URL: " + license_service_url)
         log.info("Run tests:        " + tags_as_str(tags))
+        log.info("Concurrent tests: " + enabled_disabled(cli_arguments.concurrent))
+        if cli_arguments.concurrent:
+            log.info("Baseline:         " + enabled_disabled(cli_arguments.isolated_baseline))
         log.info("Refresh token:    " + refresh_token_as_str(refresh_token))
         log.info("User key:         " + user_key_as_str(user_key))
+        log.info("Engine:           " + engine)
+        if engine == ENGINE_ASYNCIO:
+            log.info("Concurrency:      " + str(concurrency))
+        log.info("Connections:      " + connection)
+        if connection == CONNECTION_WARM:
+            log.info("Pool size:        " + str(cli_arguments.pool_size))
+            log.info("Pool per host:    " + str(cli_arguments.pool_per_host))
+        log.info("Telemetry:        " + telemetry_as_str(
+            cli_arguments.telemetry_interval, cli_arguments.telemetry_port))
+        log.info("Workload file:    " + workload_file)
+        log.info("Seed:             " + str(get_seed(cli_arguments)))
+        log.info("Cache hit ratio:  " + cache_hit_ratio_as_str(cache_hit_ratio))
+        log.info("Polling:          {i}..{m} s, backoff {b}, jitter {j}, timeout {t} s".format(
+            i=cli_arguments.poll_initial, m=cli_arguments.poll_max,
+            b=cli_arguments.poll_backoff, j=cli_arguments.poll_jitter,
+            t=cli_arguments.poll_timeout))
+        workload = WorkloadModel.load(workload_file)
+        log.info("Workload entries: {n} ({h} cached, {m} not cached)".format(
+            n=workload.size(), h=workload.count(True), m=workload.count(False)))
+        if cache_hit_ratio is not None:
+            if cache_hit_ratio > 0.0 and workload.count(True) == 0:
+                log.error("Workload does not contain any cached component")
+                sys.exit(-1)
+            if cache_hit_ratio < 1.0 and workload.count(False) == 0:
+                log.error("Workload does not contain any not cached component")
+                sys.exit(-1)
         log.success("Success")
 
     access_token = get_access_token(api_token, user_key, dry_run, refresh_token,
@@ -164,4 +232,19 @@ def setup(cli_arguments):
             "user_key": user_key,
             "tags": tags,
             "dry_run": dry_run,
+            "engine": engine,
+            "concurrency": concurrency,
+            "connection": connection,
+            "pool_size": cli_arguments.pool_size,
+            "pool_per_host": cli_arguments.pool_per_host,
+            "polling": PollingStrategy(cli_arguments.poll_initial, cli_arguments.poll_max,
+                                       cli_arguments.poll_backoff, cli_arguments.poll_jitter,
+                                       cli_arguments.poll_timeout),
+            "workload": workload,
+            "concurrent": cli_arguments.concurrent,
+            "baseline": cli_arguments.isolated_baseline,
+            "telemetry_interval": cli_arguments.telemetry_interval,
+            "telemetry_port": cli_arguments.telemetry_port,
+            "seed": get_seed(cli_arguments),
+            "cache_hit_ratio": cache_hit_ratio,
             "input_file": input_file}
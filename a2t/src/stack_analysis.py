@@ -16,32 +16,30 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-import datetime
+import asyncio
 from time import time, sleep
-import json
 from fastlog import log
 from urllib.parse import urljoin
-import os
 
 from api import Api
+from polling import PollingStrategy
+from manifest_cache import ManifestCache
 
 
-# directory where the API results needs to be dumped
-API_RESULTS_DIRECTORY = "api_results"
-
-# TODO: make timeout configurable
-DEFAULT_TIMEOUT = 10 * 60
-
-DEFAULT_SLEEP_AMOUNT = 15
+# how many times the server can respond by 429 Too Many Requests during polling
+MAX_TOO_MANY_REQUESTS = 10
 
 
 class StackAnalysis(Api):
     """Implementation of stack analysis."""
 
-    def __init__(self, url, token, user_key, dump_json_responses):
+    def __init__(self, url, token, user_key, dump_writer=None, connection_pool=None,
+                 polling=None, manifest_cache=None):
         """Set the API endpoint and store the authorization token if provided."""
-        super().__init__(url, token, user_key)
-        self._dump_json_responses = dump_json_responses
+        super().__init__(url, token, user_key, connection_pool)
+        self.dump_writer = dump_writer
+        self.polling = polling or PollingStrategy()
+        self.manifest_cache = manifest_cache or ManifestCache()
 
     def analysis_url(self):
         """Construct URL for the component analyses REST API call."""
@@ -57,132 +55,122 @@ class StackAnalysis(Api):
             self.print_error_response(response, "error")
         return response.status_code == 200
 
-    def dump_analysis(self, type, ecosystem, manifest, json_response):
-        """Dump the stack analysis result into a file."""
-        timestamp_str = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f")
-        filename = API_RESULTS_DIRECTORY + "/"
-        filename += "stack_analysis_{t}_{e}_{m}_{type}.json".format(t=timestamp_str,
-                                                                    e=ecosystem,
-                                                                    m=manifest,
-                                                                    type=type)
-        with open(filename, 'w') as fout:
-            json.dump(json_response, fout)
-
-    @staticmethod
-    def get_manifest_name(filename):
-        """Get the standard manifest name for the given filename."""
-        manifests = {
-            ".txt": "requirements.txt",
-            ".xml": "pom.xml",
-            ".json": "package.json"}
-        for extension, manifest in manifests.items():
-            if filename.endswith(extension):
-                return manifest
-        raise Exception("Unknown extension in filename: {f}".format(f=filename))
-
-    @staticmethod
-    def prepare_manifest_files(filename):
-        """Send the selected manifest file to stack analysis."""
-        # default variable substitutions
-        filename = filename or 'requirements_click_6_star.txt'
-        manifest_name = StackAnalysis.get_manifest_name(filename)
-
-        log.info("filename with manifest data: {f}".format(f=filename))
-        log.info("standard manifest name: {n}".format(n=manifest_name))
-
-        filename = 'data/{filename}'.format(filename=filename)
-        manifest_file_dir = os.path.dirname(filename)
-        path_to_manifest_file = os.path.abspath(manifest_file_dir)
-
-        files = {'manifest[]': (manifest_name, open(filename, 'rb')),
-                 'filePath[]': (None, path_to_manifest_file)}
-        return files
-
-    def dump_response_if_enabled(self, ecosystem, manifest, response):
+    def dump_response_if_enabled(self, type, ecosystem, manifest, job_id, json_response):
         """Dump response from server, if dumping is enabled."""
-        if self._dump_json_responses:
-            log.info("Dumping server response")
-            json_resp = response.json()
-            self.dump_analysis("analysis", ecosystem, manifest, json_resp)
+        if self.dump_writer is not None:
+            self.dump_writer.dump("stack_analysis_" + type, json_response,
+                                  ecosystem=ecosystem, manifest=manifest, job_id=job_id)
+
+    def is_polling_finished(self, ecosystem, manifest, job_id, thread_id, response):
+        """Check the status code of stack analysis job and decide if polling is finished."""
+        status_code = response.status_code
+        log.info("thread# {t}  job# {j}  status code: {s}".format(
+            t=thread_id, j=job_id, s=status_code))
+
+        if status_code == 200:
+            self.dump_response_if_enabled("analysis", ecosystem, manifest, job_id,
+                                          response.json())
+            return True
+        # 401 code should be checked later
+        elif status_code == 401:
+            log.info("WARNING: got 401")
+            return True
+        elif status_code == 500 or status_code == 504:
+            log.info("WARNING: got {c}".format(c=status_code))
+        elif status_code == 429:
+            pass
+        elif status_code != 202:
+            # print("warning, got wrong status code {c}".format(c=status_code))
+            raise Exception('Bad HTTP status code {c}'.format(c=status_code))
+        return False
+
+    def next_poll_interval(self, response, interval, too_many_requests_cnt, deadline):
+        """Compute interval before next poll, check for timeout and too many 429 codes."""
+        if response.status_code == 429:
+            if too_many_requests_cnt > MAX_TOO_MANY_REQUESTS:
+                raise Exception('429 Too Many Requests')
+            interval = self.polling.interval_after_response(response, interval)
+            log.info("Additional sleep: {s:.2f} s".format(s=interval))
+        if time() + interval > deadline:
+            raise Exception('Timeout waiting for the stack analysis results')
+        return interval
 
     def wait_for_stack_analysis(self, ecosystem, manifest, job_id, thread_id=""):
-        """Wait for the stack analysis to finish."""
+        """Wait for the stack analysis to finish.
+
+        Return the last response together with the time when it has been received.
+        """
         endpoint = self.analysis_url() + "/" + job_id
 
-        timeout = DEFAULT_TIMEOUT
-        sleep_amount = DEFAULT_SLEEP_AMOUNT
+        deadline = time() + self.polling.timeout
         too_many_requests_cnt = 0
 
-        for _ in range(timeout // sleep_amount):
+        for interval in self.polling.intervals():
             response = self.perform_get_request(endpoint)
-            status_code = response.status_code
-            log.info("thread# {t}  job# {j}  status code: {s}".format(
-                t=thread_id, j=job_id, s=status_code))
-
-            if status_code == 200:
-                self.dump_response_if_enabled(ecosystem, manifest, response)
-                return response
-            # 401 code should be checked later
-            elif status_code == 401:
-                log.info("WARNING: got 401")
-                return response
-            elif status_code == 500 or status_code == 504:
-                log.info("WARNING: got {c}".format(c=status_code))
-            elif status_code == 429:
+            received = time()
+            if self.is_polling_finished(ecosystem, manifest, job_id, thread_id, response):
+                return response, received
+            if response.status_code == 429:
                 too_many_requests_cnt += 1
-                log.info("Additional sleep...")
-                sleep(sleep_amount)
-                if too_many_requests_cnt > 10:
-                    raise Exception('429 Too Many Requests')
-            elif status_code != 202:
-                # print("warning, got wrong status code {c}".format(c=status_code))
-                raise Exception('Bad HTTP status code {c}'.format(c=status_code))
-            sleep(sleep_amount)
-        else:
-            raise Exception('Timeout waiting for the stack analysis results')
+            sleep(self.next_poll_interval(response, interval, too_many_requests_cnt, deadline))
+
+    async def wait_for_stack_analysis_async(self, session, ecosystem, manifest, job_id,
+                                            thread_id=""):
+        """Wait for the stack analysis to finish, without blocking other coroutines.
+
+        Return the last response together with the time when it has been received.
+        """
+        endpoint = self.analysis_url() + "/" + job_id
+
+        deadline = time() + self.polling.timeout
+        too_many_requests_cnt = 0
+
+        for interval in self.polling.intervals():
+            response = await self.perform_get_request_async(session, endpoint)
+            received = time()
+            if self.is_polling_finished(ecosystem, manifest, job_id, thread_id, response):
+                return response, received
+            if response.status_code == 429:
+                too_many_requests_cnt += 1
+            await asyncio.sleep(self.next_poll_interval(response, interval,
+                                                        too_many_requests_cnt, deadline))
 
     def check_analysis(self, analysis):
         """Check the results of component analysis."""
         assert analysis is not None, "Analysis report expected"
         return "OK"
 
-    def start(self, thread_id=None, ecosystem=None, manifest=None, queue=None):
-        """Start the component analysis and check the status code."""
-        start_time = time()
-        endpoint = self.analysis_url()
-        files = StackAnalysis.prepare_manifest_files(manifest)
-
-        response = self.perform_post_request(endpoint, files)
-
+    def process_post_response(self, ecosystem, manifest, response):
+        """Check the response for POST call and retrieve job ID from it."""
         response.raise_for_status()
         status_code_post = response.status_code
 
         json_response_post = None
 
-        check = "N/A"
-
-        if status_code_post == 200:
-            if self._dump_json_responses:
-                json_response_post = response.json()
-                self.dump_analysis("request", ecosystem, manifest, response.json())
-                check = self.check_analysis(response.json())
-
-        post_time = time()
-        post_duration = post_time - start_time
-
-        # log.info(response.json())
         job_id = response.json().get("id")
         log.info("job ID: " + job_id)
 
-        try:
-            response = self.wait_for_stack_analysis(ecosystem, manifest, job_id, thread_id)
+        if status_code_post == 200 and self.dump_writer is not None:
+            json_response_post = response.json()
+            self.dump_response_if_enabled("request", ecosystem, manifest, job_id,
+                                          json_response_post)
+        return status_code_post, json_response_post, job_id
+
+    def process_results(self, thread_id, ecosystem, manifest,
+                        status_code_post, json_response_post, response,
+                        start_time, post_time, end_time, queue, scheduled=None):
+        """Construct results for the POST and GET calls and store them into the queue."""
+        # intended start time, used to compute latency free of coordinated omission
+        scheduled = scheduled or start_time
+
+        if isinstance(response, Exception):
+            status_code = str(response)
+            check = "N/A"
+            json_response = None
+        else:
             status_code = response.status_code
-            check = self.check_analysis(response.json())
-        except Exception as e:
-            status_code = str(e)
-
-        end_time = time()
-        duration = end_time - post_time
+            json_response = response.json()
+            check = self.check_analysis(json_response)
 
         r1 = {"name": "stack_analysis",
               "method": "POST",
@@ -194,7 +182,9 @@ class StackAnalysis(Api):
               "json": json_response_post,
               "started": start_time,
               "finished": post_time,
-              "duration": post_duration,
+              "duration": post_time - start_time,
+              "scheduled": scheduled,
+              "latency": post_time - scheduled,
               "analysis": "N/A (POST call)",
               "manifest": manifest
               }
@@ -206,10 +196,12 @@ class StackAnalysis(Api):
               "version": "N/A",
               "thread_id": thread_id,
               "status_code": status_code,
-              "json": response.json(),
+              "json": json_response,
               "started": post_time,
               "finished": end_time,
-              "duration": duration,
+              "duration": end_time - post_time,
+              "scheduled": post_time,
+              "latency": end_time - post_time,
               "analysis": check,
               "manifest": manifest
               }
@@ -220,3 +212,51 @@ class StackAnalysis(Api):
 
         # return both component analysis status and debug data (durations) as well
         return r1, r2
+
+    def start(self, thread_id=None, ecosystem=None, manifest=None, queue=None, scheduled=None):
+        """Start the component analysis and check the status code."""
+        start_time = time()
+        endpoint = self.analysis_url()
+        payload = self.manifest_cache.payload(manifest)
+
+        response = self.perform_post_request(endpoint, payload.body, payload.content_type)
+        post_time = time()
+        status_code_post, json_response_post, job_id = self.process_post_response(
+            ecosystem, manifest, response)
+
+        try:
+            # the time when the final response has been received, not when it is processed
+            response, end_time = self.wait_for_stack_analysis(ecosystem, manifest, job_id,
+                                                              thread_id)
+        except Exception as e:
+            response = e
+            end_time = time()
+
+        return self.process_results(thread_id, ecosystem, manifest,
+                                    status_code_post, json_response_post, response,
+                                    start_time, post_time, end_time, queue, scheduled)
+
+    async def start_async(self, session, thread_id=None, ecosystem=None, manifest=None,
+                          queue=None, scheduled=None):
+        """Start the stack analysis as a coroutine using the shared HTTP client."""
+        start_time = time()
+        endpoint = self.analysis_url()
+        payload = self.manifest_cache.payload(manifest)
+
+        response = await self.perform_post_request_async(session, endpoint, payload.body,
+                                                         payload.content_type)
+        post_time = time()
+        status_code_post, json_response_post, job_id = self.process_post_response(
+            ecosystem, manifest, response)
+
+        try:
+            # the time when the final response has been received, not when it is processed
+            response, end_time = await self.wait_for_stack_analysis_async(
+                session, ecosystem, manifest, job_id, thread_id)
+        except Exception as e:
+            response = e
+            end_time = time()
+
+        return self.process_results(thread_id, ecosystem, manifest,
+                                    status_code_post, json_response_post, response,
+                                    start_time, post_time, end_time, queue, scheduled)
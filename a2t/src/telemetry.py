@@ -0,0 +1,243 @@
+"""Live telemetry reported during the test run.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import json
+import socketserver
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from time import time
+
+from fastlog import log
+
+from latency_statistic import LatencyHistogram, TestStatistic
+
+
+# rolling percentiles are computed from calls finished during this number of seconds
+ROLLING_WINDOW = 10
+
+# percentiles reported by telemetry
+TELEMETRY_PERCENTILES = (50, 99)
+
+# endpoint that does not finish the call, the stack analysis finishes by the GET call
+STACK_POST = TestStatistic.ENDPOINTS[("stack_analysis", "POST")]
+
+
+class Telemetry:
+    """Counters and rolling latency histograms updated by all calls."""
+
+    def __init__(self, track_in_flight=True, window=ROLLING_WINDOW):
+        """Prepare empty telemetry.
+
+        In-flight calls can't be tracked when calls are issued by workers.
+        """
+        self._lock = threading.Lock()
+        self._track_in_flight = track_in_flight
+        self._window = window
+        # (second, {endpoint: histogram}) for the last seconds of the run
+        self._slots = deque()
+        self._last_tick = time()
+        self._last_completed = 0
+        self.issued = 0
+        self.completed = 0
+        self.status_codes = {}
+        self.last_snapshot = self.snapshot(0.0)
+
+    def track_issued(self, calls):
+        """Count calls as they are issued, calls is a generator of call specifications."""
+        for call in calls:
+            with self._lock:
+                self.issued += 1
+            yield call
+
+    def record(self, result):
+        """Record the result of one API call."""
+        endpoint = TestStatistic.ENDPOINTS.get((result["name"], result["method"]),
+                                               result["name"])
+        second = int(time())
+        with self._lock:
+            if endpoint != STACK_POST:
+                self.completed += 1
+            code = str(result["status_code"])
+            self.status_codes[code] = self.status_codes.get(code, 0) + 1
+            if not self._slots or self._slots[-1][0] != second:
+                self._slots.append((second, {}))
+            histograms = self._slots[-1][1]
+            if endpoint not in histograms:
+                histograms[endpoint] = LatencyHistogram()
+            histograms[endpoint].record(result["latency"])
+
+    def rolling_histograms(self, now):
+        """Merge histograms for the rolling window, older ones are dropped."""
+        while self._slots and self._slots[0][0] <= now - self._window:
+            self._slots.popleft()
+        merged = {}
+        for _, histograms in self._slots:
+            for endpoint, histogram in histograms.items():
+                if endpoint not in merged:
+                    merged[endpoint] = LatencyHistogram()
+                merged[endpoint].merge(histogram)
+        return merged
+
+    def snapshot(self, calls_per_second):
+        """Prepare snapshot of all values reported by telemetry."""
+        now = time()
+        with self._lock:
+            histograms = self.rolling_histograms(now)
+            latency = {endpoint: {"p{p}".format(p=p): histogram.value_at_percentile(p)
+                                  for p in TELEMETRY_PERCENTILES}
+                       for endpoint, histogram in sorted(histograms.items())}
+            in_flight = self.issued - self.completed if self._track_in_flight else None
+            return {"time": now,
+                    "in_flight": in_flight,
+                    "issued": self.issued if self._track_in_flight else None,
+                    "completed": self.completed,
+                    "calls_per_second": calls_per_second,
+                    "status_codes": dict(self.status_codes),
+                    "latency": latency}
+
+    def tick(self):
+        """Compute throughput since the last tick and take new snapshot."""
+        now = time()
+        completed = self.completed
+        calls_per_second = (completed - self._last_completed) / max(now - self._last_tick, 1e-6)
+        self._last_tick = now
+        self._last_completed = completed
+        self.last_snapshot = self.snapshot(calls_per_second)
+        return self.last_snapshot
+
+
+def format_value(value):
+    """Format latency or other value that might not be known yet."""
+    if value is None:
+        return "N/A"
+    if isinstance(value, float):
+        return "{v:.3f}".format(v=value)
+    return str(value)
+
+
+def snapshot_as_str(snapshot):
+    """Convert the snapshot into one line shown on the terminal."""
+    parts = ["in-flight: " + format_value(snapshot["in_flight"]),
+             "completed: {c} ({r:.1f}/s)".format(c=snapshot["completed"],
+                                                 r=snapshot["calls_per_second"])]
+    for endpoint, percentiles in snapshot["latency"].items():
+        parts.append("{e}: {p}".format(e=endpoint, p=" ".join(
+            "{n} {v}".format(n=name, v=format_value(value))
+            for name, value in percentiles.items())))
+    codes = " ".join("{c}:{n}".format(c=code, n=count)
+                     for code, count in sorted(snapshot["status_codes"].items()))
+    parts.append("codes: " + (codes or "none"))
+    return "  ".join(parts)
+
+
+def snapshot_as_prometheus(snapshot):
+    """Convert the snapshot into Prometheus text exposition format."""
+    lines = []
+
+    def metric(name, metric_type, help_text, samples):
+        lines.append("# HELP a2t_{n} {h}".format(n=name, h=help_text))
+        lines.append("# TYPE a2t_{n} {t}".format(n=name, t=metric_type))
+        for labels, value in samples:
+            if value is not None:
+                lines.append("a2t_{n}{l} {v}".format(n=name, l=labels, v=value))
+
+    metric("in_flight_calls", "gauge", "Calls issued but not finished yet.",
+           [("", snapshot["in_flight"])])
+    metric("completed_calls_total", "counter", "Calls finished since the start of the run.",
+           [("", snapshot["completed"])])
+    metric("calls_per_second", "gauge", "Calls finished per second.",
+           [("", snapshot["calls_per_second"])])
+    metric("responses_total", "counter", "Responses by HTTP status code.",
+           [('{{code="{c}"}}'.format(c=code), count)
+            for code, count in sorted(snapshot["status_codes"].items())])
+    metric("latency_seconds", "gauge", "Rolling latency percentiles.",
+           [('{{endpoint="{e}",quantile="{q:g}"}}'.format(e=endpoint, q=p / 100.0),
+             percentiles["p{p}".format(p=p)])
+            for endpoint, percentiles in snapshot["latency"].items()
+            for p in TELEMETRY_PERCENTILES])
+    return "\n".join(lines) + "\n"
+
+
+class TelemetryHandler(BaseHTTPRequestHandler):
+    """Handler that serves the last telemetry snapshot."""
+
+    def log_message(self, format, *args):
+        """Don't log requests to the telemetry endpoint."""
+
+    def do_GET(self):
+        """Serve snapshot as JSON on /json, in Prometheus format on all other paths."""
+        snapshot = self.server.telemetry.last_snapshot
+        if self.path.startswith("/json"):
+            body = json.dumps(snapshot).encode("utf-8")
+            content_type = "application/json"
+        else:
+            body = snapshot_as_prometheus(snapshot).encode("utf-8")
+            content_type = "text/plain; version=0.0.4"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """HTTP server handling each request in its own thread (http.server has it since 3.7 only)."""
+
+    daemon_threads = True
+
+
+class TelemetryReporter:
+    """Background thread that reports telemetry to the terminal and via HTTP endpoint."""
+
+    def __init__(self, telemetry, interval, port=None):
+        """Remember the telemetry and reporting settings, interval 0 disables terminal output."""
+        self.telemetry = telemetry
+        self.interval = interval
+        self.port = port
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def start(self):
+        """Start reporting, the HTTP endpoint listens on localhost only."""
+        if self.port:
+            self._server = ThreadingHTTPServer(("localhost", self.port), TelemetryHandler)
+            self._server.telemetry = self.telemetry
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+            log.info("Telemetry is available on http://localhost:{p}/metrics and /json".format(
+                p=self.port))
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Take snapshot each second (or each interval) until stopped."""
+        interval = self.interval or 1.0
+        while not self._stop.wait(interval):
+            snapshot = self.telemetry.tick()
+            if self.interval:
+                log.info("Telemetry: " + snapshot_as_str(snapshot))
+
+    def stop(self):
+        """Stop reporting and shut down the HTTP endpoint."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
@@ -18,20 +18,32 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import sys
 
-from random import randint
+from random import Random
 from fastlog import log
 from time import time
-from queue import Queue
 from threading import Thread
 
-from report_generator import generate_csv_report
-from component_generator import ComponentGenerator
-from setup import parse_tags
+from report_generator import generate_csv_report, generate_summary_report
+from report_generator import generate_interference_report
+from result_sink import ResultSink
+from setup import parse_tags, ENGINE_ASYNCIO
+from async_runner import run_benchmarks_async
+from scheduler import is_open_loop_test, parse_stages, split_calls
+from scheduler import immediate_calls, scheduled_calls, run_open_loop, run_thread_pool
 
 
 # directory containing test results
 RESULT_DIRECTORY = "test_results"
 
+# file containing latency statistic for all tests
+SUMMARY_FILENAME = RESULT_DIRECTORY + "/summary.csv"
+
+# file comparing latencies of tests run in isolation and concurrently
+INTERFERENCE_FILENAME = RESULT_DIRECTORY + "/interference.csv"
+
+# suffix added to names of tests run in isolation to get the baseline
+ISOLATED_SUFFIX = "_isolated"
+
 
 def check_number_of_results(queue_size, component_analysis_count, stack_analysis_count):
     """Check if we really got the same number of results as expected.
@@ -51,124 +63,82 @@ def check_number_of_results(queue_size, component_analysis_count, stack_analysis
             n=expected - queue_size))
 
 
-def prepare_component_generators(python_payload, maven_payload, npm_payload):
-    """Prepare all required component generators for selected payload types."""
-    component_generator = ComponentGenerator()
-    g_python = component_generator.generator_for_ecosystem("pypi")
-    g_maven = component_generator.generator_for_ecosystem("maven")
-    g_npm = component_generator.generator_for_ecosystem("npm")
-    generators = []
-
+def ecosystems_for_payloads(python_payload, maven_payload, npm_payload):
+    """Return list of ecosystems selected by payload types."""
+    ecosystems = []
     if python_payload:
-        generators.append(g_python)
+        ecosystems.append("pypi")
     if maven_payload:
-        generators.append(g_maven)
+        ecosystems.append("maven")
     if npm_payload:
-        generators.append(g_npm)
+        ecosystems.append("npm")
+    return ecosystems
 
-    return generators
 
+def workload_random(cfg, test, analysis):
+    """Prepare random generator giving the same sequence for the same seed, test, and analysis.
 
-def initialize_generators(generators):
-    """Initialize the generators randomly so we don't start from the 1st item."""
-    for i in range(randint(10, 100)):
-        for g in generators:
-            next(g)
-
+    Workers use their own sequences, so they don't issue the same requests.
+    """
+    seed = "{s}:{t}:{a}".format(s=cfg["seed"], t=test["Name"], a=analysis)
+    if cfg.get("worker_id") is not None:
+        seed += ":{w}".format(w=cfg["worker_id"])
+    return Random(seed)
 
-def component_analysis_benchmark(queue, threads, component_analysis, thread_count,
-                                 python_payload, maven_payload, npm_payload):
-    """Component analysis benchmark."""
-    generators = prepare_component_generators(python_payload, maven_payload, npm_payload)
 
-    initialize_generators(generators)
+def component_analysis_calls(thread_count, workload, rng, cache_hit_ratio,
+                             python_payload, maven_payload, npm_payload):
+    """Generate E/P/V triples for all component analysis calls."""
+    ecosystems = ecosystems_for_payloads(python_payload, maven_payload, npm_payload)
+    components = workload.components(ecosystems, rng, cache_hit_ratio)
 
     for t in range(thread_count):
-        g = generators[randint(0, len(generators) - 1)]
-        ecosystem, component, version = next(g)
+        ecosystem, component, version = next(components)
         with log.indent():
             log.info("Component analysis for E/P/V {} {} {}".format(ecosystem, component, version))
-        t = Thread(target=component_analysis.start,
-                   args=(t, ecosystem, component, version, queue))
+        yield t, ecosystem, component, version
+
+
+def component_analysis_benchmark(queue, threads, component_analysis_start, calls):
+    """Component analysis benchmark."""
+    for thread_id, ecosystem, component, version in calls:
+        t = Thread(target=component_analysis_start,
+                   args=(thread_id, ecosystem, component, version, queue))
         t.start()
         threads.append(t)
-        # skip some items
-        for i in range(randint(5, 25)):
-            next(g)
 
 
-def stack_analysis_benchmark(queue, threads, stack_analysis, thread_count,
-                             python_payload, maven_payload, npm_payload):
-    """Stack analysis benchmark."""
-    # TODO: read automagically from the filelist
-    manifests = (
-        ("maven", "clojure_1_6_0.xml"),
-        ("maven", "clojure_1_7_0.xml"),
-        ("maven", "clojure_1_8_0.xml"),
-        ("maven", "clojure_junit.xml"),
-        ("pypi", "click_6_star.txt"),
-        ("pypi", "array_split.txt"),
-        ("pypi", "fastlog_urllib_requests.txt"),
-        ("pypi", "requests_latest.txt"),
-        ("pypi", "numpy_latest.txt"),
-        ("pypi", "flask_latest.txt"),
-        ("pypi", "scipy_latest.txt"),
-        ("pypi", "pygame_latest.txt"),
-        ("pypi", "pyglet_latest.txt"),
-        ("pypi", "dash_latest.txt"),
-        ("pypi", "pudb_latest.txt"),
-        ("pypi", "pytest_latest.txt"),
-        ("pypi", "numpy_1_11_0.txt"),
-        ("pypi", "numpy_1_12_0.txt"),
-        ("pypi", "numpy_1_16_2.txt"),
-        ("pypi", "numpy_1_16_3.txt"),
-        ("pypi", "numpy_scipy.txt"),
-        ("pypi", "pytest_2_0_0.txt"),
-        ("pypi", "pytest_2_0_1.txt"),
-        ("pypi", "pytest_3_2_2.txt"),
-        ("pypi", "requests_2_20_0.txt"),
-        ("pypi", "requests_2_20_1.txt"),
-        ("pypi", "requests_2_21_0.txt"),
-        ("pypi", "scipy_1_1_0.txt"),
-        ("pypi", "scipy_1_2_0.txt"),
-        ("pypi", "scipy_1_2_1.txt"),
-        ("npm", "array.json"),
-        ("npm", "dependency_array.json"),
-        ("npm", "dependency_emitter_component.json"),
-        ("npm", "dependency_jquery.json"),
-        ("npm", "dependency_jquery_react.json"),
-        ("npm", "dependency_lodash.json"),
-        ("npm", "dependency_lodash_react_jquery.json"),
-        ("npm", "dependency_react.json"),
-        ("npm", "dependency_to_function.json"),
-        ("npm", "dependency_to_function_vue_array.json"),
-        ("npm", "dependency_underscore.json"),
-        ("npm", "dependency_underscore_react_jquery.json"),
-        ("npm", "dependency_vue.json"),
-        ("npm", "dependency_vue_to_function.json"),
-        ("npm", "empty.json"),
-        ("npm", "jquery.json"),
-        ("npm", "lodash.json"),
-        ("npm", "mocha.json"),
-        ("npm", "no_requirements.json"),
-        ("npm", "underscore.json"),
-        ("npm", "wisp.json"),
-    )
+def stack_analysis_calls(thread_count, manifest_cache, rng,
+                         python_payload, maven_payload, npm_payload):
+    """Generate ecosystem+manifest pairs for all stack analysis calls."""
+    ecosystems = ecosystems_for_payloads(python_payload, maven_payload, npm_payload)
+    manifests = manifest_cache.manifests(ecosystems)
+    if thread_count > 0 and not manifests:
+        raise ValueError("No manifests found for ecosystems {e}".format(e=", ".join(ecosystems)))
 
     for t in range(thread_count):
-        manifest_idx = randint(0, len(manifests) - 1)
-        manifest = manifests[manifest_idx]
-
+        ecosystem, manifest_file = manifests[rng.randrange(len(manifests))]
         with log.indent():
-            log.info("Stack analysis")
-        ecosystem = manifest[0]
-        manifest_file = manifest[1]
-        t = Thread(target=stack_analysis.start,
-                   args=(t, ecosystem, manifest_file, queue))
+            log.info("Stack analysis for manifest {}".format(manifest_file))
+        yield t, ecosystem, manifest_file
+
+
+def stack_analysis_benchmark(queue, threads, stack_analysis_start, calls):
+    """Stack analysis benchmark."""
+    for thread_id, ecosystem, manifest_file in calls:
+        t = Thread(target=stack_analysis_start,
+                   args=(thread_id, ecosystem, manifest_file, queue))
         t.start()
         threads.append(t)
 
 
+def warm_up_connection_pool(api, connections):
+    """Open keep-alive connections before the measurement, but only if the pool is used."""
+    if api.connection_pool is not None:
+        log.info("Opening keep-alive connections")
+        api.connection_pool.warm_up(api.readiness_url(), connections)
+
+
 def wait_for_all_threads(threads):
     """Wait for all threads to finish."""
     log.info("Waiting for all threads to finish")
@@ -177,60 +147,191 @@ def wait_for_all_threads(threads):
     log.success("Done")
 
 
-def run_test(cfg, test, i, component_analysis, stack_analysis):
-    """Run one selected test."""
-    test_name = test["Name"]
+def prepare_result_sink(test, filename, telemetry=None):
+    """Prepare sink for results, payloads are spilled to file only when they are exported."""
+    payloads_filename = None
+    if test["Export responses"] in ("Yes", "yes"):
+        payloads_filename = filename.replace(".csv", "_payloads.jsonl.gz")
+        log.info("Response payloads will be stored into '{f}'".format(f=payloads_filename))
+    return ResultSink(filename + ".spool", payloads_filename, telemetry)
+
+
+def test_concurrency(test):
+    """Return the concurrency budget of the test, or None when the test does not set it."""
+    concurrency = test.get("Concurrency")
+    return int(concurrency) if concurrency else None
+
+
+def run_benchmarks_threads(queue, component_analysis, stack_analysis, concurrency, open_loop,
+                           calls, ca_calls, sa_calls):
+    """Perform all calls by threads engine, each call gets its own thread unless limited.
+
+    Tests with concurrency budget are performed by fixed number of worker threads.
+    """
+    threads = []
+    if concurrency:
+        threads = run_thread_pool(queue, concurrency, component_analysis.start,
+                                  stack_analysis.start, calls)
+    elif open_loop:
+        run_open_loop(queue, threads, component_analysis.start, stack_analysis.start, calls)
+    else:
+        component_analysis_benchmark(queue, threads, component_analysis.start, ca_calls)
+        stack_analysis_benchmark(queue, threads, stack_analysis.start, sa_calls)
+    wait_for_all_threads(threads)
+
+
+def execute_test(cfg, test, queue, component_analysis, stack_analysis):
+    """Perform all calls specified by test and store results into the queue.
+
+    Return number of component analyses and stack analyses that have been started.
+    """
+    component_analysis_count = int(test["Component analysis"])
+    stack_analysis_count = int(test["Stack analysis"])
+    python_payload = test["Python payload"] in ("Yes", "yes")
+    maven_payload = test["Maven payload"] in ("Yes", "yes")
+    npm_payload = test["NPM payload"] in ("Yes", "yes")
+
+    open_loop = is_open_loop_test(test)
+    if open_loop:
+        stages = parse_stages(test)
+        component_analysis_count, stack_analysis_count = split_calls(
+            stages, component_analysis_count, stack_analysis_count)
+        log.info("Open-loop test with {c} component analyses and {s} stack analyses".
+                 format(c=component_analysis_count, s=stack_analysis_count))
+
+    ca_calls = component_analysis_calls(component_analysis_count, cfg["workload"],
+                                        workload_random(cfg, test, "component"),
+                                        cfg["cache_hit_ratio"],
+                                        python_payload, maven_payload, npm_payload)
+    sa_calls = stack_analysis_calls(stack_analysis_count, stack_analysis.manifest_cache,
+                                    workload_random(cfg, test, "stack"),
+                                    python_payload, maven_payload, npm_payload)
+
+    telemetry = cfg.get("telemetry")
+    if telemetry is not None:
+        ca_calls = telemetry.track_issued(ca_calls)
+        sa_calls = telemetry.track_issued(sa_calls)
+
+    concurrency = test_concurrency(test)
+    calls = None
+    if cfg["engine"] == ENGINE_ASYNCIO or open_loop or concurrency:
+        if open_loop:
+            calls = scheduled_calls(stages, ca_calls, sa_calls,
+                                    component_analysis_count, stack_analysis_count)
+        else:
+            calls = immediate_calls(ca_calls, sa_calls)
+
+    if cfg["engine"] == ENGINE_ASYNCIO:
+        run_benchmarks_async(queue, component_analysis, stack_analysis, calls,
+                             concurrency or cfg["concurrency"], cfg["connection"],
+                             cfg["pool_per_host"])
+    else:
+        warm_up_connection_pool(component_analysis,
+                                component_analysis_count + stack_analysis_count)
+        run_benchmarks_threads(queue, component_analysis, stack_analysis, concurrency,
+                               open_loop, calls, ca_calls, sa_calls)
+
+    return component_analysis_count, stack_analysis_count
+
+
+def run_test(cfg, test, i, component_analysis, stack_analysis, suffix=""):
+    """Run one selected test, suffix is added to its name to distinguish more runs."""
+    test_name = test["Name"] + suffix
     log.info("Starting test #{n} with name '{desc}'".format(n=i, desc=test_name))
     with log.indent():
         start = time()
 
-        threads = []
-        queue = Queue()
+        # TODO: use better approach to join paths
+        filename = RESULT_DIRECTORY + "/" + test_name.replace(" ", "_") + ".csv"
+        queue = prepare_result_sink(test, filename, cfg.get("telemetry"))
 
         with log.indent():
-            component_analysis_count = int(test["Component analysis"])
-            stack_analysis_count = int(test["Stack analysis"])
-            python_payload = test["Python payload"] in ("Yes", "yes")
-            maven_payload = test["Maven payload"] in ("Yes", "yes")
-            npm_payload = test["NPM payload"] in ("Yes", "yes")
-
-            component_analysis_benchmark(queue, threads, component_analysis,
-                                         component_analysis_count,
-                                         python_payload, maven_payload, npm_payload)
-            stack_analysis_benchmark(queue, threads, stack_analysis,
-                                     stack_analysis_count,
-                                     python_payload, maven_payload, npm_payload)
-
-        wait_for_all_threads(threads)
+            coordinator = cfg.get("coordinator")
+            if coordinator is not None:
+                counts = coordinator.run_test(test, queue)
+            else:
+                counts = execute_test(cfg, test, queue, component_analysis, stack_analysis)
+            component_analysis_count, stack_analysis_count = counts
+
         queue_size = queue.qsize()
         check_number_of_results(queue_size, component_analysis_count, stack_analysis_count)
 
         end = time()
-        # TODO: use better approach to join paths
-        filename = RESULT_DIRECTORY + "/" + test_name.replace(" ", "_") + ".csv"
+        queue.close()
         log.info("Generating test report into file '{filename}'".format(filename=filename))
         generate_csv_report(queue, test, start, end, end - start, filename)
+        queue.remove()
+        return test_name, queue.statistic, end - start
 
 
 def run_all_loaded_tests(cfg, tests, component_analysis, stack_analysis):
     """Run all tests read from CSV file."""
+    summary = []
     i = 1
     for test in tests:
-        run_test(cfg, test, i, component_analysis, stack_analysis)
+        summary.append(run_test(cfg, test, i, component_analysis, stack_analysis))
         i += 1
+    return summary
 
 
 def run_tests_with_tags(cfg, tests, tags, component_analysis, stack_analysis):
     """Run tests read from CSV file that are marged by any of tags provided in tags parameter."""
+    summary = []
     i = 1
     for test in tests:
         test_tags = parse_tags(test["Tags"])
         test_name = test["Name"]
         if tags <= test_tags:
-            run_test(cfg, test, i, component_analysis, stack_analysis)
+            summary.append(run_test(cfg, test, i, component_analysis, stack_analysis))
             i += 1
         else:
             log.info("Skipping test #{n} with name '{desc}'".format(n=i, desc=test_name))
+    return summary
+
+
+def select_tests(tests, tags):
+    """Select tests that are marked by all tags, or all tests when no tags are provided."""
+    if not tags:
+        return list(tests)
+    return [test for test in tests if tags <= parse_tags(test["Tags"])]
+
+
+def run_tests_concurrently(cfg, tests, component_analysis, stack_analysis):
+    """Run all tests at the same time, each test with its own result sink."""
+    summary = [None] * len(tests)
+
+    def run(i, test):
+        summary[i] = run_test(cfg, test, i + 1, component_analysis, stack_analysis)
+
+    threads = [Thread(target=run, args=(i, test)) for i, test in enumerate(tests)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # tests that failed with an exception don't have any results
+    return [s for s in summary if s is not None]
+
+
+def run_concurrent_tests(cfg, tests, component_analysis, stack_analysis):
+    """Run tests concurrently, optionally run them one after another before to get baseline."""
+    baseline = []
+    if cfg["baseline"]:
+        log.info("Running {n} tests one after another to get isolated baseline".format(
+            n=len(tests)))
+        with log.indent():
+            for i, test in enumerate(tests, 1):
+                baseline.append(run_test(cfg, test, i, component_analysis, stack_analysis,
+                                         ISOLATED_SUFFIX))
+
+    log.info("Running {n} tests concurrently".format(n=len(tests)))
+    with log.indent():
+        summary = run_tests_concurrently(cfg, tests, component_analysis, stack_analysis)
+
+    if baseline:
+        log.info("Generating interference report into file '{filename}'".format(
+            filename=INTERFERENCE_FILENAME))
+        generate_interference_report(baseline, summary, ISOLATED_SUFFIX, INTERFERENCE_FILENAME)
+    return baseline + summary
 
 
 def no_tests(tests):
@@ -249,7 +350,15 @@ def start_tests(cfg, tests, tags, component_analysis, stack_analysis):
             log.success("Loaded 1 test")
         else:
             log.success("Loaded {n} tests".format(n=len(tests)))
-        if not tags:
-            run_all_loaded_tests(cfg, tests, component_analysis, stack_analysis)
+        if cfg["concurrent"] and cfg.get("coordinator") is not None:
+            log.warning("Tests can not run concurrently on workers, they will run one by one")
+        if cfg["concurrent"] and cfg.get("coordinator") is None:
+            summary = run_concurrent_tests(cfg, select_tests(tests, tags),
+                                           component_analysis, stack_analysis)
+        elif not tags:
+            summary = run_all_loaded_tests(cfg, tests, component_analysis, stack_analysis)
         else:
-            run_tests_with_tags(cfg, tests, tags, component_analysis, stack_analysis)
+            summary = run_tests_with_tags(cfg, tests, tags, component_analysis, stack_analysis)
+        log.info("Generating summary report into file '{filename}'".format(
+            filename=SUMMARY_FILENAME))
+        generate_summary_report(summary, SUMMARY_FILENAME)
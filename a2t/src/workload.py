@@ -0,0 +1,140 @@
+"""Workload model that selects components for the component analysis.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import csv
+from array import array
+from bisect import bisect_right
+
+
+DEFAULT_WORKLOAD_FILE_NAME = "workload.csv"
+
+# seed used when none is specified, so two runs issue the same requests by default
+DEFAULT_SEED = 42
+
+
+class WeightedChoice:
+    """Items chosen randomly with probability proportional to their weights.
+
+    Only the cumulative weights are stored, so one choice is a binary search
+    and no item is repeated in memory to express its weight.
+    """
+
+    def __init__(self):
+        """Initialize empty set of items."""
+        self.items = []
+        self.cumulative_weights = array('d')
+
+    def add(self, item, weight):
+        """Add one item with given weight, items with zero weight are never chosen."""
+        if weight > 0:
+            self.items.append(item)
+            self.cumulative_weights.append(self.total_weight() + weight)
+
+    def total_weight(self):
+        """Return sum of weights of all items."""
+        return self.cumulative_weights[-1] if self.cumulative_weights else 0.0
+
+    def choose(self, rng):
+        """Choose one item using the given random generator."""
+        x = rng.random() * self.total_weight()
+        index = bisect_right(self.cumulative_weights, x)
+        return self.items[min(index, len(self.items) - 1)]
+
+
+class WorkloadModel:
+    """Weighted popularity of E/P/V triples split to cached and not cached ones."""
+
+    def __init__(self):
+        """Initialize empty model."""
+        # (ecosystem, cached) -> WeightedChoice with (package, version) items
+        self.choices = {}
+
+    def add(self, ecosystem, package, version, weight=1.0, cached=True):
+        """Add one E/P/V triple into the model."""
+        key = (ecosystem, cached)
+        if key not in self.choices:
+            self.choices[key] = WeightedChoice()
+        self.choices[key].add((package, version), weight)
+
+    def size(self):
+        """Return number of E/P/V triples stored in the model."""
+        return sum(len(choice.items) for choice in self.choices.values())
+
+    def count(self, cached):
+        """Return number of cached or not cached E/P/V triples stored in the model."""
+        return sum(len(choice.items) for (_, is_cached), choice in self.choices.items()
+                   if is_cached == cached)
+
+    @staticmethod
+    def load(filename):
+        """Load model from CSV file with Ecosystem, Package, Version, Weight and Cached columns.
+
+        Weight defaults to 1 and Cached to 'yes' when the column is missing or empty.
+        """
+        model = WorkloadModel()
+        # package names are repeated for all versions, so share one string instance
+        packages = {}
+        with open(filename, 'r') as fin:
+            for row in csv.DictReader(fin):
+                package = packages.setdefault(row["Package"], row["Package"])
+                weight = float(row.get("Weight") or 1)
+                cached = (row.get("Cached") or "yes") in ("yes", "Yes")
+                model.add(row["Ecosystem"], package, row["Version"], weight, cached)
+        return model
+
+    def ecosystem_choices(self, ecosystems, cached):
+        """Prepare choice between selected ecosystems weighted by their total popularity."""
+        choice = WeightedChoice()
+        for ecosystem in ecosystems:
+            components = self.choices.get((ecosystem, cached))
+            if components is not None:
+                choice.add((ecosystem, components), components.total_weight())
+        return choice
+
+    def components(self, ecosystems, rng, cache_hit_ratio=None):
+        """Generate endless sequence of E/P/V triples for selected ecosystems.
+
+        When cache_hit_ratio is not set, cached and not cached components are
+        selected only with respect to their weights.
+        """
+        hits = self.ecosystem_choices(ecosystems, True)
+        misses = self.ecosystem_choices(ecosystems, False)
+
+        groups = WeightedChoice()
+        if cache_hit_ratio is None:
+            groups.add(hits, hits.total_weight())
+            groups.add(misses, misses.total_weight())
+        else:
+            # requested ratio can't be met without components in both groups
+            for group, ratio, name in ((hits, cache_hit_ratio, "cached"),
+                                       (misses, 1.0 - cache_hit_ratio, "not cached")):
+                if ratio > 0 and not group.items:
+                    raise ValueError("Workload does not contain any {n} component for "
+                                     "ecosystems {e}, cache hit ratio {r} can't be met".format(
+                                         n=name, e=", ".join(ecosystems), r=cache_hit_ratio))
+            groups.add(hits, cache_hit_ratio)
+            groups.add(misses, 1.0 - cache_hit_ratio)
+
+        if not groups.items:
+            raise ValueError("Workload does not contain any component for ecosystems {e}".
+                             format(e=", ".join(ecosystems)))
+
+        while True:
+            ecosystem, components = groups.choose(rng).choose(rng)
+            package, version = components.choose(rng)
+            yield ecosystem, package, version
@@ -0,0 +1,86 @@
+"""Unit tests for comparison of two test runs.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from random import Random
+
+import compare
+
+
+def samples(seed, scale, count=50):
+    """Generate latencies around given value."""
+    rng = Random(seed)
+    return [scale * (1.0 + 0.1 * rng.random()) for _ in range(count)]
+
+
+def test_mann_whitney_u_shifted():
+    """Check that clearly slower candidate gets small p-value, faster one big p-value."""
+    baseline = samples(1, 1.0)
+    slower = samples(2, 2.0)
+    assert compare.mann_whitney_u(baseline, slower) < 0.001
+    assert compare.mann_whitney_u(slower, baseline) > 0.999
+
+
+def test_mann_whitney_u_identical():
+    """Check that identical samples are not significantly different."""
+    baseline = samples(1, 1.0)
+    assert 0.4 < compare.mann_whitney_u(baseline, list(baseline)) < 0.6
+    # all values tied, no variance to decide on
+    assert compare.mann_whitney_u([1.0] * 10, [1.0] * 10) == 1.0
+
+
+def test_compare_endpoint_regression():
+    """Check that slower candidate is reported as regression."""
+    baseline_value, candidate_value, p_value, verdict = compare.compare_endpoint(
+        samples(1, 1.0), samples(2, 1.5), 0.1, 0.05, 95)
+    assert verdict == compare.VERDICT_REGRESSION
+    assert candidate_value > baseline_value
+    assert p_value < 0.05
+
+
+def test_compare_endpoint_faster():
+    """Check that faster candidate is reported as such."""
+    verdict = compare.compare_endpoint(samples(1, 1.5), samples(2, 1.0), 0.1, 0.05, 95)[-1]
+    assert verdict == compare.VERDICT_FASTER
+
+
+def test_compare_endpoint_within_threshold():
+    """Check that significant, but small change is not reported as regression."""
+    verdict = compare.compare_endpoint(samples(1, 1.0), samples(2, 1.05), 0.2, 0.05, 50)[-1]
+    assert verdict == compare.VERDICT_OK
+
+
+def test_compare_endpoint_not_enough_data():
+    """Check that no verdict is made with too few calls."""
+    few = [1.0] * (compare.MIN_SAMPLES - 1)
+    assert compare.compare_endpoint(few, samples(1, 2.0), 0.1, 0.05, 95) == \
+        (None, None, None, compare.VERDICT_NOT_ENOUGH_DATA)
+
+
+def test_read_test_latencies(tmpdir):
+    """Check that only latencies of successful calls are read, grouped by endpoint."""
+    report = tmpdir.join("test.csv")
+    report.write("Test,Component analysis\n"
+                 "\n"
+                 "#,Test name,Method,Status code,Duration,Latency\n"
+                 "1,component_analysis,GET,200,0.5,0.75\n"
+                 "2,component_analysis,GET,500,0.5,0.5\n"
+                 "3,stack_analysis,POST,200,1.0,1.25\n")
+    assert compare.read_test_latencies(str(report)) == {
+        "component GET": [0.75],
+        "stack POST": [1.25],
+    }
@@ -0,0 +1,101 @@
+"""Unit tests for the latency histogram and per-endpoint statistic.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import random
+
+from latency_statistic import LatencyHistogram, EndpointStatistic, DEFAULT_PRECISION
+
+
+def exact_percentile(values, percentile):
+    """Compute percentile using nearest-rank method on sorted values."""
+    values = sorted(values)
+    rank = max(1, -(-len(values) * percentile // 100))
+    return values[int(rank) - 1]
+
+
+def test_empty_histogram():
+    """Check that empty histogram does not provide any values."""
+    histogram = LatencyHistogram()
+    assert histogram.count == 0
+    assert histogram.mean() is None
+    assert histogram.value_at_percentile(50) is None
+
+
+def test_percentiles_within_precision():
+    """Check that percentiles differ from exact ones by the relative precision only."""
+    generator = random.Random(42)
+    values = [generator.lognormvariate(-1.0, 1.0) for _ in range(10000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    assert histogram.count == len(values)
+    assert abs(histogram.mean() - sum(values) / len(values)) < 1e-9
+    for percentile in (50, 90, 95, 99, 99.9):
+        expected = exact_percentile(values, percentile)
+        actual = histogram.value_at_percentile(percentile)
+        assert abs(actual - expected) <= 2 * DEFAULT_PRECISION * expected
+
+
+def test_percentiles_clamped_to_recorded_values():
+    """Check that percentiles never fall outside of the recorded minimum and maximum."""
+    histogram = LatencyHistogram()
+    for value in (0.5, 0.5, 0.5):
+        histogram.record(value)
+    assert histogram.value_at_percentile(0) == 0.5
+    assert histogram.value_at_percentile(100) == 0.5
+    assert histogram.min == histogram.max == 0.5
+
+
+def test_merge_equals_combined():
+    """Check that merged histograms are the same as histogram with all values recorded."""
+    generator = random.Random(7)
+    first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i in range(2000):
+        value = generator.expovariate(10.0)
+        (first if i % 3 else second).record(value)
+        combined.record(value)
+    first.merge(second)
+
+    assert first.count == combined.count
+    assert first.min == combined.min
+    assert first.max == combined.max
+    assert abs(first.total - combined.total) < 1e-9
+    for percentile in (50, 90, 99):
+        assert first.value_at_percentile(percentile) == combined.value_at_percentile(percentile)
+
+
+def test_merge_empty():
+    """Check that merging empty histogram does not change anything."""
+    histogram = LatencyHistogram()
+    histogram.record(1.0)
+    histogram.merge(LatencyHistogram())
+    assert histogram.count == 1
+    assert histogram.min == histogram.max == 1.0
+
+
+def test_endpoint_statistic():
+    """Check error rate, throughput, and status codes of one endpoint."""
+    statistic = EndpointStatistic()
+    for status_code in (200, 200, 202, 500):
+        statistic.record(0.1, status_code)
+    assert statistic.errors() == 1
+    assert statistic.error_rate() == 0.25
+    assert statistic.throughput(2.0) == 2.0
+    assert statistic.throughput(0) == 0.0
+    assert statistic.status_codes_as_str() == "200:2 202:1 500:1"
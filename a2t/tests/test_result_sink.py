@@ -0,0 +1,88 @@
+"""Unit tests for the sink that spools results to disk.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import gzip
+import json
+
+from result_sink import ResultSink
+
+
+def make_result(name="component_analysis", method="GET", status_code=200, latency=0.5,
+                payload=None):
+    """Prepare result of one API call as stored by the analysis classes."""
+    return {"name": name, "method": method,
+            "ecosystem": "maven", "package": "io.vertx:vertx-core", "version": "3.5.0",
+            "manifest": "", "thread_id": 1, "status_code": status_code, "analysis": "",
+            "started": 10.0, "finished": 10.5, "duration": 0.5,
+            "scheduled": 9.9, "latency": latency, "json": payload}
+
+
+def test_rows_round_trip(tmpdir):
+    """Check that all rows put into the sink are read back in the same order."""
+    sink = ResultSink(str(tmpdir.join("spool.csv")))
+    sink.put(make_result(latency=0.25))
+    sink.put(make_result(name="stack_analysis", method="POST", status_code=500, latency=1.5))
+    sink.close()
+
+    rows = list(sink.rows())
+    assert sink.qsize() == 2
+    assert [row[0] for row in rows] == ["1", "2"]
+    assert rows[0][1:3] == ["component_analysis", "GET"]
+    assert rows[1][1:3] == ["stack_analysis", "POST"]
+    assert rows[1][8] == "500"
+    assert rows[1][-1] == "1.5"
+
+
+def test_statistic(tmpdir):
+    """Check that latencies and status codes are recorded per endpoint."""
+    sink = ResultSink(str(tmpdir.join("spool.csv")))
+    sink.put(make_result(latency=0.25))
+    sink.put(make_result(status_code=404, latency=0.75))
+    sink.put(make_result(name="stack_analysis", method="POST"))
+    sink.close()
+
+    endpoints = sink.statistic.endpoints
+    assert sorted(endpoints) == ["component GET", "stack POST"]
+    assert endpoints["component GET"].histogram.count == 2
+    assert endpoints["component GET"].errors() == 1
+    assert endpoints["component GET"].status_codes_as_str() == "200:1 404:1"
+
+
+def test_payloads_spilled(tmpdir):
+    """Check that only non-empty payloads are spilled, numbered by their rows."""
+    payloads_filename = str(tmpdir.join("payloads.jsonl.gz"))
+    sink = ResultSink(str(tmpdir.join("spool.csv")), payloads_filename)
+    sink.put(make_result(payload={"result": "first"}))
+    sink.put(make_result())
+    sink.put(make_result(payload={"result": "third"}))
+    sink.close()
+
+    with gzip.open(payloads_filename, "rt", encoding="utf8") as fin:
+        payloads = [json.loads(line) for line in fin]
+    assert payloads == [{"#": 1, "json": {"result": "first"}},
+                        {"#": 3, "json": {"result": "third"}}]
+
+
+def test_remove(tmpdir):
+    """Check that the spool file is removed."""
+    spool = tmpdir.join("spool.csv")
+    sink = ResultSink(str(spool))
+    sink.put(make_result())
+    sink.close()
+    sink.remove()
+    assert not spool.exists()
@@ -0,0 +1,90 @@
+"""Unit tests for the seeded, weighted workload model.
+
+Copyright (c) 2019 Red Hat Inc.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from itertools import islice
+from random import Random
+
+import pytest
+
+from workload import WeightedChoice, WorkloadModel, DEFAULT_SEED
+
+
+def prepare_model():
+    """Prepare model with cached and not cached components in two ecosystems."""
+    model = WorkloadModel()
+    model.add("maven", "io.vertx:vertx-core", "3.5.0", 3.0)
+    model.add("maven", "io.vertx:vertx-web", "3.5.0", 1.0)
+    model.add("maven", "junit:junit", "4.12", 1.0, cached=False)
+    model.add("npm", "lodash", "4.17.11", 2.0)
+    model.add("npm", "left-pad", "1.3.0", 0.0)
+    return model
+
+
+def test_weighted_choice_respects_weights():
+    """Check that items are chosen proportionally to their weights."""
+    choice = WeightedChoice()
+    choice.add("a", 1.0)
+    choice.add("b", 3.0)
+    choice.add("never", 0.0)
+    assert choice.items == ["a", "b"]
+    assert choice.total_weight() == 4.0
+
+    rng = Random(DEFAULT_SEED)
+    chosen = [choice.choose(rng) for _ in range(20000)]
+    assert "never" not in chosen
+    assert abs(chosen.count("b") / len(chosen) - 0.75) < 0.02
+
+
+def test_weighted_choice_deterministic():
+    """Check that the same seed leads to the same sequence of choices."""
+    choice = WeightedChoice()
+    for i in range(10):
+        choice.add(i, i + 1)
+    first = [choice.choose(Random(1)) for _ in range(5)]
+    rng1, rng2 = Random(DEFAULT_SEED), Random(DEFAULT_SEED)
+    assert [choice.choose(rng1) for _ in range(100)] == [choice.choose(rng2) for _ in range(100)]
+    assert len(set(first)) == 1
+
+
+def test_components_deterministic():
+    """Check that the same seed leads to the same sequence of components."""
+    model = prepare_model()
+    first = list(islice(model.components(["maven", "npm"], Random(DEFAULT_SEED)), 200))
+    second = list(islice(model.components(["maven", "npm"], Random(DEFAULT_SEED)), 200))
+    other = list(islice(model.components(["maven", "npm"], Random(DEFAULT_SEED + 1)), 200))
+    assert first == second
+    assert first != other
+    assert ("npm", "left-pad", "1.3.0") not in first
+
+
+def test_components_cache_hit_ratio():
+    """Check that cache hit ratio selects between cached and not cached components."""
+    model = prepare_model()
+    assert model.size() == 4
+    assert model.count(cached=False) == 1
+    components = list(islice(model.components(["maven"], Random(DEFAULT_SEED), 0.0), 100))
+    assert set(components) == {("maven", "junit:junit", "4.12")}
+
+
+def test_components_unmeetable_ratio():
+    """Check that ratio which needs components missing in the model is rejected."""
+    model = prepare_model()
+    with pytest.raises(ValueError):
+        next(model.components(["npm"], Random(DEFAULT_SEED), 0.5))
+    with pytest.raises(ValueError):
+        next(model.components(["pypi"], Random(DEFAULT_SEED)))
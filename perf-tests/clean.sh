@@ -2,3 +2,5 @@
 
 rm -f *.csv
 rm -f *.png
+rm -f *.svg
+rm -f report.html
@@ -1,6 +1,8 @@
 """Module with class representing common API."""
 import requests
 
+import http_timing
+
 
 class Api:
     """Class representing common API."""
@@ -31,7 +33,7 @@ class Api:
 
     def get(self):
         """Use GET method to access API."""
-        return requests.get(self.url)
+        return http_timing.get(self.url)
 
     def print_error_response(self, response, message_key):
         """Print error message if anything goes wrong."""
@@ -1,10 +1,18 @@
 """Module with functions called to perform various benchmarks."""
 
 import time
-import datetime
 
+import http_timing
+from samples import Measurements, STATUS_OK, STATUS_FAILED
 
-def measurement_log(thread_id, i, delta, measurement_count):
+
+def format_phases(phases):
+    """Format durations of HTTP call phases, in the order the phases occur."""
+    return "  ".join("{p}: {t:.4f}".format(p=phase, t=phases[phase])
+                     for phase in http_timing.PHASES if phase in phases)
+
+
+def measurement_log(thread_id, i, delta, measurement_count, phases=None):
     """Log an info about the measurement status."""
     if thread_id is not None:
         print("    thread: #{t}    call {i}/{m}    {delta}".format(t=thread_id,
@@ -13,51 +21,64 @@ def measurement_log(thread_id, i, delta, measurement_count):
                                                                    m=measurement_count))
     else:
         print("    #{i}    {delta}".format(i=i + 1, delta=delta))
+    if phases:
+        print("        " + format_phases(phases))
 
 
-def call_callback_function(function_to_call, s3, i):
-    """Call the specified callback function."""
+def call_callback_function(function_to_call, s3, i, prepared=None):
+    """Call the specified callback function, prepared call is passed to it when available."""
     assert function_to_call is not None, "Callback function is not specified."
+    if prepared is not None:
+        return function_to_call(i, s3, prepared)
     if s3 is None:
         return function_to_call(i)
     else:
         return function_to_call(i, s3)
 
 
-def measure(function_to_call, check_function, measurement_count, pause_time, thread_id, s3=None):
+def measure(function_to_call, check_function, measurement_count, pause_time, thread_id, s3=None,
+            first_index=0, prepare_function=None):
     """Call the provided callback function repeatedly.
 
     Repeatedly call the provided callback function, then check results by provided check function,
-    accumulate results and return them.
+    accumulate results and return them. Only the callback function call is measured, durations
+    of phases of HTTP calls made by the callback function are recorded too. Calls are indexed
+    from first_index, so calls made by one benchmark in more batches don't share indexes.
+    The optional prepare function is called before the measurement starts, its result is
+    passed to the callback function.
     """
-    measurements = []
+    measurements = Measurements(measurement_count)
     debug = []
-    for i in range(measurement_count):
-        t1 = time.time()
-        started_at = datetime.datetime.utcnow()
+    for i in range(first_index, first_index + measurement_count):
+        prepared = prepare_function(i, s3) if prepare_function is not None else None
+        started_at = time.time()
+        http_timing.start()
+        t1 = time.perf_counter()
 
-        retval = call_callback_function(function_to_call, s3, i)
+        retval = call_callback_function(function_to_call, s3, i, prepared)
+
+        t2 = time.perf_counter()
+        phases = http_timing.stop()
+        finished_at = time.time()
 
         print("Return value: ", retval)
 
-        # let's ignore retval for concurrent calls (ATM)
-        if thread_id is None:
-            assert check_function(retval)
+        try:
+            status = STATUS_OK if check_function(retval) else STATUS_FAILED
+        except Exception:
+            status = STATUS_FAILED
 
-        t2 = time.time()
-        finished_at = datetime.datetime.utcnow()
+        # let's ignore retval for concurrent calls (ATM), its status is just recorded
+        if thread_id is None:
+            assert status == STATUS_OK
 
         delta = t2 - t1
-        measurement_log(thread_id, i, delta, measurement_count)
+        measurement_log(thread_id, i, delta, first_index + measurement_count, phases)
 
-        measurements.append({
-            "measurement_number": i,
-            "started_at": started_at,
-            "finished_at": finished_at,
-            "delta": delta})
+        measurements.append(started_at, finished_at, delta, thread_id, status, phases)
 
-        # we can store debug data taken from the stack analysis
-        if "debug" in retval:
+        # we can store debug data taken from the stack analysis, other calls return plain values
+        if isinstance(retval, dict) and "debug" in retval:
             debug.append(retval["debug"])
 
         time.sleep(pause_time)
@@ -65,71 +86,86 @@ def measure(function_to_call, check_function, measurement_count, pause_time, thr
     return measurements, debug
 
 
-def core_api_benchmark(core_api, measurement_count, pause_time, thread_id=None):
+def core_api_benchmark(core_api, measurement_count, pause_time, thread_id=None,
+                       first_index=0):
     """Measure core API by accessing it and checking status code."""
     return measure(lambda i: core_api.get(),
                    lambda retval: retval.status_code == 200, measurement_count, pause_time,
-                   thread_id)
+                   thread_id, first_index=first_index)
 
 
-def jobs_api_benchmark(jobs_api, measurement_count, pause_time, thread_id=None):
+def jobs_api_benchmark(jobs_api, measurement_count, pause_time, thread_id=None,
+                       first_index=0):
     """Measure jobs API by accessing it and checking status code."""
     return measure(lambda i: jobs_api.get(),
                    lambda retval: retval.status_code == 200, measurement_count, pause_time,
-                   thread_id)
+                   thread_id, first_index=first_index)
 
 
-def stack_analysis_benchmark(core_api, measurement_count, pause_time, thread_id=None):
+def stack_analysis_benchmark(core_api, measurement_count, pause_time, thread_id=None,
+                             first_index=0):
     """Measure server and worker modules by starting stack analysis."""
     return measure(lambda i: core_api.stack_analysis(thread_id, i),
                    lambda retval: retval["result"].status_code == 200,
-                   measurement_count, pause_time, thread_id)
+                   measurement_count, pause_time, thread_id, first_index=first_index)
 
 
 def component_analysis_benchmark(core_api, s3, measurement_count, pause_time,
                                  should_exist,
                                  thread_id=None,
-                                 ecosystem=None, component=None, version=None):
+                                 ecosystem=None, component=None, version=None, first_index=0):
     """Measure server and worker modules by starting component analysis."""
     expected_code = 200 if should_exist else 404
     return measure(lambda i, s3: core_api.component_analysis(thread_id, i,
                                                              ecosystem, component, version),
                    lambda retval: retval["result"] == expected_code,
-                   measurement_count, pause_time, thread_id, s3)
+                   measurement_count, pause_time, thread_id, s3, first_index)
 
 
 def component_analysis_flow_scheduling(jobs_api, s3, measurement_count, pause_time,
                                        thread_id=None,
-                                       ecosystem=None, component=None, version=None):
-    """Measure jobs and worker modules by starting component analysis."""
-    return measure(lambda i, s3: jobs_api.component_analysis(i, s3, thread_id,
-                                                             ecosystem, component, version),
+                                       ecosystem=None, component=None, version=None,
+                                       first_index=0):
+    """Measure jobs and worker modules by starting component analysis.
+
+    The snapshot of results stored in the S3 database is taken before the measurement starts.
+    """
+    return measure(lambda i, s3, prepared: jobs_api.run_component_analysis(s3, prepared,
+                                                                           thread_id),
                    lambda retval: retval is True,
-                   measurement_count, pause_time, thread_id, s3)
+                   measurement_count, pause_time, thread_id, s3, first_index,
+                   lambda i, s3: jobs_api.prepare_component_analysis(i, s3, ecosystem,
+                                                                     component, version))
 
 
 def package_query_to_graph_db(gremlin_api, measurement_count, pause_time,
-                              thread_id=None):
+                              thread_id=None, first_index=0):
     """Measure the simple package query to Gremlin database."""
     return measure(lambda i: gremlin_api.package_query(i, None),
                    lambda retval: gremlin_api.check_gremlin_response(retval),
-                   measurement_count, pause_time, thread_id)
+                   measurement_count, pause_time, thread_id, first_index=first_index)
 
 
 def package_version_query_to_graph_db(gremlin_api, measurement_count, pause_time,
-                                      thread_id=None):
+                                      thread_id=None, first_index=0):
     """Measure the simple package+version query to Gremlin database."""
     return measure(lambda i: gremlin_api.package_version_query(i, None),
                    lambda retval: gremlin_api.check_gremlin_response(retval),
-                   measurement_count, pause_time, thread_id)
+                   measurement_count, pause_time, thread_id, first_index=first_index)
 
 
-def core_api_benchmark_thread(core_api, measurement_count, pause_time, q, thread_id):
+def core_api_benchmark_thread(core_api, s3, measurement_count, pause_time, q, thread_id):
     """Access core API in current thread and put results into the provided queue."""
     measurements = core_api_benchmark(core_api, measurement_count, pause_time, thread_id)
     q.put(measurements)
 
 
+def jobs_api_benchmark_thread(jobs_api, s3, measurement_count, pause_time, q, thread_id):
+    """Access jobs API in current thread and put results into the provided queue."""
+    measurements = jobs_api_benchmark(jobs_api, measurement_count, pause_time, thread_id)
+    q.put(measurements)
+
+
 def component_analysis_read_thread_known_component(core_api, s3, measurement_count, pause_time,
                                                    q, thread_id):
     """Perform component analysis read in current thread and put results into the provided queue.
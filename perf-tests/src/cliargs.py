@@ -32,6 +32,18 @@ cli_parser.add_argument('-p', '--parallel',
                         help='enable making parallel calls',
                         action='store_true')
 
+cli_parser.add_argument('--concurrent-backends',
+                        help='run benchmarks for independent backends (core API and jobs API '
+                             'endpoints, graph database) concurrently, benchmarks that load '
+                             'the graph database (analyses, Gremlin) are still run one '
+                             'after another',
+                        action='store_true')
+
+cli_parser.add_argument('--breathe-max-wait',
+                        help='maximum time in seconds to wait for the backend to be quiet '
+                             'between benchmarks (default=30)',
+                        type=float, default=30)
+
 cli_parser.add_argument('-d', '--dump',
                         help='dump JSON responses to files for further investigation',
                         action='store_true')
@@ -41,8 +53,45 @@ cli_parser.add_argument('--thread-min',
                         type=int, default=1)
 
 cli_parser.add_argument('--thread-max',
-                        help='maximum number of threads for parallel calls (defalt=10)',
-                        type=int, default=10)
+                        help='maximum number of threads for parallel calls (defalt=10, '
+                             'the thread count sweep is stopped by throughput or latency, '
+                             'so its default is 1000)',
+                        type=int)
+
+cli_parser.add_argument('--sweep',
+                        help='raise number of threads for parallel calls from --thread-min '
+                             'until the throughput stops growing, p99 latency exceeds '
+                             '--p99-limit, or --thread-max (if set) is reached',
+                        action='store_true')
+
+cli_parser.add_argument('--p99-limit',
+                        help='p99 latency limit in seconds for the thread count sweep',
+                        type=float)
+
+cli_parser.add_argument('--sweep-calls',
+                        help='number of calls made by each thread in one sweep step (default=5)',
+                        type=int, default=5)
+
+cli_parser.add_argument('--warmup',
+                        help='number of calls made before each sequenced benchmark, '
+                             'they are not measured (default=0)',
+                        type=int, default=0)
+
+cli_parser.add_argument('--ci-target',
+                        help='make more calls in sequenced benchmarks until the 95%% confidence '
+                             'interval of median is narrower than this fraction of median, '
+                             'for example 0.05',
+                        type=float)
+
+cli_parser.add_argument('--max-calls',
+                        help='maximum number of calls made by sequenced benchmark with '
+                             '--ci-target (default=four times the number of calls)',
+                        type=int)
+
+cli_parser.add_argument('--outlier-threshold',
+                        help='modified Z-score (based on MAD) above which the call is flagged '
+                             'as outlier (default=3.5)',
+                        type=float, default=3.5)
 
 cli_parser.add_argument('--server-api-check',
                         help='check if the server API accepts requests',
@@ -68,10 +117,35 @@ cli_parser.add_argument('-H', '--generate-html',
                         help='generate HTML file(s) as output',
                         action='store_true')
 
+cli_parser.add_argument('--graph-processes',
+                        help='number of processes rendering graphs while benchmarks are running '
+                             '(default=number of CPUs, 0 renders graphs directly)',
+                        type=int)
+
+cli_parser.add_argument('--resource-interval',
+                        help='seconds between samples of CPU, memory, file descriptors, threads, '
+                             'and sockets used by this client (default=1, 0 disables sampling)',
+                        type=float, default=1.0)
+
 cli_parser.add_argument('--sla',
                         help='run only benchmarks that are needed for SLA acceptance',
                         action='store_true')
 
+cli_parser.add_argument('--results-db',
+                        help='SQLite database where results of all runs are stored '
+                             '(default=perf_results.db, empty value disables it)',
+                        type=str, default='perf_results.db')
+
+cli_parser.add_argument('--run-id',
+                        help='ID of this run stored with the results (default=generated)',
+                        type=str)
+
+cli_parser.add_argument('--git-sha',
+                        help='SHA of the tested service commit stored with the results '
+                             '(default=GIT_SHA environment variable, not stored when '
+                             'neither is set)',
+                        type=str)
+
 cli_parser.add_argument('--manifest',
                         help='manifest file (from the data directory) used for the stack analysis',
                         type=str)
@@ -8,6 +8,7 @@ import json
 import os
 
 from api import Api
+import http_timing
 
 
 class CoreApi(Api):
@@ -108,12 +109,9 @@ class CoreApi(Api):
         """Start the stack analysis, sending the manifest file."""
         files = CoreApi.prepare_manifest_files(self._stack_analysis_manifest)
         endpoint = self.url + 'api/v1/stack-analyses'
-        response = requests.post(endpoint, files=files, headers=self.authorization())
+        response = http_timing.post(endpoint, files=files, headers=self.authorization())
         response.raise_for_status()
-        print(response.json())
-        job_id = response.json().get("id")
-        print("job ID: " + job_id)
-        return job_id
+        return response.json().get("id")
 
     def wait_for_stack_analysis(self, job_id, thread_id="", i=0):
         """Wait for the stack analysis to finish."""
@@ -122,11 +120,8 @@ class CoreApi(Api):
         sleep_amount = 5
 
         for _ in range(timeout // sleep_amount):
-            response = requests.get(endpoint, headers=self.authorization())
+            response = http_timing.get(endpoint, headers=self.authorization())
             status_code = response.status_code
-            print("        thread# {t}  run# {r}  job# {j}  status code: {s}".format(
-                t=thread_id, r=i, j=job_id,
-                s=status_code))
             if status_code == 200:
                 json_resp = response.json()
                 if CoreApi.contains_alternate_node(json_resp):
@@ -149,7 +144,7 @@ class CoreApi(Api):
     def read_stack_analysis_debug_data(self, job_id, thread_id="", i=0):
         """Read the stack analysis debug data via API."""
         endpoint = self.url + 'api/v1/stack-analyses/' + job_id + "/_debug"
-        response = requests.get(endpoint, headers=self.authorization())
+        response = http_timing.get(endpoint, headers=self.authorization())
         status_code = response.status_code
         if status_code == 200:
             return response
@@ -181,7 +176,7 @@ class CoreApi(Api):
                            ecosystem=None, component=None, version=None):
         """Start the component analysis and check the status code."""
         url = self.component_analysis_url(ecosystem, component, version)
-        response = requests.get(url, headers=self.authorization())
+        response = http_timing.get(url, headers=self.authorization())
         if self._dump_json_responses:
             CoreApi.dump_component_analysis(ecosystem, component, version, response.json())
         status_code = response.status_code
@@ -19,7 +19,10 @@ class Duration():
 
     def from_audit(s3data):
         """Fetch duration from the audit node."""
-        audit = s3data.get("_audit")
+        return Duration.from_audit_node(s3data.get("_audit"))
+
+    def from_audit_node(audit):
+        """Fetch duration from the already parsed audit node."""
         return Duration(audit.get("started_at"), audit.get("ended_at"))
 
     def parse_timestamp(string):
@@ -1,14 +1,32 @@
-"""Functions used to generate graphs from measured data."""
+"""Functions used to generate graphs from measured data.
 
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+Graphs are drawn via the object-oriented Figure API onto Agg canvases, so
+no global pyplot state is shared between benchmarks and each figure is
+released right after it is saved. When the renderer is started, graphs
+are drawn in a process pool while the benchmarks continue.
+"""
+
+import html
+import multiprocessing
+import os
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import numpy as np
 
 DEFAULT_WIDTH = 1680
 DEFAULT_HEIGHT = 800
 DPI = 100
 
+DEFAULT_REPORT = "report.html"
+
+
+def new_figure(width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, dpi=DPI):
+    """Create figure with its own Agg canvas, independent on pyplot."""
+    fig = Figure(figsize=(1.0 * width / dpi, 1.0 * height / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig
+
 
 def seconds_for_analysis(duration, measurement_type, selector):
     """Get duration for specified measurement type and selector."""
@@ -79,7 +97,8 @@ def create_component_analysis_timing_graph(durations, width=DEFAULT_WIDTH,
 
     package_colors = ["#0040cc", "#ff4040", "#40ff40"]
 
-    fig, ax = plt.subplots(figsize=(1.0 * width / dpi, 1.0 * height / dpi), dpi=dpi)
+    fig = new_figure(width, height, dpi)
+    ax = fig.add_subplot(1, 1, 1)
 
     columndata = []
     columndata.append(compute_data_values(durations, "core-data"))
@@ -106,9 +125,10 @@ def create_component_analysis_timing_graph(durations, width=DEFAULT_WIDTH,
     columns.append(ax.bar(ind + pitch, columndata[2], width, color='yellow'))
     columns.append(stacked_column(N, ind, ax, columndata[3], package_colors, width, offset + pitch))
 
-    plt.ylabel('duration (seconds)')
-    plt.title('component analysis')
-    plt.xticks(ind, durations.keys())
+    ax.set_ylabel('duration (seconds)')
+    ax.set_title('component analysis')
+    ax.set_xticks(ind)
+    ax.set_xticklabels(list(durations.keys()))
 
     add_legend(ax, columns, component_selectors, component_colors, package_selectors,
                package_colors)
@@ -122,7 +142,7 @@ def create_graph(title, y_axis_label, labels, values,
     N = len(values)
     indexes = np.arange(N)
 
-    fig = plt.figure(figsize=(1.0 * width / dpi, 1.0 * height / dpi), dpi=dpi)
+    fig = new_figure(width, height, dpi)
     ax = fig.add_subplot(1, 1, 1)
 
     # major ticks every 20, minor ticks every 5
@@ -139,11 +159,11 @@ def create_graph(title, y_axis_label, labels, values,
     ax.grid(which='minor', alpha=0.2)
     ax.grid(which='major', alpha=0.5)
 
-    plt.xlabel("call #")
-    plt.ylabel(y_axis_label)
+    ax.set_xlabel("call #")
+    ax.set_ylabel(y_axis_label)
 
-    plt.bar(indexes, values, 0.70, color='yellow',
-            edgecolor='black', label=title)
+    ax.bar(indexes, values, 0.70, color='yellow',
+           edgecolor='black', label=title)
 
     fig.suptitle(title)
 
@@ -155,27 +175,27 @@ def create_summary_graph(title, y_axis_label, labels, values):
     N = len(values)
     indexes = np.arange(N)
 
-    fig = plt.figure()
-    plt.xlabel("call #")
-    plt.ylabel(y_axis_label)
-    plt.grid(True)
-    plt.xticks(indexes, labels)
-    locs, plt_labels = plt.xticks()
-    plt.setp(plt_labels, rotation=90)
-    plt.bar(indexes, values, 0.80, color='yellow',
-            edgecolor='black', label=title)
+    fig = new_figure()
+    ax = fig.add_subplot(1, 1, 1)
+    ax.set_xlabel("call #")
+    ax.set_ylabel(y_axis_label)
+    ax.grid(True)
+    ax.set_xticks(indexes)
+    tick_labels = ax.set_xticklabels(labels, rotation=90)
+    ax.bar(indexes, values, 0.80, color='yellow',
+           edgecolor='black', label=title)
 
-    # plt.legend(loc='lower right')
+    # ax.legend(loc='lower right')
 
-    for tick in plt_labels:
+    for tick in tick_labels:
         tick.set_horizontalalignment("left")
         tick.set_verticalalignment("top")
         tick.set_visible(False)
 
-    for tick in plt_labels[::5]:
+    for tick in tick_labels[::5]:
         tick.set_visible(True)
 
-    plt.tick_params(axis='x', which='major', labelsize=10)
+    ax.tick_params(axis='x', which='major', labelsize=10)
 
     fig.subplots_adjust(bottom=0.4)
     fig.suptitle(title)
@@ -189,64 +209,241 @@ def create_statistic_graph(title, y_axis_label, labels, min_values, max_values,
     N = len(labels)
     indexes = np.arange(N)
 
-    fig = plt.figure(figsize=(1.0 * width / dpi, 1.0 * height / dpi), dpi=dpi)
-    plt.xlabel(x_axis_label)
-    plt.ylabel(y_axis_label)
-    plt.grid(True)
-    plt.xticks(indexes, labels)
-    locs, plt_labels = plt.xticks()
-    plt.setp(plt_labels, rotation=90)
-
-    plt.bar(indexes - 0.27, min_values, 0.25, color='red',
-            edgecolor='black', label='min values')
-    plt.bar(indexes, avg_values, 0.25, color='yellow',
-            edgecolor='black', label='avg values')
-    plt.bar(indexes + 0.27, max_values, 0.25, color='green',
-            edgecolor='black', label='max values')
-
-    plt.legend(loc='upper left')
-    for tick in plt_labels:
+    fig = new_figure(width, height, dpi)
+    ax = fig.add_subplot(1, 1, 1)
+    ax.set_xlabel(x_axis_label)
+    ax.set_ylabel(y_axis_label)
+    ax.grid(True)
+    ax.set_xticks(indexes)
+    tick_labels = ax.set_xticklabels(labels, rotation=90)
+
+    ax.bar(indexes - 0.27, min_values, 0.25, color='red',
+           edgecolor='black', label='min values')
+    ax.bar(indexes, avg_values, 0.25, color='yellow',
+           edgecolor='black', label='avg values')
+    ax.bar(indexes + 0.27, max_values, 0.25, color='green',
+           edgecolor='black', label='max values')
+
+    ax.legend(loc='upper left')
+    for tick in tick_labels:
         tick.set_horizontalalignment("left")
         tick.set_verticalalignment("top")
-    plt.tick_params(axis='x', which='major', labelsize=10)
+    ax.tick_params(axis='x', which='major', labelsize=10)
     # fig.subplots_adjust(bottom=0.4)
     fig.suptitle(title)
     return fig
 
 
+def create_throughput_graph(title, thread_counts, throughputs, fitted_threads, fitted,
+                            width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT, dpi=DPI):
+    """Create graph with measured throughput and optionally with the fitted curve."""
+    fig = new_figure(width, height, dpi)
+    ax = fig.add_subplot(1, 1, 1)
+    ax.set_xlabel("# concurrent threads")
+    ax.set_ylabel("calls per second")
+    ax.grid(True)
+    ax.plot(thread_counts, throughputs, "o", color="red", label="measured throughput")
+    if fitted is not None:
+        ax.plot(fitted_threads, fitted, "-", color="blue", label="USL fit")
+    ax.legend(loc="upper left")
+    fig.suptitle(title)
+    return fig
+
+
+def create_resources_graph(title, times, samples, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT,
+                           dpi=DPI):
+    """Create graph with CPU, memory, file descriptors, threads, and sockets used by the client."""
+    fig = new_figure(width, height, dpi)
+    # Figure.subplots() is not available in matplotlib 2.0
+    cpu_ax = fig.add_subplot(3, 1, 1)
+    rss_ax = fig.add_subplot(3, 1, 2, sharex=cpu_ax)
+    count_ax = fig.add_subplot(3, 1, 3, sharex=cpu_ax)
+
+    cpu_ax.plot(times, samples["cpu"], "-", color="red")
+    cpu_ax.set_ylabel("CPU (% of one core)")
+    cpu_ax.grid(True)
+
+    rss_ax.plot(times, samples["rss_mb"], "-", color="blue")
+    rss_ax.set_ylabel("RSS (MB)")
+    rss_ax.grid(True)
+
+    for column, color in (("fds", "black"), ("threads", "green"), ("established", "orange"),
+                          ("close_wait", "purple"), ("time_wait", "gray")):
+        count_ax.plot(times, samples[column], "-", color=color, label=column)
+    count_ax.set_ylabel("count")
+    count_ax.set_xlabel("time (seconds)")
+
+    # time axis is shared, so it is labeled just below the last graph
+    for ax in (cpu_ax, rss_ax):
+        for label in ax.get_xticklabels():
+            label.set_visible(False)
+    count_ax.grid(True)
+    count_ax.legend(loc="upper left")
+
+    fig.suptitle(title)
+    return fig
+
+
 def save_graph(fig, imageFile, dpi=DPI):
     """Save graph into the raster or vector file."""
-    plt.savefig(imageFile, facecolor=fig.get_facecolor(), dpi=dpi)
+    fig.savefig(imageFile, facecolor=fig.get_facecolor(), dpi=dpi)
+
+
+def close_graph(fig):
+    """Release all artists of the figure, nothing else holds them as pyplot is not used."""
+    fig.clear()
+
+
+# graph type -> function that creates the figure
+CREATORS = {
+    "wait_times": create_graph,
+    "statistic": create_statistic_graph,
+    "throughput": create_throughput_graph,
+    "component_analysis_timing": create_component_analysis_timing_graph,
+    "resources": create_resources_graph,
+}
+
+
+def render(graph_type, title, name, args, kwargs, svg=False):
+    """Create one graph and save it into PNG file, return SVG source when requested."""
+    fig = CREATORS[graph_type](*args, **kwargs)
+    try:
+        save_graph(fig, name + ".png")
+        if not svg:
+            return None
+        svg_file = name + ".svg"
+        save_graph(fig, svg_file)
+        with open(svg_file) as fin:
+            return fin.read()
+    finally:
+        close_graph(fig)
+
+
+class GraphRenderer:
+    """Render graphs in a pool of processes and optionally collect them into HTML report.
+
+    The pool uses spawned processes, as forking while the benchmark threads
+    are running is not safe.
+    """
+
+    def __init__(self, processes=None, report=None):
+        """Start the pool, graphs are rendered directly when processes is zero."""
+        self.report = report
+        self.pending = []
+        self.charts = []
+        self.failures = []
+        self.pool = None
+        if processes is None or processes > 0:
+            self.pool = multiprocessing.get_context("spawn").Pool(processes)
+
+    def submit(self, graph_type, title, name, *args, **kwargs):
+        """Render graph or schedule its rendering in the pool."""
+        svg = self.report is not None
+        if self.pool is None:
+            self.charts.append((title, name, render(graph_type, title, name, args, kwargs, svg)))
+        else:
+            result = self.pool.apply_async(render,
+                                           (graph_type, title, name, args, kwargs, svg))
+            self.pending.append((title, name, result))
+
+    def finish(self):
+        """Wait for all graphs, write the report, and return names of graphs that failed."""
+        for title, name, result in self.pending:
+            try:
+                self.charts.append((title, name, result.get()))
+            except Exception as e:
+                print("Graph {n} can't be rendered: {e}".format(n=name, e=e))
+                self.failures.append(name)
+        self.pending = []
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.report is not None:
+            write_report(self.report, self.charts)
+        return self.failures
+
+
+def write_report(filename, charts):
+    """Write HTML report with all graphs embedded as SVG."""
+    with open(filename, "w") as fout:
+        fout.write("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+                   "<title>Performance tests</title>\n</head>\n<body>\n"
+                   "<h1>Performance tests</h1>\n<ul>\n")
+        for title, name, _ in charts:
+            fout.write("<li><a href=\"#{a}\">{t}</a></li>\n".format(
+                a=html.escape(os.path.basename(name)), t=html.escape(title)))
+        fout.write("</ul>\n")
+        for title, name, svg in charts:
+            # skip the XML declaration, it is not allowed inside HTML
+            svg = svg[svg.index("<svg"):] if svg and "<svg" in svg else ""
+            fout.write("<h2 id=\"{a}\">{t}</h2>\n<p><a href=\"{p}.png\">{p}.png</a></p>\n"
+                       "{s}\n".format(a=html.escape(os.path.basename(name)),
+                                      t=html.escape(title), p=html.escape(name), s=svg))
+        fout.write("</body>\n</html>\n")
+    print("Report written into {f}".format(f=filename))
+
+
+# renderer used by the current run, graphs are rendered directly when it is not started
+_renderer = None
+
+
+def start_renderer(processes=None, report=None):
+    """Start rendering graphs in the process pool, optionally into HTML report."""
+    global _renderer
+    _renderer = GraphRenderer(processes, report)
+    return _renderer
+
+
+def finish_renderer():
+    """Wait until all graphs are rendered, return names of graphs that failed."""
+    global _renderer
+    if _renderer is None:
+        return []
+    failures = _renderer.finish()
+    _renderer = None
+    return failures
+
+
+def generate(graph_type, title, name, *args, **kwargs):
+    """Render graph via the renderer if started, otherwise directly."""
+    if _renderer is not None:
+        _renderer.submit(graph_type, title, name, *args, **kwargs)
+    else:
+        render(graph_type, title, name, args, kwargs)
 
 
 def generate_wait_times_graph(title, name, values):
     """Generate graph with durations of any measurement(s)."""
     labels = range(1, 1 + len(values))
-    fig = create_graph(title, "seconds", labels, values)
-    save_graph(fig, name + ".png")
-    plt.close(fig)
+    generate("wait_times", title, name, title, "seconds", labels, values)
 
 
 def generate_timing_statistic_graph(title, name, pauses, min_times, max_times, avg_times,
                                     width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT):
     """Generate graph with timings of any measurement(s)."""
-    fig = create_statistic_graph(title, "seconds", pauses, min_times, max_times, avg_times,
-                                 "#", width, height)
-    save_graph(fig, name + ".png")
-    plt.close(fig)
+    generate("statistic", title, name, title, "seconds", pauses, min_times, max_times,
+             avg_times, "#", width, height)
 
 
 def generate_timing_threads_statistic_graph(title, name, threads, min_times, max_times,
                                             avg_times):
     """Generate graph with timings per thread of any measurement(s)."""
-    fig = create_statistic_graph(title, "seconds", threads, min_times, max_times, avg_times,
-                                 "# concurrent analysis")
-    save_graph(fig, name + ".png")
-    plt.close(fig)
+    generate("statistic", title, name, title, "seconds", threads, min_times, max_times,
+             avg_times, "# concurrent analysis")
+
+
+def generate_throughput_graph(title, name, thread_counts, throughputs, fitted_threads, fitted):
+    """Generate graph with throughput for different number of threads."""
+    generate("throughput", title, name, title, thread_counts, throughputs, fitted_threads,
+             fitted)
+
+
+def generate_resources_graph(title, name, times, samples):
+    """Generate graph with resources used by the client during the benchmark."""
+    generate("resources", title, name, title, times, samples)
 
 
 def generate_component_analysis_timing_graph(durations):
     """Generate graph with timings of the component analysis."""
-    fig = create_component_analysis_timing_graph(durations)
-    save_graph(fig, "test.png")
-    plt.close(fig)
+    generate("component_analysis_timing", "component analysis", "test", durations)
@@ -1,9 +1,9 @@
 """Class representing Gremlin API."""
 
 import re
-import requests
 
 from api import Api
+import http_timing
 
 from gremlin_package_generator import GremlinPackageGenerator
 from gremlin_query import GremlinQuery
@@ -87,11 +87,9 @@ class GremlinApi(Api):
 
     def post_query(self, query):
         """Post the already constructed query to the Gremlin."""
+        # nothing is printed here, the call is measured by benchmarks
         data = {"gremlin": str(query)}
-        print(data)
-        response = requests.post(self.url, json=data)
-        print(response.json())
-        return response
+        return http_timing.post(self.url, json=data)
 
     def query_package(self, ecosystem, package):
         """Try to find the package in the selected ecosystem."""
@@ -116,7 +114,6 @@ class GremlinApi(Api):
         """Query the package+version metadata stored in the graph database."""
         assert i >= 0
         ecosystem, package, version = next(self._package_version_generator)
-        print(ecosystem, package, version)
         response = self.query_package_version(ecosystem, package, version)
         return response
 
@@ -0,0 +1,346 @@
+"""Stand-in Gremlin HTTP server answering queries constructed by GremlinQuery.
+
+Usage: python3 src/gremlin_server.py --packages 10000 --port 8182
+       F8A_GREMLIN_URL=http://localhost:8182/ python3 src/perf-tests.py -P -V
+"""
+
+import argparse
+import json
+import random
+import re
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse, parse_qs
+from uuid import uuid4
+
+from gremlin_package_generator import GremlinPackageGenerator
+
+DEFAULT_PORT = 8182
+
+# label of edges between package and its versions
+HAS_VERSION = "has_version"
+
+# HTTP code and status code returned by Gremlin server when the script can't be evaluated
+SCRIPT_EVALUATION_ERROR = 597
+
+# one step of the query: .name("argument", "argument") or [index]
+STEP = re.compile(r'\.(\w+)\(((?:\s*"[^"]*"\s*,?)*)\)|\[(\d+)\]')
+ARGUMENT = re.compile(r'"([^"]*)"')
+
+
+class GremlinQueryError(Exception):
+    """Query that can't be evaluated by the stand-in server."""
+
+
+class Graph:
+    """In-memory graph with vertex properties indexed for has() lookups."""
+
+    def __init__(self, indexed=True):
+        """Prepare empty graph, has() steps scan all vertices when the graph is not indexed."""
+        self.indexed = indexed
+        self.vertices = []
+        # vertex ID -> {label: [vertex IDs]}
+        self.edges = []
+        # (property, value) -> [vertex IDs]
+        self.index = {}
+
+    def add_vertex(self, label, properties):
+        """Add vertex with given properties, return its ID."""
+        vertex_id = len(self.vertices)
+        self.vertices.append({"label": label, "properties": properties})
+        self.edges.append({})
+        for name, value in properties.items():
+            self.index.setdefault((name, value), []).append(vertex_id)
+        return vertex_id
+
+    def add_edge(self, out_vertex, label, in_vertex):
+        """Add directed edge with given label."""
+        self.edges[out_vertex].setdefault(label, []).append(in_vertex)
+
+    def add_package(self, ecosystem, package, versions):
+        """Add package vertex together with vertices for all its versions."""
+        package_id = self.add_vertex("Package", {"ecosystem": ecosystem, "name": package})
+        for version in versions:
+            version_id = self.add_vertex("Version", {"pecosystem": ecosystem, "pname": package,
+                                                     "version": version})
+            self.add_edge(package_id, HAS_VERSION, version_id)
+
+    def has(self, traversal, name, value):
+        """Filter vertices by property value."""
+        if traversal is None:
+            if self.indexed:
+                return list(self.index.get((name, value), []))
+            traversal = range(len(self.vertices))
+        return [v for v in traversal if self.vertices[v]["properties"].get(name) == value]
+
+    def out(self, traversal, label):
+        """Follow outgoing edges with given label."""
+        return [w for v in self.all_vertices(traversal) for w in self.edges[v].get(label, [])]
+
+    def all_vertices(self, traversal):
+        """Return all vertices when the traversal was not restricted yet."""
+        return range(len(self.vertices)) if traversal is None else traversal
+
+    def vertex(self, vertex_id):
+        """Return vertex in the same structure as Gremlin server returns it."""
+        vertex = self.vertices[vertex_id]
+        return {"id": vertex_id, "label": vertex["label"], "type": "vertex",
+                "properties": {name: [{"id": "{v}-{n}".format(v=vertex_id, n=name),
+                                       "value": value}]
+                               for name, value in vertex["properties"].items()}}
+
+    def value_map(self, vertex_id):
+        """Return map of vertex properties, all values are lists as in Gremlin."""
+        return {name: [value] for name, value in self.vertices[vertex_id]["properties"].items()}
+
+    def step_index(self, traversal, results, index):
+        """Select one vertex, or one result when values were reached already."""
+        if results is None:
+            return self.all_vertices(traversal)[index:index + 1], None
+        return traversal, results[index:index + 1]
+
+    def step_has(self, traversal, arguments):
+        """Handle has("property", "value") step."""
+        return self.has(traversal, arguments[0], arguments[1]), None
+
+    def step_out(self, traversal, arguments):
+        """Handle out("label") step."""
+        return self.out(traversal, arguments[0]), None
+
+    def step_value_map(self, traversal, arguments):
+        """Handle valueMap() step."""
+        return traversal, [self.value_map(v) for v in self.all_vertices(traversal)]
+
+    def step_value(self, traversal, arguments):
+        """Handle value("property") step, vertices without the property are skipped."""
+        name = arguments[0]
+        return traversal, [self.vertices[v]["properties"][name]
+                           for v in self.all_vertices(traversal)
+                           if name in self.vertices[v]["properties"]]
+
+    def step_count(self, traversal, arguments):
+        """Handle count() step."""
+        return traversal, [len(self.all_vertices(traversal))]
+
+    # step name -> (number of arguments, handler); handlers return new traversal and results,
+    # results are None until valueMap, value, or count step is reached
+    STEPS = {
+        "has": (2, step_has),
+        "out": (1, step_out),
+        "valueMap": (0, step_value_map),
+        "value": (1, step_value),
+        "count": (0, step_count),
+    }
+
+    def step(self, traversal, results, step, arguments):
+        """Dispatch named step to its handler."""
+        if results is not None:
+            raise GremlinQueryError("Step {s} can't follow values".format(s=step))
+        arity, handler = self.STEPS.get(step, (None, None))
+        if handler is None or len(arguments) != arity:
+            raise GremlinQueryError("Unsupported step: {s}({a})".format(
+                s=step, a=", ".join(arguments)))
+        return handler(self, traversal, arguments)
+
+    def evaluate(self, query):
+        """Evaluate the query and return list of results."""
+        query = query.strip()
+        if not query.startswith("g.V()"):
+            raise GremlinQueryError("Query needs to start with g.V(): {q}".format(q=query))
+        position = len("g.V()")
+
+        # None means all vertices, so the first has() step can use the index
+        traversal = None
+        # results are vertices until valueMap, value, or count step is reached
+        results = None
+        while position < len(query):
+            match = STEP.match(query, position)
+            if match is None:
+                raise GremlinQueryError("Unsupported step: {q}".format(q=query[position:]))
+            position = match.end()
+            if match.group(3) is not None:
+                traversal, results = self.step_index(traversal, results, int(match.group(3)))
+            else:
+                traversal, results = self.step(traversal, results, match.group(1),
+                                               ARGUMENT.findall(match.group(2) or ""))
+
+        if results is None:
+            results = [self.vertex(v) for v in self.all_vertices(traversal)]
+        return results
+
+
+def generate_graph(packages, versions_per_package, seed, indexed=True):
+    """Generate graph with all packages queried by benchmarks and with synthetic packages."""
+    graph = Graph(indexed)
+    for ecosystem, ecosystem_packages in GremlinPackageGenerator.PACKAGES.items():
+        for package, versions in ecosystem_packages.items():
+            graph.add_package(ecosystem, package, versions)
+
+    rng = random.Random(seed)
+    ecosystems = sorted(GremlinPackageGenerator.PACKAGES.keys())
+    for i in range(packages):
+        versions = ["{major}.{minor}.{patch}".format(major=rng.randint(0, 9),
+                                                     minor=rng.randint(0, 20), patch=patch)
+                    for patch in range(rng.randint(1, 2 * versions_per_package - 1))]
+        graph.add_package(rng.choice(ecosystems), "package-{i}".format(i=i), versions)
+    return graph
+
+
+def load_graph(filename, indexed=True):
+    """Load graph from JSON fixture with list of packages.
+
+    Fixture format: [{"ecosystem": "pypi", "name": "package", "versions": ["1.0", ...]}, ...]
+    """
+    graph = Graph(indexed)
+    with open(filename) as fin:
+        for package in json.load(fin):
+            graph.add_package(package["ecosystem"], package["name"], package.get("versions", []))
+    return graph
+
+
+def gremlin_response(data):
+    """Prepare response in the same structure as Gremlin server sends."""
+    return {"requestId": str(uuid4()),
+            "status": {"message": "", "code": 200, "attributes": {}},
+            "result": {"data": data, "meta": {}}}
+
+
+def error_response(message, code=SCRIPT_EVALUATION_ERROR):
+    """Prepare response for query that can't be evaluated."""
+    return {"requestId": str(uuid4()),
+            "status": {"message": message, "code": code, "attributes": {}},
+            "result": {"data": None, "meta": {}}}
+
+
+class GremlinHandler(BaseHTTPRequestHandler):
+    """Handler for Gremlin queries sent via HTTP."""
+
+    # keep-alive connections, as the real Gremlin server supports them
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        """Don't log each query, it would slow down the server considerably."""
+
+    def send_json(self, status_code, payload):
+        """Send response with JSON payload."""
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def answer(self, query):
+        """Evaluate the query and send the results after the simulated latency."""
+        if query is None:
+            self.send_json(400, {"message": "no gremlin script supplied"})
+            return
+        self.server.wait()
+        try:
+            data = self.server.graph.evaluate(query)
+        except GremlinQueryError as e:
+            self.send_json(SCRIPT_EVALUATION_ERROR, error_response(str(e)))
+            return
+        self.send_json(200, gremlin_response(data))
+
+    def do_GET(self):
+        """Handle query sent as gremlin parameter."""
+        parameters = parse_qs(urlparse(self.path).query)
+        self.answer(parameters.get("gremlin", [None])[0])
+
+    def do_POST(self):
+        """Handle query sent as JSON payload."""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            query = json.loads(body.decode("utf-8")).get("gremlin")
+        except (ValueError, AttributeError):
+            query = None
+        self.answer(query)
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """HTTP server handling each request in its own thread (http.server has it since 3.7 only)."""
+
+    daemon_threads = True
+
+
+class GremlinServer(ThreadingHTTPServer):
+    """HTTP server that answers Gremlin queries from the in-memory graph."""
+
+    request_queue_size = 1024
+
+    def __init__(self, address, graph, latency, jitter, seed=None):
+        """Bind to the address and remember the graph and simulated latency."""
+        super().__init__(address, GremlinHandler)
+        self.graph = graph
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Simulate the query latency of the real server."""
+        if self.latency <= 0 and self.jitter <= 0:
+            return
+        with self.lock:
+            latency = self.rng.gauss(self.latency, self.jitter) if self.jitter else self.latency
+        if latency > 0:
+            time.sleep(latency)
+
+
+def prepare_cli_parser():
+    """Prepare parser for command line arguments of the stand-in server."""
+    parser = argparse.ArgumentParser(description="Stand-in Gremlin HTTP server")
+    parser.add_argument('--host', help='host to listen on (default=localhost)',
+                        default="localhost")
+    parser.add_argument('--port', help='port to listen on (default=8182)',
+                        type=int, default=DEFAULT_PORT)
+    parser.add_argument('--fixture', help='JSON file with packages and versions, '
+                                          'synthetic graph is generated when not specified')
+    parser.add_argument('--packages', help='number of synthetic packages (default=1000)',
+                        type=int, default=1000)
+    parser.add_argument('--versions', help='average number of versions per package (default=5)',
+                        type=int, default=5)
+    parser.add_argument('--no-index', help='scan all vertices for each has() step, so the '
+                                           'query latency grows with the graph size',
+                        action='store_true')
+    parser.add_argument('--latency', help='simulated latency of each query in seconds '
+                                          '(default=0)',
+                        type=float, default=0.0)
+    parser.add_argument('--jitter', help='standard deviation of simulated latency (default=0)',
+                        type=float, default=0.0)
+    parser.add_argument('--seed', help='seed for synthetic graph and latencies (default=42)',
+                        type=int, default=42)
+    return parser
+
+
+def main():
+    """Start the stand-in server and serve until interrupted."""
+    cli_arguments = prepare_cli_parser().parse_args()
+    indexed = not cli_arguments.no_index
+
+    t1 = time.perf_counter()
+    if cli_arguments.fixture:
+        graph = load_graph(cli_arguments.fixture, indexed)
+    else:
+        graph = generate_graph(cli_arguments.packages, cli_arguments.versions,
+                               cli_arguments.seed, indexed)
+    edges = sum(len(targets) for edges in graph.edges for targets in edges.values())
+    print("Graph with {v} vertices and {e} edges prepared in {t:.2f} s".format(
+        v=len(graph.vertices), e=edges, t=time.perf_counter() - t1))
+
+    server = GremlinServer((cli_arguments.host, cli_arguments.port), graph,
+                           cli_arguments.latency, cli_arguments.jitter, cli_arguments.seed)
+    print("Listening on http://{h}:{p}/".format(h=cli_arguments.host, p=cli_arguments.port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""HTTP calls that record durations of DNS lookup, connect, TLS handshake, TTFB, and transfer."""
+
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# all phases in the order they occur during one HTTP call
+PHASES = ("dns", "connect", "tls", "ttfb", "transfer")
+
+# phases spent by establishing new connection
+CONNECTION_PHASES = ("dns", "connect", "tls")
+
+# phases recorded in the current thread, None when no measurement is in progress
+_local = threading.local()
+
+
+def start():
+    """Start recording phases of all HTTP calls made by the current thread."""
+    _local.phases = {}
+
+
+def stop():
+    """Stop recording and return dict phase -> seconds summed for all calls made meanwhile."""
+    phases = getattr(_local, "phases", None) or {}
+    _local.phases = None
+    return phases
+
+
+def record(phase, seconds):
+    """Add the duration of phase to the measurement in progress, if any."""
+    phases = getattr(_local, "phases", None)
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+def connection_time():
+    """Return time spent by establishing connections in the measurement in progress."""
+    phases = getattr(_local, "phases", None) or {}
+    return sum(phases.get(phase, 0.0) for phase in CONNECTION_PHASES)
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """Connection that measures DNS lookup and TCP connect separately."""
+
+    def _new_conn(self):
+        """Resolve the host name first, then open the connection to the resolved address."""
+        t1 = time.perf_counter()
+        try:
+            address = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+        except socket.gaierror:
+            # let the original code report the error
+            return super()._new_conn()
+        t2 = time.perf_counter()
+        record("dns", t2 - t1)
+
+        # the host name is still used for TLS SNI and certificate verification
+        dns_host = self._dns_host
+        self._dns_host = address
+        try:
+            conn = super()._new_conn()
+        finally:
+            self._dns_host = dns_host
+        record("connect", time.perf_counter() - t2)
+        return conn
+
+
+class TimedHTTPSConnection(HTTPSConnection, TimedHTTPConnection):
+    """Connection that measures DNS lookup, TCP connect, and TLS handshake separately."""
+
+    def connect(self):
+        """Establish the connection, TLS handshake takes the rest of time."""
+        before = connection_time()
+        t1 = time.perf_counter()
+        super().connect()
+        tcp = connection_time() - before
+        record("tls", time.perf_counter() - t1 - tcp)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    """Pool of timed HTTP connections."""
+
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    """Pool of timed HTTPS connections."""
+
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Transport adapter that measures time to first byte and body transfer."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Use pools with timed connections."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                                   "https": TimedHTTPSConnectionPool}
+
+    def send(self, request, stream=False, **kwargs):
+        """Send the request, body is read here to measure the transfer separately."""
+        before = connection_time()
+        t1 = time.perf_counter()
+        response = super().send(request, stream=stream, **kwargs)
+        t2 = time.perf_counter()
+        record("ttfb", t2 - t1 - (connection_time() - before))
+        if not stream:
+            response.content
+            record("transfer", time.perf_counter() - t2)
+        return response
+
+
+def session():
+    """Prepare new session that records phases of all calls."""
+    s = requests.Session()
+    adapter = TimedHTTPAdapter()
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+
+def request(method, url, **kwargs):
+    """Perform one HTTP call on new connection, the same way as requests.request does."""
+    with session() as s:
+        return s.request(method=method, url=url, **kwargs)
+
+
+def get(url, **kwargs):
+    """Perform GET call, the same way as requests.get does."""
+    kwargs.setdefault("allow_redirects", True)
+    return request("get", url, **kwargs)
+
+
+def post(url, **kwargs):
+    """Perform POST call, the same way as requests.post does."""
+    return request("post", url, **kwargs)
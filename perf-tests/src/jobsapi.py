@@ -1,11 +1,14 @@
 """Module with class representing jobs API."""
 from api import Api
-import time
+import http_timing
 import datetime
 import json
 import requests
-from botocore.exceptions import ClientError
 from componentgenerator import ComponentGenerator
+from s3_watcher import S3Watcher
+
+# bucket with results of component analyses
+CORE_DATA_BUCKET = "bayesian-core-data"
 
 
 class JobsApi(Api):
@@ -50,8 +53,7 @@ class JobsApi(Api):
 
         headers.update(self.authorization())
         json_data = json.dumps(data)
-        print(json_data)
-        response = requests.post(endpoint, data=json_data, headers=headers)
+        response = http_timing.post(endpoint, data=json_data, headers=headers)
         return response
 
     def check_auth_token_validity(self):
@@ -96,45 +98,38 @@ class JobsApi(Api):
         jobs_data = self.prepare_jobs_data(ecosystem, package, version)
         endpoint = "{jobs_api_url}api/v1/jobs/flow-scheduling?state=running".\
             format(jobs_api_url=self.url)
-        print(endpoint)
-        print(thread_id)
         response = self.send_data_as_json(endpoint, jobs_data)
         assert response.status_code == 201
-        print(response)
-        print(response.json())
 
     def dump_response_if_enabled(self, s3, bucket, key, ecosystem, package, version):
         """Dump response gathered from server, but only if dumping is enabled."""
         if self._dump_json_responses:
             JobsApi.dump_job_data(s3, bucket, key, ecosystem, package, version)
 
-    def wait_for_component_analysis(self, s3, ecosystem, package, version, thread_id=""):
-        """Wait for the component analysis by looking at metadata stored in the S3 database."""
+    @staticmethod
+    def component_analysis_watcher(s3, ecosystem, package, version):
+        """Prepare watcher for the component analysis results, needs to be done before start."""
+        key = s3.component_key(ecosystem, package, version)
+        # results of the analysis itself and all its sub-analyses, the prefix matches results
+        # of other versions too (1.0 is a prefix of 1.0.1), so only these keys are watched
+        prefix = key[:-len(".json")]
+        sub_analyses = prefix + "/"
+        watcher = S3Watcher(s3, CORE_DATA_BUCKET, prefix,
+                            key_filter=lambda k: k == key or k.startswith(sub_analyses))
+        watcher.snapshot()
+        return watcher
+
+    def wait_for_component_analysis(self, s3, watcher, ecosystem, package, version,
+                                    thread_id=""):
+        """Wait for the component analysis by watching its results stored in the S3 database."""
         timeout = 300 * 60
-        sleep_amount = 10
-
-        bucket = "bayesian-core-data"
 
         key = s3.component_key(ecosystem, package, version)
-        print(key)
-
-        start_time = datetime.datetime.now(datetime.timezone.utc)
-
-        for _ in range(timeout // sleep_amount):
-            current_date = datetime.datetime.now(datetime.timezone.utc)
-            try:
-                last_modified = s3.read_object_metadata(bucket, key, "LastModified")
-                delta = current_date - last_modified
-                print(thread_id, "  ", "   ", key, "   ", current_date, "   ", last_modified,
-                      "   ", delta, "   ", delta.seconds,
-                      "    ", current_date - start_time)
-                if delta.days == 0 and delta.seconds < sleep_amount * 2:
-                    print("done!", thread_id, "   ", key)
-                    self.dump_response_if_enabled(s3, bucket, key, ecosystem, package, version)
-                    return True
-            except ClientError:
-                print("No analyses yet (waiting for {t})".format(t=current_date - start_time))
-            time.sleep(sleep_amount)
+
+        if watcher.wait_for(key, timeout):
+            self.dump_response_if_enabled(s3, CORE_DATA_BUCKET, key, ecosystem, package,
+                                          version)
+            return True
 
         # raise Exception('Timeout waiting for the job metadata in S3!')
 
@@ -142,12 +137,27 @@ class JobsApi(Api):
               '(timetout is se to {s} seconds)'.format(s=timeout))
         return False
 
-    def component_analysis(self, i, s3, thread_id=None,
-                           ecosystem=None, component=None, version=None):
-        """Start the component analysis and wait for its finish."""
+    def prepare_component_analysis(self, i, s3, ecosystem=None, component=None, version=None):
+        """Select the component and take snapshot of its results, it is not part of the analysis.
+
+        Return (ecosystem, component, version, watcher) to be passed to run_component_analysis.
+        """
         assert i >= 0
         if ecosystem is None or component is None or version is None:
             ecosystem, component, version = next(self.componentGeneratorForPypi)
         s3.connect()
+        watcher = JobsApi.component_analysis_watcher(s3, ecosystem, component, version)
+        return ecosystem, component, version, watcher
+
+    def run_component_analysis(self, s3, prepared, thread_id=None):
+        """Start the prepared component analysis and wait for its finish."""
+        ecosystem, component, version, watcher = prepared
         self.start_component_analysis(ecosystem, component, version, thread_id)
-        return self.wait_for_component_analysis(s3, ecosystem, component, version, thread_id)
+        return self.wait_for_component_analysis(s3, watcher, ecosystem, component, version,
+                                                thread_id)
+
+    def component_analysis(self, i, s3, thread_id=None,
+                           ecosystem=None, component=None, version=None):
+        """Start the component analysis and wait for its finish."""
+        prepared = self.prepare_component_analysis(i, s3, ecosystem, component, version)
+        return self.run_component_analysis(s3, prepared, thread_id)
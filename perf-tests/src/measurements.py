@@ -1,7 +1,18 @@
 """Module with functions that read data and metadata from the S3 and retrieve durations."""
 
 from duration import Duration
-from botocore.exceptions import ClientError
+
+
+def read_audit_durations(s3, bucket, keys, durations):
+    """Read durations of all analyses concurrently, keys is a dict analysis -> S3 key."""
+    audits = s3.read_objects_audit(bucket, keys.values())
+    for analysis, key in keys.items():
+        audit = audits[key]
+        if audit is None:
+            print("Warning: duration for the following analysis won't be "
+                  "be computed: {a}".format(a=analysis))
+        else:
+            durations[analysis] = Duration.from_audit_node(audit)
 
 
 def read_component_analysis_from_core_data(s3, ecosystem, component, version):
@@ -21,14 +32,9 @@ def read_component_analysis_from_core_data(s3, ecosystem, component, version):
         analyses.remove("github_details")
     # analyses.remove("code_metrics")
 
-    for analysis in analyses:
-        key = s3.component_analysis_key(ecosystem, component, version, analysis)
-        try:
-            data = s3.read_object(bucket, key)
-            durations[analysis] = Duration.from_audit(data)
-        except ClientError:
-            print("Warning: duration for the following analysis won't be "
-                  "be computed: {a}".format(a=analysis))
+    keys = {analysis: s3.component_analysis_key(ecosystem, component, version, analysis)
+            for analysis in analyses}
+    read_audit_durations(s3, bucket, keys, durations)
 
     return durations
 
@@ -46,14 +52,9 @@ def read_component_analysis_from_core_package(s3, ecosystem, component):
     # we have to specify analysis manually here
     analyses = ["git_stats", "github_details", "keywords_tagging", "libraries_io"]
 
-    for analysis in analyses:
-        key = s3.component_core_package_data_analysis_key(ecosystem, component, analysis)
-        try:
-            data = s3.read_object(bucket, key)
-            durations[analysis] = Duration.from_audit(data)
-        except ClientError:
-            print("Warning: duration for the following analysis won't be "
-                  "be computed: {a}".format(a=analysis))
+    keys = {analysis: s3.component_core_package_data_analysis_key(ecosystem, component, analysis)
+            for analysis in analyses}
+    read_audit_durations(s3, bucket, keys, durations)
 
     return durations
 
@@ -1,24 +1,37 @@
 """Main module with performance tests interface."""
 
-import time
 import os.path
 import sys
 import queue
 import threading
 import csv
 
+import numpy as np
+
 from coreapi import CoreApi
 from jobsapi import JobsApi
 from gremlin_api import GremlinApi
 import benchmarks
 import graph
+import http_timing
+import resource_sampler
+import result_store
+import sampling
+import scheduler
+import sweep
 from s3interface import S3Interface
 from duration import Duration
+from samples import Measurements
 
 from cliargs import cli_parser
 
 SEQUENCED_BENCHMARKS_DEFAULT_COUNT = 30
-BREATHE_PAUSE = 5
+
+# number of threads for parallel calls when --thread-max is not specified
+THREAD_MAX_DEFAULT = 10
+
+# number of bins of exported histograms of durations
+HISTOGRAM_BINS = 20
 
 STACK_ANALYSIS_JOB_NAMES = [
     'recommendation_v2',
@@ -100,8 +113,21 @@ def run_core_api_sequenced_calls_benchmark(core_api, s3):
     run_sequenced_benchmark(core_api, s3,
                             "Core API endpoint",
                             "core_api_sequenced_calls",
-                            lambda api, s3, measurement_count, pause_time:
-                                benchmarks.core_api_benchmark(api, measurement_count, pause_time),
+                            lambda api, s3, measurement_count, pause_time, first_index:
+                                benchmarks.core_api_benchmark(api, measurement_count, pause_time,
+                                                              first_index=first_index),
+                            [5, 2, 1.5, 1.0, 0.5, 0.0], 20)
+
+
+def run_jobs_api_sequenced_calls_benchmark(jobs_api, s3):
+    """Start the benchmarks for the jobs API."""
+    print("Jobs API sequenced calls benchmark")
+    run_sequenced_benchmark(jobs_api, s3,
+                            "Jobs API endpoint",
+                            "jobs_api_sequenced_calls",
+                            lambda api, s3, measurement_count, pause_time, first_index:
+                                benchmarks.jobs_api_benchmark(api, measurement_count, pause_time,
+                                                              first_index=first_index),
                             [5, 2, 1.5, 1.0, 0.5, 0.0], 20)
 
 
@@ -111,9 +137,10 @@ def run_stack_analysis_sequenced_calls_benchmark(core_api, s3):
     run_sequenced_benchmark(core_api, s3,
                             "Stack analysis API endpoint",
                             "stack_analysis_sequenced_calls",
-                            lambda api, s3, measurement_count, pause_time:
+                            lambda api, s3, measurement_count, pause_time, first_index:
                                 benchmarks.stack_analysis_benchmark(api, measurement_count,
-                                                                    pause_time),
+                                                                    pause_time,
+                                                                    first_index=first_index),
                             [1], SEQUENCED_BENCHMARKS_DEFAULT_COUNT,
                             compute_stack_analysis_jobs_durations=True)
 
@@ -124,21 +151,23 @@ def run_read_component_analysis_sequenced_calls_benchmark(core_api, s3):
     run_sequenced_benchmark(core_api, s3,
                             "Component analysis for known component",
                             "component_analysis_sequenced_calls_known_component",
-                            lambda api, s3, measurement_count, pause_time:
+                            lambda api, s3, measurement_count, pause_time, first_index:
                                 benchmarks.component_analysis_benchmark(api, s3,
                                                                         measurement_count,
                                                                         0, True, None, "pypi",
-                                                                        "clojure_py", "0.2.4"),
+                                                                        "clojure_py", "0.2.4",
+                                                                        first_index=first_index),
                             [1], SEQUENCED_BENCHMARKS_DEFAULT_COUNT)
     run_sequenced_benchmark(core_api, s3,
                             "Component analysis for unknown component",
                             "component_analysis_sequenced_calls_unknown_component",
-                            lambda api, s3, measurement_count, pause_time:
+                            lambda api, s3, measurement_count, pause_time, first_index:
                                 benchmarks.component_analysis_benchmark(api, s3,
                                                                         measurement_count,
                                                                         0, False, None, "pypi",
                                                                         "non_existing_component",
-                                                                        "9.8.7"),
+                                                                        "9.8.7",
+                                                                        first_index=first_index),
                             [1], SEQUENCED_BENCHMARKS_DEFAULT_COUNT)
 
 
@@ -148,19 +177,20 @@ def run_component_analysis_sequenced_calls_benchmark(jobs_api, s3):
     run_sequenced_benchmark(jobs_api, s3,
                             "Component analysis flow scheduling, same component",
                             "component_analysis_flow_scheduling_same_component",
-                            lambda api, s3, measurement_count, pause_time:
+                            lambda api, s3, measurement_count, pause_time, first_index:
                                 benchmarks.component_analysis_flow_scheduling(api, s3,
                                                                               measurement_count,
                                                                               60, None, "pypi",
                                                                               "clojure_py",
-                                                                              "0.2.4"))
+                                                                              "0.2.4",
+                                                                              first_index))
     run_sequenced_benchmark(jobs_api, s3,
                             "Component analysis flow scheduling, different components",
                             "component_analysis_flow_scheduling_different_components",
-                            lambda api, s3, measurement_count, pause_time:
-                                benchmarks.component_analysis_flow_scheduling(api, s3,
-                                                                              measurement_count,
-                                                                              pause_time))
+                            lambda api, s3, measurement_count, pause_time, first_index:
+                                benchmarks.component_analysis_flow_scheduling(
+                                    api, s3, measurement_count, pause_time,
+                                    first_index=first_index))
 
 
 def run_package_query_to_graph_db_sequenced_benchmark(gremlin_api):
@@ -169,10 +199,11 @@ def run_package_query_to_graph_db_sequenced_benchmark(gremlin_api):
     run_sequenced_benchmark(gremlin_api, None,
                             "Package query to graph DB sequenced benchmark",
                             "package_query_graph_db",
-                            lambda api, s3, measurement_count, pause_time:
+                            lambda api, s3, measurement_count, pause_time, first_index:
                                 benchmarks.package_query_to_graph_db(api,
                                                                      measurement_count,
-                                                                     pause_time))
+                                                                     pause_time,
+                                                                     first_index=first_index))
 
 
 def run_package_version_query_to_graph_db_sequenced_benchmark(gremlin_api):
@@ -181,10 +212,10 @@ def run_package_version_query_to_graph_db_sequenced_benchmark(gremlin_api):
     run_sequenced_benchmark(gremlin_api, None,
                             "Package version query to graph DB sequenced benchmark",
                             "package_version_query_graph_db",
-                            lambda api, s3, measurement_count, pause_time:
-                                benchmarks.package_version_query_to_graph_db(api,
-                                                                             measurement_count,
-                                                                             pause_time))
+                            lambda api, s3, measurement_count, pause_time, first_index:
+                                benchmarks.package_version_query_to_graph_db(
+                                    api, measurement_count, pause_time,
+                                    first_index=first_index))
 
 
 def check_number_of_results(queue_size, thread_count):
@@ -212,6 +243,8 @@ def export_concurrent_benchmark_results(name_prefix, thread_counts,
         for i in range(0, len(thread_counts)):
             csv_writer.writerow([i, thread_counts[i],
                                  summary_min_times[i], summary_max_times[i], summary_avg_times[i]])
+            result_store.record_summary(name_prefix, thread_counts[i], summary_min_times[i],
+                                        summary_max_times[i], summary_avg_times[i])
 
 
 def run_analysis_concurrent_benchmark(api, s3, message, name_prefix, function_to_call,
@@ -233,6 +266,7 @@ def run_analysis_concurrent_benchmark(api, s3, message, name_prefix, function_to
 
         threads = []
         q = queue.Queue()
+        since = resource_sampler.mark()
 
         for thread_id in range(0, thread_count):
             t = threading.Thread(target=lambda api, s3, measurement_count, pause_time, q,
@@ -252,7 +286,10 @@ def run_analysis_concurrent_benchmark(api, s3, message, name_prefix, function_to
         check_number_of_results(queue_size, thread_count)
 
         # read all really stored results from the queue
-        values = [q.get()[0][0]["delta"] for i in range(queue_size)]
+        measurements = Measurements.concatenate([q.get()[0] for i in range(queue_size)])
+        values = measurements["delta"].tolist()
+        statistic = measurements.summary()
+        result_store.record_measurements(name_prefix, thread_count, values)
         print("values")
         print("count: {cnt}".format(cnt=len(values)))
         print(values)
@@ -261,23 +298,25 @@ def run_analysis_concurrent_benchmark(api, s3, message, name_prefix, function_to
                                                      t=thread_count)
         name = "{n}_{t}_threads".format(n=name_prefix, t=thread_count)
         graph.generate_wait_times_graph(title, name, values)
+        export_histogram_into_csv(name, measurements)
+        export_threads_into_csv(name, measurements)
+        resource_sampler.export(title, name, since, thread_count)
 
-        min_times.append(min(values))
-        max_times.append(max(values))
-        avg_times.append(sum(values) / len(values))
+        min_times.append(statistic["min"])
+        max_times.append(statistic["max"])
+        avg_times.append(statistic["avg"])
 
         print("min_times:", min_times)
         print("max_times:", max_times)
         print("avg_times:", avg_times)
 
-        summary_min_times.append(min(values))
-        summary_max_times.append(max(values))
-        summary_avg_times.append(sum(values) / len(values))
+        summary_min_times.append(statistic["min"])
+        summary_max_times.append(statistic["max"])
+        summary_avg_times.append(statistic["avg"])
 
         generate_statistic_graph(name, thread_count, ["min/avg/max"],
                                  min_times, max_times, avg_times)
-        print("Breathe (statistic graph)...")
-        time.sleep(BREATHE_PAUSE)
+        scheduler.breathe(api, "Breathe (statistic graph)...")
 
     print(summary_min_times)
     print(summary_max_times)
@@ -295,78 +334,6 @@ def run_analysis_concurrent_benchmark(api, s3, message, name_prefix, function_to
                                         summary_min_times, summary_max_times, summary_avg_times)
 
 
-def run_component_analysis_concurrent_calls_benchmark(jobs_api, s3):
-    """Call component analysis in more threads and collect results."""
-    print("Component analysis concurrent benchmark")
-    measurement_count = 1
-    min_thread_count = 1
-    max_thread_count = 100
-
-    summary_min_times = []
-    summary_max_times = []
-    summary_avg_times = []
-
-    for thread_count in range(min_thread_count, 1 + max_thread_count):
-        min_times = []
-        max_times = []
-        avg_times = []
-
-        threads = []
-        q = queue.Queue()
-
-        for thread_id in range(0, thread_count):
-            t = threading.Thread(target=lambda api, s3, measurement_count, pause_time, q,
-                                 thread_id:
-                                 benchmarks.component_analysis_thread(api, s3,
-                                                                      measurement_count,
-                                                                      pause_time, q, thread_id),
-                                 args=(jobs_api, s3, measurement_count, 10, q, thread_id))
-            t.start()
-            threads.append(t)
-
-        print("---------------------------------")
-        print("Waiting for all threads to finish")
-        wait_for_all_threads(threads)
-        print("Done")
-
-        values = sum([q.get() for t in threads], [])
-        print("values")
-        print(len(values))
-        print(values)
-        print("----")
-        title = "Component analysis, {t} concurrent threads".format(
-            t=thread_count)
-        name = "jobs_flow_scheduling_{t}_threads".format(t=thread_count)
-        graph.generate_wait_times_graph(title, name, values)
-
-        min_times.append(min(values))
-        max_times.append(max(values))
-        avg_times.append(sum(values) / len(values))
-
-        print("min_times:", min_times)
-        print("max_times:", max_times)
-        print("avg_times:", avg_times)
-
-        summary_min_times.append(min(values))
-        summary_max_times.append(max(values))
-        summary_avg_times.append(sum(values) / len(values))
-
-        generate_statistic_graph("component_analysis", thread_count, [10],
-                                 min_times, max_times, avg_times)
-        print("Breathe (statistic graph)...")
-        time.sleep(BREATHE_PAUSE)
-
-    print(summary_min_times)
-    print(summary_max_times)
-    print(summary_avg_times)
-    t = range(min_thread_count, 1 + thread_count)
-    graph.generate_timing_threads_statistic_graph("Duration for concurrent analysis",
-                                                  "durations_{i}".format(i=thread_count), t,
-                                                  summary_min_times,
-                                                  summary_max_times,
-                                                  summary_avg_times)
-
-
 def wait_for_all_threads(threads):
     """Wait for all threads from given collection."""
     for t in threads:
@@ -443,6 +410,50 @@ def export_sequenced_benchmark_into_csv(name, measurements, compute_stack_analys
             export_measurements_into_csv(csv_writer, measurements)
 
 
+def export_phases_into_csv(name, values):
+    """Export durations of HTTP call phases into the CSV file, if any phase was measured."""
+    if not values.has_phases():
+        return
+    # phases that were not measured for given call are exported as zeros
+    rows = np.nan_to_num(np.column_stack([values["delta"]] +
+                                         [values[phase] for phase in http_timing.PHASES]))
+    with open(name + "_phases.csv", "w") as csvfile:
+        csv_writer = csv.writer(csvfile)
+        csv_writer.writerow(["Overall"] + list(http_timing.PHASES))
+        csv_writer.writerows(rows.tolist())
+
+
+def export_histogram_into_csv(name, values, bins=HISTOGRAM_BINS):
+    """Export histogram of durations into the CSV file."""
+    if len(values) == 0:
+        return
+    counts, edges = values.histogram(bins)
+    with open(name + "_histogram.csv", "w") as csvfile:
+        csv_writer = csv.writer(csvfile)
+        csv_writer.writerow(["From", "To", "Count"])
+        csv_writer.writerows(zip(edges[:-1].tolist(), edges[1:].tolist(), counts.tolist()))
+
+
+def export_threads_into_csv(name, values):
+    """Export count, min, max, and avg durations for each thread into the CSV file."""
+    with open(name + "_threads.csv", "w") as csvfile:
+        csv_writer = csv.writer(csvfile)
+        csv_writer.writerow(["Thread", "Count", "Min", "Max", "Avg"])
+        for thread_id, statistic in sorted(values.per_thread().items(),
+                                           key=lambda item: -1 if item[0] is None else item[0]):
+            csv_writer.writerow([thread_id, statistic["count"], statistic["min"],
+                                 statistic["max"], statistic["avg"]])
+
+
+def export_samples_into_csv(name, values, outliers):
+    """Export durations of all calls together with outlier flags into the CSV file."""
+    with open(name + "_samples.csv", "w") as csvfile:
+        csv_writer = csv.writer(csvfile)
+        csv_writer.writerow(["Call", "Overall", "Outlier"])
+        csv_writer.writerows(zip(range(1, len(values) + 1), values["delta"].tolist(),
+                                 outliers.astype(int).tolist()))
+
+
 def run_sequenced_benchmark(api, s3, title_prefix, name_prefix, function,
                             pauses=None, measurement_count=SEQUENCED_BENCHMARKS_DEFAULT_COUNT,
                             compute_stack_analysis_jobs_durations=False):
@@ -479,28 +490,38 @@ def run_sequenced_benchmark(api, s3, title_prefix, name_prefix, function,
             name = "{n}".format(n=name_prefix)
         print("  " + title)
 
-        values, debug = function(api, s3, measurement_count, pause)
-        deltas = [value["delta"] for value in values]
+        since = resource_sampler.mark()
+        values, debug = sampling.sample(function, api, s3, measurement_count, pause)
+        resource_sampler.export(title, name, since)
+        deltas = values["delta"].tolist()
+        export_phases_into_csv(name, values)
+
+        outliers = values.outliers(sampling.current_settings().outlier_threshold)
+        sampling.print_sampling_statistic(values, outliers)
+        export_samples_into_csv(name, values, outliers)
+        export_histogram_into_csv(name, values)
+        result_store.record_measurements(name, 1, deltas)
 
         graph.generate_wait_times_graph(title, name, deltas)
-        print("Breathe (statistic graph)...")
-        time.sleep(BREATHE_PAUSE)
+        scheduler.breathe(api, "Breathe (statistic graph)...")
 
-        min_times.append(min(deltas))
-        max_times.append(max(deltas))
-        avg_times.append(sum(deltas) / len(deltas))
+        statistic = values.summary()
+        min_times.append(statistic["min"])
+        max_times.append(statistic["max"])
+        avg_times.append(statistic["avg"])
         measurements.extend(deltas)
 
         if compute_stack_analysis_jobs_durations:
             for job_name in STACK_ANALYSIS_JOB_NAMES:
                 durations = job_durations(job_name, debug)
+                result_store.record_measurements(name, 1, durations, job_name)
                 # all durations for specific jobs need to be stored here
                 stack_analysis_jobs_durations[job_name].extend(durations)
                 # compute statistic
-                cnt = len(durations)
-                stack_analysis_jobs_durations_min_times[job_name].append(min(durations))
-                stack_analysis_jobs_durations_max_times[job_name].append(max(durations))
-                stack_analysis_jobs_durations_avg_times[job_name].append(sum(durations) / cnt)
+                durations = np.asarray(durations, dtype=float)
+                stack_analysis_jobs_durations_min_times[job_name].append(float(durations.min()))
+                stack_analysis_jobs_durations_max_times[job_name].append(float(durations.max()))
+                stack_analysis_jobs_durations_avg_times[job_name].append(float(durations.mean()))
 
     print(min_times)
     print(max_times)
@@ -521,123 +542,127 @@ def run_sequenced_benchmark(api, s3, title_prefix, name_prefix, function,
                                         stack_analysis_jobs_durations)
 
 
-def run_api_concurrent_benchmark(core_api, function_to_call, name_prefix):
-    """Call given API endpoint concurrently."""
-    measurement_count = 1
-    min_thread_count = 1
-    max_thread_count = 2
-    pauses = [2.0, 1.5, 1.0, 0.5, 0]  # 2, 1, 0.5, 0]
-    pauses = [0.0, ]
-
-    summary_min_times = []
-    summary_max_times = []
-    summary_avg_times = []
-
-    for thread_count in range(min_thread_count, 1 + max_thread_count):
-        min_times = []
-        max_times = []
-        avg_times = []
-
-        for pause in pauses:
-            threads = []
-            q = queue.Queue()
-
-            for thread_id in range(0, thread_count):
-                t = threading.Thread(target=function_to_call,
-                                     args=(core_api, measurement_count, pause, q, thread_id))
-                t.start()
-                threads.append(t)
-
-            wait_for_all_threads(threads)
-
-            values = sum([q.get() for t in threads], [])
-            title = "core API endpoint, {t} concurrent threads, {s} seconds between calls".format(
-                t=thread_count, s=pause)
-            name = "{p}_concurrent_{t}_threads_{s}_pause_time".format(p=name_prefix,
-                                                                      t=thread_count,
-                                                                      s=pause)
-            graph.generate_wait_times_graph(title, name, values)
-
-            min_times.append(min(values))
-            max_times.append(max(values))
-            avg_times.append(sum(values) / len(values))
-
-            print("Breathe...")
-            time.sleep(BREATHE_PAUSE)
-
-        print(min_times)
-        print(max_times)
-        print(avg_times)
-
-        summary_min_times.append(min(values))
-        summary_max_times.append(max(values))
-        summary_avg_times.append(sum(values) / len(values))
-
-        generate_statistic_graph(name_prefix, thread_count, pauses,
-                                 min_times, max_times, avg_times)
-        print("Breathe (statistic graph)...")
-        time.sleep(BREATHE_PAUSE)
-
-    print(summary_min_times)
-    print(summary_max_times)
-    print(summary_avg_times)
-    t = range(min_thread_count, 1 + thread_count)
-    graph.generate_timing_threads_statistic_graph("Duration for concurrent API calls",
-                                                  "{p}_{t}".format(p=name_prefix, t=thread_count),
-                                                  t,
-                                                  summary_min_times,
-                                                  summary_max_times,
-                                                  summary_avg_times)
-
-
-def run_core_api_concurrent_benchmark(core_api):
-    """Start the benchmarks for the core API."""
-    print("Core API concurrent benchmark")
-    run_api_concurrent_benchmark(core_api, benchmarks.core_api_benchmark_thread, "core_api")
+def add_parallel_benchmarks(benchmark_scheduler, core_api, jobs_api, gremlin_api, s3,
+                            run_core_api, run_jobs_api, run_stack_analysis,
+                            run_component_analysis, run_package_query_to_graph_db,
+                            run_package_version_query_to_graph_db, thread_max,
+                            sweep_settings=None):
+    """Add the selected benchmarks making parallel calls into the scheduler."""
+    if sweep_settings is None:
+        concurrent_benchmark, thread_settings = run_analysis_concurrent_benchmark, [thread_max]
+    else:
+        concurrent_benchmark, thread_settings = sweep.run_sweep, sweep_settings
+    db = scheduler.GROUP_GRAPH_DB
+
+    if run_core_api:
+        benchmark_scheduler.add(scheduler.GROUP_CORE_API, "core API parallel calls",
+                                concurrent_benchmark,
+                                core_api, s3, "Core API endpoint",
+                                "core_api_parallel_calls",
+                                benchmarks.core_api_benchmark_thread,
+                                thread_settings)
+    if run_jobs_api:
+        benchmark_scheduler.add(scheduler.GROUP_JOBS_API, "jobs API parallel calls",
+                                concurrent_benchmark,
+                                jobs_api, s3, "Jobs API endpoint",
+                                "jobs_api_parallel_calls",
+                                benchmarks.jobs_api_benchmark_thread,
+                                thread_settings)
+    if run_package_query_to_graph_db:
+        benchmark_scheduler.add(db, "package query to graph DB parallel calls",
+                                concurrent_benchmark,
+                                gremlin_api, s3, "Package query to graph db",
+                                "package_query_graph_db_parallel",
+                                benchmarks.package_query_graph_db_thread,
+                                thread_settings)
+    if run_package_version_query_to_graph_db:
+        benchmark_scheduler.add(db, "package+version query to graph DB parallel calls",
+                                concurrent_benchmark,
+                                gremlin_api, s3, "Package+version query to graph db",
+                                "package_version_query_graph_db_parallel",
+                                benchmarks.package_version_query_graph_db_thread,
+                                thread_settings)
+    if run_stack_analysis:
+        benchmark_scheduler.add(db, "stack analysis parallel calls",
+                                concurrent_benchmark,
+                                core_api, s3, "Stack analysis",
+                                "stack_analysis_parallel_calls",
+                                benchmarks.stack_analysis_thread,
+                                thread_settings)
+    if run_component_analysis:
+        benchmark_scheduler.add(db, "component analysis parallel calls, known component",
+                                concurrent_benchmark,
+                                core_api, s3, "Component analysis known component",
+                                "component_analysis_parallel_calls_known_component",
+                                benchmarks.component_analysis_read_thread_known_component,
+                                thread_settings)
+        benchmark_scheduler.add(db, "component analysis parallel calls, unknown component",
+                                concurrent_benchmark,
+                                core_api, s3, "Component analysis unknown component",
+                                "component_analysis_parallel_calls_unknown_component",
+                                benchmarks.component_analysis_read_thread_unknown_component,
+                                thread_settings)
+
+
+def add_sequenced_benchmarks(benchmark_scheduler, core_api, jobs_api, gremlin_api, s3,
+                             run_core_api, run_jobs_api, run_stack_analysis,
+                             run_component_analysis, run_package_query_to_graph_db,
+                             run_package_version_query_to_graph_db):
+    """Add the selected benchmarks making sequenced calls into the scheduler."""
+    db = scheduler.GROUP_GRAPH_DB
+
+    if run_core_api:
+        benchmark_scheduler.add(scheduler.GROUP_CORE_API, "core API sequenced calls",
+                                run_core_api_sequenced_calls_benchmark, core_api, s3)
+    if run_jobs_api:
+        benchmark_scheduler.add(scheduler.GROUP_JOBS_API, "jobs API sequenced calls",
+                                run_jobs_api_sequenced_calls_benchmark, jobs_api, s3)
+    if run_stack_analysis:
+        benchmark_scheduler.add(db, "stack analysis sequenced calls",
+                                run_stack_analysis_sequenced_calls_benchmark, core_api, s3)
+    if run_component_analysis:
+        benchmark_scheduler.add(db, "component analysis sequenced calls",
+                                run_read_component_analysis_sequenced_calls_benchmark,
+                                core_api, s3)
+    if run_package_query_to_graph_db:
+        benchmark_scheduler.add(db, "package query to graph DB",
+                                run_package_query_to_graph_db_sequenced_benchmark,
+                                gremlin_api)
+    if run_package_version_query_to_graph_db:
+        benchmark_scheduler.add(db, "package+version query to graph DB",
+                                run_package_version_query_to_graph_db_sequenced_benchmark,
+                                gremlin_api)
 
 
 def run_benchmarks(core_api, jobs_api, gremlin_api, s3,
-                   run_stack_analysis, run_component_analysis,
+                   run_core_api, run_jobs_api, run_stack_analysis, run_component_analysis,
                    run_package_query_to_graph_db, run_package_version_query_to_graph_db,
-                   run_parallel_tests, thread_max):
-    """Start the selected benchmarks."""
-    if not run_parallel_tests:
-        if run_stack_analysis:
-            run_stack_analysis_sequenced_calls_benchmark(core_api, s3)
-        if run_component_analysis:
-            run_read_component_analysis_sequenced_calls_benchmark(core_api, s3)
-        if run_package_query_to_graph_db:
-            run_package_query_to_graph_db_sequenced_benchmark(gremlin_api)
-        if run_package_version_query_to_graph_db:
-            run_package_version_query_to_graph_db_sequenced_benchmark(gremlin_api)
+                   run_parallel_tests, thread_max, run_concurrently=False, sweep_settings=None):
+    """Start the selected benchmarks.
+
+    Benchmarks for independent backends are run concurrently when run_concurrently is set.
+    Parallel calls are made by thread count sweep when sweep_settings are provided.
+    """
+    benchmark_scheduler = scheduler.BenchmarkScheduler()
+    selected = (run_core_api, run_jobs_api, run_stack_analysis, run_component_analysis,
+                run_package_query_to_graph_db, run_package_version_query_to_graph_db)
+    if run_parallel_tests:
+        add_parallel_benchmarks(benchmark_scheduler, core_api, jobs_api, gremlin_api, s3,
+                                *selected, thread_max, sweep_settings)
     else:
-        if run_package_query_to_graph_db:
-            run_analysis_concurrent_benchmark(gremlin_api, s3, "Package query to graph db",
-                                              "package_query_graph_db_parallel",
-                                              benchmarks.package_query_graph_db_thread,
-                                              [thread_max])
-        if run_package_version_query_to_graph_db:
-            run_analysis_concurrent_benchmark(gremlin_api, s3, "Package+version query to graph db",
-                                              "package_version_query_graph_db_parallel",
-                                              benchmarks.package_version_query_graph_db_thread,
-                                              [thread_max])
-        if run_stack_analysis:
-            run_analysis_concurrent_benchmark(core_api, s3, "Stack analysis",
-                                              "stack_analysis_parallel_calls",
-                                              benchmarks.stack_analysis_thread,
-                                              [thread_max])
-        if run_component_analysis:
-            run_analysis_concurrent_benchmark(core_api, s3, "Component analysis known component",
-                                              "component_analysis_parallel_calls_known_component",
-                                              benchmarks.
-                                              component_analysis_read_thread_known_component,
-                                              [thread_max])
-
-            run_analysis_concurrent_benchmark(core_api, s3, "Component analysis unknown component",
-                                              "component_analysis_parallel_calls_unknown_component",
-                                              benchmarks.
-                                              component_analysis_read_thread_unknown_component,
-                                              [thread_max])
+        add_sequenced_benchmarks(benchmark_scheduler, core_api, jobs_api, gremlin_api, s3,
+                                 *selected)
+    return benchmark_scheduler.run(run_concurrently)
+
+
+def register_quiet_detectors(core_api, jobs_api, gremlin_api, max_wait):
+    """Measure latencies of all idle backends, they are used to detect that backend is quiet."""
+    print("Measuring baseline latencies of all backends")
+    scheduler.register_quiet_detector(core_api, scheduler.BACKEND_CORE_API, max_wait)
+    scheduler.register_quiet_detector(jobs_api, scheduler.BACKEND_JOBS_API, max_wait)
+    # Gremlin URL is optional
+    if gremlin_api.url:
+        scheduler.register_quiet_detector(gremlin_api, scheduler.BACKEND_GREMLIN, max_wait)
 
 
 def run_benchmarks_sla(core_api, jobs_api, s3):
@@ -670,6 +695,22 @@ def generate_statistic_graph(name_prefix, thread_count, x_axis_labels, min_times
                                           min_times, max_times, avg_times, 640, 480)
 
 
+def prepare_sweep_settings(cli_arguments):
+    """Prepare settings for thread count sweep, None when the sweep is not enabled."""
+    if not cli_arguments.sweep:
+        return None
+    return sweep.SweepSettings(cli_arguments.thread_min,
+                               cli_arguments.thread_max or sweep.SWEEP_THREAD_MAX,
+                               cli_arguments.p99_limit, cli_arguments.sweep_calls)
+
+
+def prepare_sampling_settings(cli_arguments):
+    """Prepare settings for warm-up and adaptive sampling of sequenced benchmarks."""
+    return sampling.SamplingSettings(cli_arguments.warmup, cli_arguments.ci_target,
+                                     cli_arguments.max_calls,
+                                     outlier_threshold=cli_arguments.outlier_threshold)
+
+
 def main():
     """Entry point to the performance tests."""
     cli_arguments = cli_parser.parse_args()
@@ -686,12 +727,15 @@ def main():
     aws_secret_access_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
     s3_region_name = os.environ.get('S3_REGION_NAME')
     deployment_prefix = os.environ.get('DEPLOYMENT_PREFIX', 'STAGE')
+    # needed only for S3-compatible services other than AWS S3, for example moto server
+    s3_endpoint_url = os.environ.get('S3_ENDPOINT_URL')
 
     core_api = CoreApi(coreapi_url, recommender_api_token)
     jobs_api = JobsApi(jobs_api_url, job_api_token)
     gremlin_api = GremlinApi(gremlin_api_url)
 
-    s3 = S3Interface(aws_access_key_id, aws_secret_access_key, s3_region_name, deployment_prefix)
+    s3 = S3Interface(aws_access_key_id, aws_secret_access_key, s3_region_name, deployment_prefix,
+                     s3_endpoint_url)
 
     check_system(core_api, jobs_api, s3)
 
@@ -704,16 +748,49 @@ def main():
     # the appropriate attribute
     core_api.stack_analysis_manifest = cli_arguments.manifest
 
+    register_quiet_detectors(core_api, jobs_api, gremlin_api, cli_arguments.breathe_max_wait)
+    sampling.configure(prepare_sampling_settings(cli_arguments))
+
+    # results are stored together with results of all previous runs
+    if cli_arguments.results_db:
+        try:
+            result_store.open_store(cli_arguments.results_db, cli_arguments.run_id,
+                                    result_store.tested_git_sha(cli_arguments.git_sha))
+        except ValueError as e:
+            print("Fatal: {e}".format(e=e))
+            sys.exit(1)
+
+    # resources used by this process are sampled, so saturated client can be detected
+    if cli_arguments.resource_interval > 0:
+        resource_sampler.start_sampler(cli_arguments.resource_interval)
+
+    # graphs are rendered in the background, HTML report is written after all benchmarks
+    graph.start_renderer(cli_arguments.graph_processes,
+                         graph.DEFAULT_REPORT if cli_arguments.generate_html else None)
+
+    failures = []
     if cli_arguments.sla:
         run_benchmarks_sla(core_api, jobs_api, s3)
     else:
-        run_benchmarks(core_api, jobs_api, gremlin_api, s3,
-                       cli_arguments.stack_analysis_benchmark,
-                       cli_arguments.component_analysis_benchmark,
-                       cli_arguments.package_query_to_graph_benchmark,
-                       cli_arguments.package_version_query_to_graph_benchmark,
-                       cli_arguments.parallel,
-                       cli_arguments.thread_max)
+        failures = run_benchmarks(core_api, jobs_api, gremlin_api, s3,
+                                  cli_arguments.server_api_benchmark,
+                                  cli_arguments.jobs_api_benchmark,
+                                  cli_arguments.stack_analysis_benchmark,
+                                  cli_arguments.component_analysis_benchmark,
+                                  cli_arguments.package_query_to_graph_benchmark,
+                                  cli_arguments.package_version_query_to_graph_benchmark,
+                                  cli_arguments.parallel,
+                                  cli_arguments.thread_max or THREAD_MAX_DEFAULT,
+                                  cli_arguments.concurrent_backends,
+                                  prepare_sweep_settings(cli_arguments))
+
+    resource_sampler.stop_sampler()
+    failures.extend("graph " + name for name in graph.finish_renderer())
+    result_store.close_store()
+
+    if failures:
+        print("Failed benchmarks and graphs: {f}".format(f=", ".join(failures)))
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,221 @@
+"""Sampler of resources used by the perf-tests process itself, read from /proc."""
+
+import csv
+import os
+import threading
+import time
+
+import graph
+import result_store
+
+# seconds between two samples
+DEFAULT_INTERVAL = 1.0
+
+# CPU usage (in % of one core) above which the client is considered saturated; threads of the
+# harness share the GIL, so one busy core is enough to distort the measured latencies
+CPU_SATURATION = 90.0
+
+# metric used to store the client CPU usage together with the benchmark results
+METRIC_CLIENT_CPU = "client_cpu"
+
+# socket states as written in /proc/net/tcp
+TCP_STATES = {
+    "01": "established",
+    "02": "syn_sent",
+    "06": "time_wait",
+    "08": "close_wait",
+}
+
+COLUMNS = ["time", "cpu", "rss_mb", "fds", "threads", "established", "syn_sent",
+           "close_wait", "time_wait"]
+
+# all samples taken during the run are streamed into this file, so they are not kept in memory
+DEFAULT_FILENAME = "client_resources.csv"
+
+
+def read_cpu_seconds():
+    """Read user + system CPU time consumed by this process."""
+    with open("/proc/self/stat") as fin:
+        # the process name can contain spaces, so fields are counted from its end
+        fields = fin.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def read_status():
+    """Read resident set size (in MB) and number of threads of this process."""
+    rss = threads = 0
+    with open("/proc/self/status") as fin:
+        for line in fin:
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1]) / 1024.0
+            elif line.startswith("Threads:"):
+                threads = int(line.split()[1])
+    return rss, threads
+
+
+def read_socket_inodes():
+    """Read all open file descriptors, return their count and inodes of sockets among them."""
+    inodes = set()
+    fds = os.listdir("/proc/self/fd")
+    for fd in fds:
+        try:
+            target = os.readlink("/proc/self/fd/" + fd)
+        except OSError:
+            # the descriptor was closed in the meantime
+            continue
+        if target.startswith("socket:["):
+            inodes.add(target[len("socket:["):-1])
+    return len(fds), inodes
+
+
+def read_socket_states(inodes):
+    """Count TCP sockets by their state.
+
+    Sockets in TIME_WAIT state don't belong to any process anymore, so they
+    are counted for the whole network namespace, other states only for
+    sockets owned by this process.
+    """
+    counts = {state: 0 for state in TCP_STATES.values()}
+    for filename in ("/proc/self/net/tcp", "/proc/self/net/tcp6"):
+        try:
+            with open(filename) as fin:
+                next(fin)
+                for line in fin:
+                    fields = line.split()
+                    state = TCP_STATES.get(fields[3])
+                    if state == "time_wait" or (state is not None and fields[9] in inodes):
+                        counts[state] += 1
+        except OSError:
+            # IPv6 might be disabled
+            continue
+    return counts
+
+
+class ResourceSampler(threading.Thread):
+    """Thread that samples CPU, memory, file descriptors, threads, and sockets periodically.
+
+    Samples are appended into CSV file as they are taken and read back when
+    they are exported, so the memory used by the sampler does not grow.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, filename=DEFAULT_FILENAME):
+        """Prepare the sampler, it starts sampling after start() is called."""
+        super().__init__(name="resource-sampler", daemon=True)
+        self.interval = interval
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._fout = open(filename, "w", newline="")
+        self._csv_writer = csv.writer(self._fout)
+        self._csv_writer.writerow(COLUMNS)
+
+    def sample(self, previous_time, previous_cpu):
+        """Take one sample, CPU usage is computed since the previous sample."""
+        now = time.time()
+        cpu_seconds = read_cpu_seconds()
+        rss, threads = read_status()
+        fds, inodes = read_socket_inodes()
+        sockets = read_socket_states(inodes)
+        cpu = 100.0 * (cpu_seconds - previous_cpu) / (now - previous_time)
+        row = [now, cpu, rss, fds, threads, sockets["established"], sockets["syn_sent"],
+               sockets["close_wait"], sockets["time_wait"]]
+        with self._lock:
+            self._csv_writer.writerow(row)
+            self._fout.flush()
+        return now, cpu_seconds
+
+    def run(self):
+        """Take samples until stopped."""
+        previous = time.time(), read_cpu_seconds()
+        while not self._stopped.wait(self.interval):
+            previous = self.sample(*previous)
+
+    def stop(self):
+        """Stop sampling, wait for the thread to finish, and close the file with samples."""
+        self._stopped.set()
+        self.join()
+        with self._lock:
+            self._fout.close()
+
+    def samples_since(self, since):
+        """Read samples taken after given time back from the file."""
+        with self._lock, open(self.filename, newline="") as fin:
+            csv_reader = csv.reader(fin)
+            next(csv_reader)
+            rows = ([float(row[0]), float(row[1]), float(row[2])] + [int(v) for v in row[3:]]
+                    for row in csv_reader)
+            return [row for row in rows if row[0] >= since]
+
+
+# sampler used by the current run, None when resources are not sampled
+_sampler = None
+
+
+def start_sampler(interval=DEFAULT_INTERVAL):
+    """Start sampling resources of this process, it is not possible on systems without /proc."""
+    global _sampler
+    if not os.path.exists("/proc/self/stat"):
+        print("Resources of the client can't be sampled, /proc is not available")
+        return None
+    _sampler = ResourceSampler(interval)
+    _sampler.start()
+    return _sampler
+
+
+def stop_sampler():
+    """Stop the sampler used by the current run, if any."""
+    global _sampler
+    if _sampler is not None:
+        _sampler.stop()
+        _sampler = None
+
+
+def mark():
+    """Return time when the benchmark started, it is passed to export() later."""
+    return time.time()
+
+
+def export_csv(name, samples, since):
+    """Export samples into CSV file, times are relative to the start of the benchmark."""
+    with open(name + "_resources.csv", "w") as csvfile:
+        csv_writer = csv.writer(csvfile)
+        csv_writer.writerow(COLUMNS)
+        csv_writer.writerows([round(row[0] - since, 3)] + row[1:] for row in samples)
+
+
+def report_saturation(name, samples, thread_count):
+    """Store client CPU usage with the results and warn when the client was saturated."""
+    cpu = [row[1] for row in samples]
+    result_store.record_measurements(name, thread_count, cpu, METRIC_CLIENT_CPU)
+    saturated = sum(1 for value in cpu if value >= CPU_SATURATION)
+    print("client: max CPU {c:.0f} %, max RSS {r:.0f} MB, max fds {f}, max threads {t}".format(
+        c=max(cpu), r=max(row[2] for row in samples), f=max(row[3] for row in samples),
+        t=max(row[4] for row in samples)))
+    if saturated:
+        print("Warning: client was saturated in {s} of {n} samples, results of {b} might be "
+              "distorted".format(s=saturated, n=len(samples), b=name))
+
+
+def export_graph(title, name, samples, since):
+    """Generate graph with all sampled resources."""
+    columns = list(zip(*samples))
+    graph.generate_resources_graph("Client resources: " + title, name + "_resources",
+                                   [t - since for t in columns[0]],
+                                   {column: list(values)
+                                    for column, values in zip(COLUMNS[1:], columns[1:])})
+
+
+def export(title, name, since, thread_count=1):
+    """Export resources sampled while the benchmark was running into CSV file and graph.
+
+    Benchmarks for different backends might run concurrently, so the
+    resources are used by all of them.
+    """
+    if _sampler is None:
+        return
+    samples = _sampler.samples_since(since)
+    if not samples:
+        return
+    export_csv(name, samples, since)
+    report_saturation(name, samples, thread_count)
+    export_graph(title, name, samples, since)
@@ -0,0 +1,192 @@
+"""Append-only store of benchmark results from all runs, backed by SQLite database."""
+
+import datetime
+import os
+import sqlite3
+import sys
+import threading
+from uuid import uuid4
+
+DEFAULT_DATABASE = "perf_results.db"
+
+# metric used for the duration of the whole call
+METRIC_DURATION = "duration"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    git_sha TEXT
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    run_id TEXT NOT NULL REFERENCES runs (run_id),
+    benchmark TEXT NOT NULL,
+    thread_count INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS measurements_by_benchmark
+    ON measurements (benchmark, thread_count, metric, run_id);
+CREATE TABLE IF NOT EXISTS summaries (
+    run_id TEXT NOT NULL REFERENCES runs (run_id),
+    benchmark TEXT NOT NULL,
+    thread_count INTEGER NOT NULL,
+    min_time REAL,
+    max_time REAL,
+    avg_time REAL
+);
+CREATE INDEX IF NOT EXISTS summaries_by_benchmark
+    ON summaries (benchmark, thread_count, run_id);
+"""
+
+TREND_QUERY = """
+SELECT runs.run_id, runs.started_at, runs.git_sha,
+       COUNT(*), MIN(value), AVG(value), MAX(value)
+  FROM measurements JOIN runs ON runs.run_id = measurements.run_id
+ WHERE benchmark = ? AND thread_count = ? AND metric = ?
+ GROUP BY runs.run_id
+ ORDER BY runs.started_at
+"""
+
+
+# environment variable with SHA of the tested commit, set by the deployment pipeline
+GIT_SHA_VARIABLE = "GIT_SHA"
+
+
+def tested_git_sha(git_sha=None):
+    """Return SHA of the tested service commit, None when it is not known.
+
+    The commit of the tested service is not related to the commit of this
+    harness, so it is never guessed from the local repository.
+    """
+    return git_sha or os.environ.get(GIT_SHA_VARIABLE) or None
+
+
+def new_run_id():
+    """Generate unique run ID that sorts by the run start time."""
+    timestamp = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    return "{t}-{u}".format(t=timestamp, u=uuid4().hex[:8])
+
+
+class ResultStore:
+    """Results of all runs stored in one database, rows are only appended."""
+
+    def __init__(self, filename=DEFAULT_DATABASE):
+        """Open (and create if needed) the database."""
+        self.filename = filename
+        # benchmarks for different backends are run from different threads
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.run_id = None
+
+    def start_run(self, run_id=None, git_sha=None):
+        """Register new run, all results recorded later belong to this run.
+
+        Raise ValueError when the run with given ID is already stored.
+        """
+        run_id = run_id or new_run_id()
+        started_at = datetime.datetime.utcnow().isoformat()
+        try:
+            with self._lock, self._connection:
+                self._connection.execute("INSERT INTO runs VALUES (?, ?, ?)",
+                                         (run_id, started_at, git_sha))
+        except sqlite3.IntegrityError:
+            raise ValueError("run ID {r} is already stored in {f}, use another run ID".format(
+                r=run_id, f=self.filename))
+        self.run_id = run_id
+        return self.run_id
+
+    def record_measurements(self, benchmark, thread_count, values, metric=METRIC_DURATION):
+        """Record all measured values (in seconds) of one benchmark."""
+        rows = [(self.run_id, benchmark, thread_count, metric, seq, value)
+                for seq, value in enumerate(values)]
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT INTO measurements VALUES (?, ?, ?, ?, ?, ?)",
+                                         rows)
+
+    def record_summary(self, benchmark, thread_count, min_time, max_time, avg_time):
+        """Record min, max, and average times of one benchmark."""
+        with self._lock, self._connection:
+            self._connection.execute("INSERT INTO summaries VALUES (?, ?, ?, ?, ?, ?)",
+                                     (self.run_id, benchmark, thread_count,
+                                      min_time, max_time, avg_time))
+
+    def benchmarks(self):
+        """Return all (benchmark, thread count, metric) triples stored in the database."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT DISTINCT benchmark, thread_count, metric FROM measurements "
+                "ORDER BY benchmark, thread_count, metric").fetchall()
+
+    def trend(self, benchmark, thread_count=1, metric=METRIC_DURATION):
+        """Return (run ID, started at, git SHA, count, min, avg, max) for each run."""
+        with self._lock:
+            return self._connection.execute(TREND_QUERY,
+                                            (benchmark, thread_count, metric)).fetchall()
+
+    def close(self):
+        """Close the database."""
+        self._connection.close()
+
+
+# store used by the current run, None when results are not stored
+_store = None
+
+
+def open_store(filename, run_id=None, git_sha=None):
+    """Open the store and register new run, results are then recorded by functions below."""
+    global _store
+    store = ResultStore(filename)
+    try:
+        run_id = store.start_run(run_id, git_sha)
+    except ValueError:
+        store.close()
+        raise
+    _store = store
+    print("Results are stored into {f}, run ID {r}".format(f=filename, r=run_id))
+    return _store
+
+
+def close_store():
+    """Close the store used by the current run, if any."""
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+
+
+def record_measurements(benchmark, thread_count, values, metric=METRIC_DURATION):
+    """Record measured values into the store used by the current run, if any."""
+    if _store is not None:
+        _store.record_measurements(benchmark, thread_count, values, metric)
+
+
+def record_summary(benchmark, thread_count, min_time, max_time, avg_time):
+    """Record min, max, and average times into the store used by the current run, if any."""
+    if _store is not None:
+        _store.record_summary(benchmark, thread_count, min_time, max_time, avg_time)
+
+
+def print_trend(filename, benchmark=None, thread_count=1):
+    """Print all benchmarks in the store, or trend of one benchmark across all runs."""
+    store = ResultStore(filename)
+    if benchmark is None:
+        for row in store.benchmarks():
+            print("{b}    threads: {t}    metric: {m}".format(b=row[0], t=row[1], m=row[2]))
+    else:
+        for run_id, started_at, git_sha, count, min_time, avg_time, max_time in \
+                store.trend(benchmark, thread_count):
+            print("{r}  {s}  {g}  n={n}  min={mi:.3f}  avg={a:.3f}  max={ma:.3f}".format(
+                r=run_id, s=started_at, g=git_sha or "-", n=count,
+                mi=min_time, a=avg_time, ma=max_time))
+    store.close()
+
+
+if __name__ == "__main__":
+    # usage: result_store.py [database [benchmark [thread count]]]
+    args = sys.argv[1:]
+    print_trend(args[0] if args else DEFAULT_DATABASE,
+                args[1] if len(args) > 1 else None,
+                int(args[2]) if len(args) > 2 else 1)
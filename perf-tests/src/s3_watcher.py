@@ -0,0 +1,79 @@
+"""Watcher that detects new and changed objects in the S3 database."""
+
+import datetime
+import time
+
+# the first poll is done shortly after the watcher started to wait
+MIN_POLL_INTERVAL = 0.1
+
+# poll interval grows up to this value while nothing is changing
+MAX_POLL_INTERVAL = 1.0
+
+# poll interval is multiplied by this value after each poll without any change
+BACKOFF = 1.5
+
+
+class S3Watcher:
+    """Detect new and changed objects by listing all objects with given key prefix at once.
+
+    Objects are compared by ETag and LastModified attributes against the
+    state remembered by snapshot(), so objects written by previous analyses
+    are not reported. The poll interval is reset to the minimum each time
+    any object is changed, as the analysis is then likely to finish soon.
+    """
+
+    def __init__(self, s3, bucket_name, prefix, min_interval=MIN_POLL_INTERVAL,
+                 max_interval=MAX_POLL_INTERVAL, backoff=BACKOFF, key_filter=None):
+        """Remember the bucket and key prefix to watch.
+
+        Only keys accepted by key_filter are watched when it is specified, as
+        the prefix might match keys of unrelated objects too.
+        """
+        self.s3 = s3
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self.key_filter = key_filter
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        # key -> (ETag, LastModified)
+        self.objects = {}
+        # key -> time when the change was detected
+        self.changes = {}
+
+    def list_objects(self):
+        """List all watched objects, return dict key -> (ETag, LastModified)."""
+        objects = self.s3.list_objects(self.bucket_name, self.prefix)
+        if self.key_filter is None:
+            return objects
+        return {key: state for key, state in objects.items() if self.key_filter(key)}
+
+    def snapshot(self):
+        """Remember the current state of all objects, changes are detected against this state."""
+        self.objects = self.list_objects()
+        self.changes = {}
+
+    def poll(self):
+        """List all objects once, record and return keys of new or changed objects."""
+        objects = self.list_objects()
+        detected_at = datetime.datetime.utcnow()
+        changed = [key for key, state in objects.items()
+                   if self.objects.get(key) != state and key not in self.changes]
+        for key in changed:
+            self.changes[key] = detected_at
+        self.objects.update(objects)
+        return changed
+
+    def wait_for(self, key, timeout):
+        """Wait until the object with given key is new or changed, return False on timeout."""
+        deadline = time.perf_counter() + timeout
+        interval = self.min_interval
+        while key not in self.changes:
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(interval)
+            if self.poll():
+                interval = self.min_interval
+            else:
+                interval = min(interval * self.backoff, self.max_interval)
+        return True
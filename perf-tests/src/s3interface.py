@@ -3,23 +3,32 @@
 import boto3
 import botocore
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 import json
 
+# maximum number of objects read from the S3 database concurrently
+MAX_PARALLEL_READS = 16
+
+# attribute with the audit node in analysis results
+AUDIT_ATTRIBUTE = '"_audit"'
+
 
 class S3Interface():
     """Interface to the AWS S3 database."""
 
     def __init__(self, aws_access_key_id, aws_secret_access_key, s3_region_name,
-                 deployment_prefix):
+                 deployment_prefix, endpoint_url=None):
         """Create a new interface to the AWS S3.
 
         Remember the access key, secret access key, region, and deployment
-        prefix that will be used later to connect to the AWS S3.
+        prefix that will be used later to connect to the AWS S3. The endpoint
+        URL is needed only for S3-compatible services other than AWS S3.
         """
         self.aws_access_key_id = aws_access_key_id
         self.aws_secret_access_key = aws_secret_access_key
         self.s3_region_name = s3_region_name
         self.deployment_prefix = deployment_prefix
+        self.endpoint_url = endpoint_url
 
         # to be set up by the connect() method
         self.s3_resource = None
@@ -49,7 +58,7 @@ class S3Interface():
         assert self.s3_session is not None
 
         use_ssl = True
-        endpoint_url = None
+        endpoint_url = self.endpoint_url
 
         # retrieve the bucket resource and check if the operation was successful
         self.s3_resource = self.s3_session.resource(
@@ -129,3 +138,60 @@ class S3Interface():
         assert s3 is not None
         data = s3.Object(self.full_bucket_name(bucket_name), key).get()[attribute]
         return data
+
+    def list_objects(self, bucket_name, prefix):
+        """Read ETag and LastModified of all objects with given key prefix by bulk listing.
+
+        Return dict key -> (ETag, LastModified).
+        """
+        s3 = self.s3_resource
+        assert s3 is not None
+        paginator = s3.meta.client.get_paginator('list_objects_v2')
+        objects = {}
+        for page in paginator.paginate(Bucket=self.full_bucket_name(bucket_name), Prefix=prefix):
+            for item in page.get('Contents', []):
+                objects[item['Key']] = (item['ETag'], item['LastModified'])
+        return objects
+
+    @staticmethod
+    def parse_audit(data):
+        """Parse just the audit node from the analysis result.
+
+        The whole document needs to be parsed only when the audit attribute
+        is not unique, as it could be found in a nested node.
+        """
+        position = data.find(AUDIT_ATTRIBUTE)
+        if position >= 0 and data.find(AUDIT_ATTRIBUTE, position + 1) < 0:
+            try:
+                position = data.index(":", position + len(AUDIT_ATTRIBUTE)) + 1
+                while data[position].isspace():
+                    position += 1
+                return json.JSONDecoder().raw_decode(data, position)[0]
+            except (ValueError, IndexError):
+                pass
+        return json.loads(data).get("_audit")
+
+    def read_object_audit(self, client, bucket_name, key):
+        """Read the analysis result and return its audit node, None if it can't be read."""
+        try:
+            response = client.get_object(Bucket=self.full_bucket_name(bucket_name), Key=key)
+        except ClientError:
+            return None
+        return S3Interface.parse_audit(response['Body'].read().decode())
+
+    def read_objects_audit(self, bucket_name, keys):
+        """Read audit nodes from all given analysis results concurrently.
+
+        Return dict key -> audit node, the node is None for results that can't be read.
+        All threads share one client, as boto3 clients (unlike resources) are thread safe.
+        """
+        s3 = self.s3_resource
+        assert s3 is not None
+        client = s3.meta.client
+        keys = list(keys)
+        if not keys:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_READS, len(keys))) as executor:
+            audits = executor.map(lambda key: self.read_object_audit(client, bucket_name, key),
+                                  keys)
+            return dict(zip(keys, audits))
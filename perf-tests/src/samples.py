@@ -0,0 +1,217 @@
+"""Columnar storage of measurements backed by NumPy arrays."""
+
+import datetime
+import math
+
+import numpy as np
+
+import http_timing
+
+# initial capacity of columns, it is doubled each time the columns are full
+INITIAL_CAPACITY = 64
+
+# thread ID stored for measurements made outside of any benchmark thread
+NO_THREAD = -1
+
+STATUS_FAILED = 0
+STATUS_OK = 1
+
+# default confidence level of the median confidence interval
+CONFIDENCE = 0.95
+
+# supported confidence levels -> two-sided quantiles of the standard normal distribution
+Z_VALUES = {0.90: 1.644854, 0.95: 1.959964, 0.99: 2.575829}
+
+# measurements with modified Z-score (based on MAD) above this value are flagged as outliers
+OUTLIER_THRESHOLD = 3.5
+
+# modified Z-score = MAD_SCALE * (value - median) / MAD, see Iglewicz and Hoaglin
+MAD_SCALE = 0.6745
+
+# column name -> NumPy type
+COLUMNS = [("started_at", np.float64),
+           ("finished_at", np.float64),
+           ("delta", np.float64),
+           ("thread_id", np.int32),
+           ("status", np.int8)]
+
+# phases are stored in their own columns, NaN means the phase was not measured
+PHASE_COLUMNS = [(phase, np.float64) for phase in http_timing.PHASES]
+
+
+class Measurements:
+    """Measurements stored in columns: start, end, delta, thread ID, status, and HTTP phases.
+
+    Each measurement can still be accessed as dict by its index (and by
+    iteration), so the code that expects list of dicts keeps working.
+    Column arrays are accessed by name, e.g. measurements["delta"].
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        """Prepare empty columns."""
+        self._size = 0
+        self._columns = {name: np.empty(capacity, dtype=dtype)
+                         for name, dtype in COLUMNS + PHASE_COLUMNS}
+
+    def _grow(self):
+        """Double the capacity of all columns."""
+        for name, column in self._columns.items():
+            grown = np.empty(max(INITIAL_CAPACITY, 2 * len(column)), dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def append(self, started_at, finished_at, delta, thread_id=None, status=STATUS_OK,
+               phases=None):
+        """Append one measurement, times are in seconds since the epoch."""
+        if self._size == len(self._columns["delta"]):
+            self._grow()
+        i = self._size
+        columns = self._columns
+        columns["started_at"][i] = started_at
+        columns["finished_at"][i] = finished_at
+        columns["delta"][i] = delta
+        columns["thread_id"][i] = NO_THREAD if thread_id is None else thread_id
+        columns["status"][i] = status
+        phases = phases or {}
+        for phase in http_timing.PHASES:
+            columns[phase][i] = phases.get(phase, np.nan)
+        self._size += 1
+
+    @staticmethod
+    def concatenate(parts):
+        """Merge measurements, typically the ones made by all threads."""
+        merged = Measurements(0)
+        merged._size = sum(len(part) for part in parts)
+        for name in merged._columns:
+            merged._columns[name] = np.concatenate(
+                [part._columns[name][:len(part)] for part in parts] or
+                [merged._columns[name]])
+        return merged
+
+    def __len__(self):
+        """Return number of measurements."""
+        return self._size
+
+    def __getitem__(self, key):
+        """Return column by its name, or one measurement as dict by its index."""
+        if isinstance(key, str):
+            return self._columns[key][:self._size]
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError("measurement index out of range")
+        return self.as_dict(key)
+
+    def __iter__(self):
+        """Iterate over all measurements as dicts."""
+        for i in range(self._size):
+            yield self.as_dict(i)
+
+    def as_dict(self, i):
+        """Return one measurement as dict in the same form as measure() used to return."""
+        columns = self._columns
+        thread_id = int(columns["thread_id"][i])
+        return {"measurement_number": i,
+                "started_at": datetime.datetime.utcfromtimestamp(columns["started_at"][i]),
+                "finished_at": datetime.datetime.utcfromtimestamp(columns["finished_at"][i]),
+                "delta": float(columns["delta"][i]),
+                "thread_id": None if thread_id == NO_THREAD else thread_id,
+                "status": int(columns["status"][i]),
+                "phases": {phase: float(columns[phase][i]) for phase in http_timing.PHASES
+                           if not np.isnan(columns[phase][i])}}
+
+    def successful(self):
+        """Return only measurements that passed the check."""
+        selected = self["status"] == STATUS_OK
+        result = Measurements(0)
+        result._size = int(np.count_nonzero(selected))
+        for name in self._columns:
+            result._columns[name] = self[name][selected]
+        return result
+
+    def has_phases(self):
+        """Check if any HTTP call phase was measured."""
+        return any(not np.all(np.isnan(self[phase])) for phase in http_timing.PHASES)
+
+    def percentiles(self, percentiles, column="delta"):
+        """Compute given percentiles of the column, each in range 0..100."""
+        values = self[column]
+        if len(values) == 0:
+            return [None] * len(percentiles)
+        return np.percentile(values, percentiles).tolist()
+
+    def summary(self, column="delta"):
+        """Compute count, min, max, avg, and p50/p90/p99 of the column."""
+        values = self[column]
+        if len(values) == 0:
+            return {"count": 0, "min": None, "max": None, "avg": None,
+                    "p50": None, "p90": None, "p99": None}
+        p50, p90, p99 = self.percentiles([50, 90, 99], column)
+        return {"count": len(values),
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "avg": float(values.mean()),
+                "p50": p50, "p90": p90, "p99": p99}
+
+    def per_thread(self, column="delta"):
+        """Compute count, min, max, and avg of the column for each thread.
+
+        Return dict thread ID -> statistic.
+        """
+        values = self[column]
+        thread_ids, inverse, counts = np.unique(self["thread_id"], return_inverse=True,
+                                                return_counts=True)
+        sums = np.bincount(inverse, weights=values, minlength=len(thread_ids))
+        # merge sort is stable, so the order of measurements within each thread is kept
+        order = np.argsort(inverse, kind="mergesort")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.intp)
+        mins = np.minimum.reduceat(values[order], starts) if len(values) else []
+        maxs = np.maximum.reduceat(values[order], starts) if len(values) else []
+        return {(None if t == NO_THREAD else int(t)):
+                {"count": int(c), "min": float(mi), "max": float(ma), "avg": float(s / c)}
+                for t, c, s, mi, ma in zip(thread_ids, counts, sums, mins, maxs)}
+
+    def median_confidence_interval(self, confidence=CONFIDENCE, column="delta"):
+        """Compute distribution-free confidence interval of the median of the column.
+
+        The interval is given by order statistics, so it holds for skewed
+        latency distributions too. Confidence needs to be one of Z_VALUES.
+        Return (low, high), None when there are not enough measurements for
+        the requested confidence.
+        """
+        if confidence not in Z_VALUES:
+            raise ValueError("Unsupported confidence {c}, use one of {s}".format(
+                c=confidence, s=", ".join(str(c) for c in sorted(Z_VALUES))))
+        values = np.sort(self[column])
+        n = len(values)
+        z = Z_VALUES[confidence]
+        # 1-based ranks of the order statistics
+        low = int(math.floor(n / 2 - z * math.sqrt(n) / 2))
+        high = int(math.ceil(1 + n / 2 + z * math.sqrt(n) / 2))
+        if low < 1 or high > n:
+            return None
+        return float(values[low - 1]), float(values[high - 1])
+
+    def relative_median_ci_width(self, confidence=CONFIDENCE, column="delta"):
+        """Compute width of the median confidence interval relative to the median."""
+        interval = self.median_confidence_interval(confidence, column)
+        median = float(np.median(self[column])) if len(self) else 0.0
+        if interval is None or median <= 0:
+            return None
+        return (interval[1] - interval[0]) / median
+
+    def outliers(self, threshold=OUTLIER_THRESHOLD, column="delta"):
+        """Flag outliers by the modified Z-score computed from median absolute deviation."""
+        values = self[column]
+        if len(values) == 0:
+            return np.zeros(0, dtype=bool)
+        deviations = np.abs(values - np.median(values))
+        mad = np.median(deviations)
+        if mad == 0:
+            # more than half of values are the same, so nothing can be flagged reliably
+            return np.zeros(len(values), dtype=bool)
+        return MAD_SCALE * deviations / mad > threshold
+
+    def histogram(self, bins=20, column="delta"):
+        """Compute histogram of the column, return (counts, bin edges)."""
+        return np.histogram(self[column], bins=bins)
@@ -0,0 +1,102 @@
+"""Warm-up and adaptive sampling for sequenced benchmarks."""
+
+from samples import Measurements, CONFIDENCE, OUTLIER_THRESHOLD
+
+# calls made (and discarded) before the measurement, they pay for connection setup and cold caches
+WARMUP_CALLS = 0
+
+# adaptive sampling makes at most this multiple of the requested number of calls
+MAX_CALLS_FACTOR = 4
+
+
+class SamplingSettings:
+    """Settings of warm-up and adaptive sampling."""
+
+    def __init__(self, warmup=WARMUP_CALLS, ci_target=None, max_calls=None,
+                 confidence=CONFIDENCE, outlier_threshold=OUTLIER_THRESHOLD):
+        """Remember all settings, sampling is not adaptive when ci_target is None.
+
+        ci_target is the width of the median confidence interval relative to
+        the median, for example 0.05 for +-2.5 %.
+        """
+        self.warmup = warmup
+        self.ci_target = ci_target
+        self.max_calls = max_calls
+        self.confidence = confidence
+        self.outlier_threshold = outlier_threshold
+
+    def call_limit(self, measurement_count):
+        """Return maximum number of measured calls for adaptive sampling."""
+        return self.max_calls or MAX_CALLS_FACTOR * measurement_count
+
+
+# settings used by the current run
+_settings = SamplingSettings()
+
+
+def configure(settings):
+    """Set warm-up and adaptive sampling settings used by all sequenced benchmarks."""
+    global _settings
+    _settings = settings
+
+
+def current_settings():
+    """Return settings used by the current run."""
+    return _settings
+
+
+def sample(function, api, s3, measurement_count, pause_time, settings=None):
+    """Make warm-up calls, then measure until the median confidence interval is narrow enough.
+
+    The function is called as function(api, s3, count, pause_time, first_index),
+    warm-up calls and all batches of measured calls get their own ranges of
+    call indexes. Return measurements and debug data in the same form as the
+    measured function.
+    """
+    settings = settings or _settings
+    if settings.warmup > 0:
+        print("Warm-up: {n} calls are not measured".format(n=settings.warmup))
+        function(api, s3, settings.warmup, pause_time, 0)
+    # measured calls are indexed after the warm-up calls
+    first_index = settings.warmup
+
+    values, debug = function(api, s3, measurement_count, pause_time, first_index)
+    if settings.ci_target is None:
+        return values, debug
+
+    parts = [values]
+    # calls are added in batches, the interval is checked after each batch
+    batch = max(1, measurement_count // 2)
+    call_limit = settings.call_limit(measurement_count)
+    while True:
+        width = values.relative_median_ci_width(settings.confidence)
+        if width is not None and width <= settings.ci_target:
+            print("Median CI width {w:.1%} reached after {n} calls".format(
+                w=width, n=len(values)))
+            break
+        if len(values) >= call_limit:
+            print("Median CI width {w} not reached the target {t:.1%} after {n} calls".format(
+                w="N/A" if width is None else "{w:.1%}".format(w=width),
+                t=settings.ci_target, n=len(values)))
+            break
+        more_values, more_debug = function(api, s3, min(batch, call_limit - len(values)),
+                                           pause_time, first_index + len(values))
+        parts.append(more_values)
+        debug.extend(more_debug)
+        values = Measurements.concatenate(parts)
+    return values, debug
+
+
+def print_sampling_statistic(values, outliers, settings=None):
+    """Print median with its confidence interval and flagged outliers."""
+    settings = settings or _settings
+    statistic = values.summary()
+    interval = values.median_confidence_interval(settings.confidence)
+    print("median: {m}".format(m=statistic["p50"]))
+    if interval is not None:
+        print("median {c:.0%} CI: {l} .. {h}".format(c=settings.confidence, l=interval[0],
+                                                     h=interval[1]))
+    flagged = outliers.nonzero()[0]
+    print("outliers (MAD): {n} {i}".format(n=len(flagged), i=(flagged + 1).tolist()))
+    if 0 < len(flagged) < len(values):
+        print("avg without outliers: {a}".format(a=float(values["delta"][~outliers].mean())))
@@ -0,0 +1,166 @@
+"""Scheduler that runs benchmarks for independent backends concurrently."""
+
+import threading
+import time
+
+# backends that can be loaded by benchmarks, benchmarks for the same backend are run sequentially
+BACKEND_CORE_API = "core API"
+BACKEND_JOBS_API = "jobs API"
+BACKEND_GREMLIN = "Gremlin"
+
+# only groups of benchmarks are run concurrently, so benchmarks that load the same backend on
+# the server side need to be in one group; stack and component analyses query the graph
+# database, so they share the group with Gremlin benchmarks
+GROUP_GRAPH_DB = "graph DB"
+
+# liveness endpoints of the core and jobs APIs don't touch the graph database, so they are
+# independent of each other and of the graph DB group
+GROUP_CORE_API = BACKEND_CORE_API
+GROUP_JOBS_API = BACKEND_JOBS_API
+
+# fixed pause used when the backend can't be probed
+BREATHE_PAUSE = 5
+
+# the backend is quiet when the probe latency is within this multiple of latency measured
+# before the benchmarks were started
+QUIET_TOLERANCE = 1.5
+
+# number of consecutive quiet probes, also number of probes used to measure baseline latency
+QUIET_PROBES = 3
+
+# pause between two probes
+QUIET_PROBE_INTERVAL = 0.2
+
+# maximum time to wait for the backend to be quiet
+QUIET_MAX_WAIT = 30
+
+
+class QuietDetector:
+    """Detect that the backend settled down after the benchmark by probing its cheap endpoint."""
+
+    def __init__(self, name, probe, max_wait=QUIET_MAX_WAIT, tolerance=QUIET_TOLERANCE,
+                 probes=QUIET_PROBES, probe_interval=QUIET_PROBE_INTERVAL):
+        """Remember the probe, the baseline latency needs to be measured by calibrate()."""
+        self.name = name
+        self.probe = probe
+        self.max_wait = max_wait
+        self.tolerance = tolerance
+        self.probes = probes
+        self.probe_interval = probe_interval
+        self.baseline = None
+
+    def probe_latency(self):
+        """Call the probe once and return its latency, None if the backend is not available."""
+        t1 = time.perf_counter()
+        try:
+            self.probe()
+        except Exception:
+            return None
+        return time.perf_counter() - t1
+
+    def calibrate(self):
+        """Measure the baseline latency of the idle backend."""
+        latencies = []
+        for _ in range(self.probes):
+            latency = self.probe_latency()
+            if latency is not None:
+                latencies.append(latency)
+            time.sleep(self.probe_interval)
+        if latencies:
+            self.baseline = sorted(latencies)[len(latencies) // 2]
+            print("{n}: baseline probe latency {l:.3f} s".format(n=self.name, l=self.baseline))
+        else:
+            print("{n}: can not be probed, fixed pause will be used".format(n=self.name))
+
+    def wait(self):
+        """Wait until the backend is quiet, return the time spent by waiting."""
+        t1 = time.perf_counter()
+        if self.baseline is None:
+            time.sleep(BREATHE_PAUSE)
+            return time.perf_counter() - t1
+
+        limit = self.baseline * self.tolerance
+        quiet = 0
+        while quiet < self.probes:
+            waited = time.perf_counter() - t1
+            if waited > self.max_wait:
+                print("{n}: not quiet after {w:.1f} s, continuing".format(n=self.name, w=waited))
+                return waited
+            latency = self.probe_latency()
+            quiet = quiet + 1 if latency is not None and latency <= limit else 0
+            time.sleep(self.probe_interval)
+
+        waited = time.perf_counter() - t1
+        print("{n}: quiet after {w:.1f} s".format(n=self.name, w=waited))
+        return waited
+
+
+# quiet detectors for all calibrated APIs
+_quiet_detectors = {}
+
+
+def register_quiet_detector(api, name, max_wait=QUIET_MAX_WAIT):
+    """Prepare and calibrate quiet detector for the API, needs to be done while it is idle."""
+    detector = QuietDetector(name, api.get, max_wait)
+    detector.calibrate()
+    _quiet_detectors[api] = detector
+
+
+def breathe(api, message="Breathe..."):
+    """Wait until the backend used by the benchmark is quiet."""
+    print(message)
+    detector = _quiet_detectors.get(api)
+    if detector is None:
+        time.sleep(BREATHE_PAUSE)
+    else:
+        detector.wait()
+
+
+class BenchmarkScheduler:
+    """Run benchmarks grouped by backend, each group in its own thread.
+
+    Benchmarks in one group share the backend (even indirectly, as analyses
+    share the graph database with Gremlin queries), so they are still run
+    sequentially, otherwise they would influence each other.
+    """
+
+    def __init__(self):
+        """Prepare the scheduler without any benchmark."""
+        self.groups = {}
+        self.failures = []
+        self._lock = threading.Lock()
+
+    def add(self, backend, name, function, *args):
+        """Schedule the benchmark function to be called with given arguments."""
+        self.groups.setdefault(backend, []).append((name, function, args))
+
+    def run_group(self, backend, benchmarks):
+        """Run all benchmarks for one backend sequentially."""
+        for name, function, args in benchmarks:
+            print("{b}: starting {n}".format(b=backend, n=name))
+            t1 = time.perf_counter()
+            try:
+                function(*args)
+            except Exception as e:
+                print("{b}: {n} failed: {e!r}".format(b=backend, n=name, e=e))
+                with self._lock:
+                    self.failures.append(name)
+                continue
+            duration = time.perf_counter() - t1
+            print("{b}: {n} finished in {t:.1f} s".format(b=backend, n=name, t=duration))
+
+    def run(self, concurrently=True):
+        """Run all scheduled benchmarks and return names of the failed ones."""
+        t1 = time.perf_counter()
+        if concurrently:
+            threads = [threading.Thread(target=self.run_group, args=(backend, benchmarks))
+                       for backend, benchmarks in self.groups.items()]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        else:
+            for backend, benchmarks in self.groups.items():
+                self.run_group(backend, benchmarks)
+        print("All benchmarks finished in {t:.1f} s".format(t=time.perf_counter() - t1))
+        return self.failures
@@ -0,0 +1,238 @@
+"""Thread count sweep that finds the saturation point of the tested service."""
+
+import csv
+import math
+import queue
+import threading
+import time
+
+import numpy as np
+
+import graph
+import resource_sampler
+import result_store
+import scheduler
+from samples import Measurements
+
+# each step raises the number of threads by this factor (at least by one)
+SWEEP_FACTOR = 1.5
+
+# calls made by each thread in one step
+SWEEP_CALLS_PER_THREAD = 5
+
+# throughput needs to grow at least by this ratio, otherwise the step does not count as growth
+GROWTH_THRESHOLD = 0.05
+
+# number of steps without throughput growth after which the sweep stops
+PATIENCE = 2
+
+# the sweep is stopped by throughput or latency, this limit only prevents runaway sweeps
+SWEEP_THREAD_MAX = 1000
+
+
+class SweepSettings:
+    """Settings of the thread count sweep."""
+
+    def __init__(self, thread_min=1, thread_max=SWEEP_THREAD_MAX, p99_limit=None,
+                 calls_per_thread=SWEEP_CALLS_PER_THREAD, growth_threshold=GROWTH_THRESHOLD,
+                 patience=PATIENCE, factor=SWEEP_FACTOR):
+        """Remember all settings, sweep is not limited by latency when p99_limit is None."""
+        self.thread_min = thread_min
+        self.thread_max = thread_max
+        self.p99_limit = p99_limit
+        self.calls_per_thread = calls_per_thread
+        self.growth_threshold = growth_threshold
+        self.patience = patience
+        self.factor = factor
+
+    def next_thread_count(self, thread_count):
+        """Compute the number of threads for the next step."""
+        return max(thread_count + 1, int(thread_count * self.factor))
+
+
+class SweepStep:
+    """Results measured with one thread count."""
+
+    def __init__(self, thread_count, measurements, duration):
+        """Compute throughput and latency statistic from successful measurements."""
+        self.thread_count = thread_count
+        self.values = measurements["delta"].tolist()
+        self.duration = duration
+        self.throughput = len(measurements) / duration if duration > 0 else 0.0
+        statistic = measurements.summary()
+        self.p50 = statistic["p50"]
+        self.p99 = statistic["p99"]
+        self.min_time = statistic["min"]
+        self.max_time = statistic["max"]
+        self.avg_time = statistic["avg"]
+
+
+def fit_usl(thread_counts, throughputs):
+    """Fit Universal Scalability Law to the measured throughputs.
+
+    X(N) = lambda * N / (1 + sigma * (N - 1) + kappa * N * (N - 1)), so N / X(N)
+    is linear in (1, N - 1, N * (N - 1)) and ordinary least squares is used.
+    Return (lambda, sigma, kappa), None when there are not enough data.
+    """
+    n = np.array(thread_counts, dtype=float)
+    x = np.array(throughputs, dtype=float)
+    valid = x > 0
+    if np.count_nonzero(valid) < 3:
+        return None
+    n = n[valid]
+    x = x[valid]
+    matrix = np.column_stack((np.ones_like(n), n - 1, n * (n - 1)))
+    (a, b, c), _, _, _ = np.linalg.lstsq(matrix, n / x, rcond=-1)
+    if a <= 0:
+        return None
+    return 1.0 / a, b / a, c / a
+
+
+def usl_throughput(coefficients, thread_count):
+    """Throughput predicted by the Universal Scalability Law."""
+    lambda_, sigma, kappa = coefficients
+    n = np.asarray(thread_count, dtype=float)
+    return lambda_ * n / (1 + sigma * (n - 1) + kappa * n * (n - 1))
+
+
+def usl_peak(coefficients):
+    """Thread count with maximal predicted throughput, None when the throughput does not peak."""
+    _, sigma, kappa = coefficients
+    if kappa <= 0 or sigma >= 1:
+        return None
+    return math.sqrt((1 - sigma) / kappa)
+
+
+def measure_step(api, s3, function_to_call, thread_count, calls_per_thread):
+    """Run given number of threads at once and return durations of all successful calls."""
+    threads = []
+    q = queue.Queue()
+    t1 = time.perf_counter()
+    for thread_id in range(thread_count):
+        t = threading.Thread(target=function_to_call,
+                             args=(api, s3, calls_per_thread, 0, q, thread_id))
+        t.start()
+        threads.append(t)
+    for t in threads:
+        t.join()
+    duration = time.perf_counter() - t1
+
+    parts = []
+    while not q.empty():
+        measurements, _ = q.get()
+        parts.append(measurements)
+    return SweepStep(thread_count, Measurements.concatenate(parts).successful(), duration)
+
+
+def saturation_step(steps, settings):
+    """Return the step with peak throughput, if the throughput stopped growing after it."""
+    best = None
+    steps_without_growth = 0
+    for step in steps:
+        if best is None or step.throughput > best.throughput * (1 + settings.growth_threshold):
+            best = step
+            steps_without_growth = 0
+        else:
+            steps_without_growth += 1
+    return best if steps_without_growth >= settings.patience else None
+
+
+def export_sweep(name, steps, coefficients):
+    """Export results of all steps into CSV file."""
+    with open(name + ".csv", "w") as csvfile:
+        csv_writer = csv.writer(csvfile)
+        csv_writer.writerow(["Threads", "Calls", "Throughput", "p50", "p99", "min", "max", "avg",
+                             "USL throughput"])
+        for step in steps:
+            predicted = usl_throughput(coefficients, step.thread_count) if coefficients else None
+            csv_writer.writerow([step.thread_count, len(step.values), step.throughput, step.p50,
+                                 step.p99, step.min_time, step.max_time, step.avg_time,
+                                 predicted])
+
+
+def stop_reason(steps, settings):
+    """Check whether the sweep should stop after the last step.
+
+    Return reason and saturation step, reason is None when the sweep continues.
+    """
+    step = steps[-1]
+    if not step.values:
+        return "all calls failed", None
+    if settings.p99_limit is not None and step.p99 > settings.p99_limit:
+        # the last step that still met the latency limit
+        return "p99 latency limit exceeded", steps[-2] if len(steps) > 1 else None
+    saturation = saturation_step(steps, settings)
+    if saturation is not None:
+        return "throughput stopped growing", saturation
+    if settings.next_thread_count(step.thread_count) > settings.thread_max:
+        return "maximum number of threads reached", None
+    return None, None
+
+
+def sweep_steps(api, s3, name, function_to_call, settings):
+    """Measure steps with growing number of threads, return steps, stop reason, and saturation.
+
+    The backend is given time to settle down between steps, so calls left
+    over from one step don't slow down the next one.
+    """
+    steps = []
+    thread_count = settings.thread_min
+    while True:
+        step = measure_step(api, s3, function_to_call, thread_count, settings.calls_per_thread)
+        steps.append(step)
+        print("threads: {t}    calls: {c}    throughput: {x:.2f}/s    p99: {p}".format(
+            t=thread_count, c=len(step.values), x=step.throughput,
+            p="N/A" if step.p99 is None else "{p:.3f} s".format(p=step.p99)))
+        result_store.record_measurements(name, thread_count, step.values)
+        result_store.record_summary(name, thread_count, step.min_time, step.max_time,
+                                    step.avg_time)
+        reason, saturation = stop_reason(steps, settings)
+        if reason is not None:
+            return steps, reason, saturation
+        scheduler.breathe(api, "Breathe (sweep step)...")
+        thread_count = settings.next_thread_count(thread_count)
+
+
+def print_sweep_result(reason, peak, saturation, coefficients):
+    """Print why the sweep stopped, the peak and saturation points, and the USL fit."""
+    print("Sweep stopped: " + reason)
+    print("Peak throughput: {x:.2f}/s with {t} threads".format(
+        x=peak.throughput, t=peak.thread_count))
+    if saturation is not None:
+        print("Saturation point: {t} threads".format(t=saturation.thread_count))
+    if coefficients is not None:
+        print("USL fit: lambda={l:.3f}/s  sigma={s:.4f}  kappa={k:.5f}".format(
+            l=coefficients[0], s=coefficients[1], k=coefficients[2]))
+        n_peak = usl_peak(coefficients)
+        if n_peak is not None:
+            print("USL predicted peak: {x:.2f}/s with {n:.1f} threads".format(
+                x=usl_throughput(coefficients, n_peak), n=n_peak))
+
+
+def run_sweep(api, s3, message, name_prefix, function_to_call, settings):
+    """Raise number of threads until throughput stops growing or p99 latency exceeds the limit."""
+    name = name_prefix + "_sweep"
+    print(message + " thread count sweep")
+    since = resource_sampler.mark()
+    steps, reason, saturation = sweep_steps(api, s3, name, function_to_call, settings)
+
+    measured = [step for step in steps if step.values]
+    if not measured:
+        print("No successful calls, sweep can't be evaluated")
+        return None
+
+    peak = max(measured, key=lambda step: step.throughput)
+    coefficients = fit_usl([step.thread_count for step in measured],
+                           [step.throughput for step in measured])
+    print_sweep_result(reason, peak, saturation, coefficients)
+
+    export_sweep(name, steps, coefficients)
+    resource_sampler.export(message + " thread count sweep", name, since)
+
+    thread_counts = [step.thread_count for step in measured]
+    fitted_threads = np.linspace(thread_counts[0], thread_counts[-1], 100)
+    fitted = usl_throughput(coefficients, fitted_threads) if coefficients else None
+    graph.generate_throughput_graph("Throughput for " + message, name, thread_counts,
+                                    [step.throughput for step in measured],
+                                    fitted_threads, fitted)
+    return peak, saturation, coefficients
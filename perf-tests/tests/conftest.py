@@ -0,0 +1,6 @@
+"""Configuration for unit tests, modules under test are imported from the src directory."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
@@ -0,0 +1,64 @@
+"""Unit tests for the store of benchmark results."""
+
+import pytest
+
+import result_store
+
+
+def test_round_trip(tmpdir):
+    """Check that results of all runs are read back from the database."""
+    filename = str(tmpdir.join("results.db"))
+    store = result_store.ResultStore(filename)
+    assert store.start_run("run-1", "abc123") == "run-1"
+    store.record_measurements("component analysis", 1, [1.0, 2.0, 3.0])
+    store.record_measurements("component analysis", 1, [50.0], "client_cpu")
+    store.close()
+
+    store = result_store.ResultStore(filename)
+    store.start_run("run-2")
+    store.record_measurements("component analysis", 1, [4.0, 6.0])
+    store.record_measurements("stack analysis", 2, [8.0])
+
+    assert store.benchmarks() == [("component analysis", 1, "client_cpu"),
+                                  ("component analysis", 1, "duration"),
+                                  ("stack analysis", 2, "duration")]
+    trend = store.trend("component analysis")
+    assert [(row[0], row[2]) + row[3:] for row in trend] == [
+        ("run-1", "abc123", 3, 1.0, 2.0, 3.0),
+        ("run-2", None, 2, 4.0, 5.0, 6.0),
+    ]
+    assert store.trend("stack analysis", 1) == []
+    store.close()
+
+
+def test_duplicate_run_id(tmpdir):
+    """Check that run ID can't be reused, and the store is not left open."""
+    filename = str(tmpdir.join("results.db"))
+    result_store.open_store(filename, "run-1")
+    result_store.close_store()
+    with pytest.raises(ValueError):
+        result_store.open_store(filename, "run-1")
+    assert result_store._store is None
+
+
+def test_new_run_ids_unique():
+    """Check that generated run IDs don't repeat."""
+    assert result_store.new_run_id() != result_store.new_run_id()
+
+
+def test_record_without_store():
+    """Check that nothing is recorded when the store is not opened."""
+    result_store.close_store()
+    result_store.record_measurements("component analysis", 1, [1.0])
+    result_store.record_summary("component analysis", 1, 1.0, 1.0, 1.0)
+
+
+def test_tested_git_sha(monkeypatch):
+    """Check that SHA of the tested commit is taken from argument or environment only."""
+    monkeypatch.delenv(result_store.GIT_SHA_VARIABLE, raising=False)
+    assert result_store.tested_git_sha() is None
+    monkeypatch.setenv(result_store.GIT_SHA_VARIABLE, "fromenv")
+    assert result_store.tested_git_sha() == "fromenv"
+    assert result_store.tested_git_sha("explicit") == "explicit"
+    monkeypatch.setenv(result_store.GIT_SHA_VARIABLE, "")
+    assert result_store.tested_git_sha() is None
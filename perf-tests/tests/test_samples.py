@@ -0,0 +1,56 @@
+"""Unit tests for robust statistics of measurements."""
+
+import numpy as np
+import pytest
+
+from samples import Measurements
+
+
+def measurements(values):
+    """Prepare measurements with given durations."""
+    result = Measurements()
+    for i, value in enumerate(values):
+        result.append(float(i), float(i) + value, value)
+    return result
+
+
+def test_outliers_flag_injected_value():
+    """Check that only the injected outlier is flagged."""
+    rng = np.random.RandomState(42)
+    values = list(rng.normal(1.0, 0.05, 200)) + [5.0]
+    flagged = measurements(values).outliers()
+    assert len(flagged) == len(values)
+    assert np.flatnonzero(flagged).tolist() == [200]
+
+
+def test_outliers_without_deviation():
+    """Check that nothing is flagged when most values are the same, or there are no values."""
+    assert not measurements([1.0] * 10 + [5.0]).outliers().any()
+    assert len(measurements([]).outliers()) == 0
+
+
+def test_median_confidence_interval():
+    """Check that the interval contains the median and narrows with more measurements."""
+    rng = np.random.RandomState(42)
+    values = rng.lognormal(0.0, 0.5, 1000)
+    small = measurements(values[:50])
+    large = measurements(values)
+
+    low, high = large.median_confidence_interval()
+    assert low <= np.median(values) <= high
+    assert large.relative_median_ci_width() < small.relative_median_ci_width()
+    assert large.relative_median_ci_width(0.99) > large.relative_median_ci_width(0.90)
+
+
+def test_median_confidence_interval_not_enough_data():
+    """Check that no interval is computed from too few measurements."""
+    few = measurements([1.0, 2.0, 3.0])
+    assert few.median_confidence_interval() is None
+    assert few.relative_median_ci_width() is None
+    assert measurements([]).relative_median_ci_width() is None
+
+
+def test_median_confidence_interval_unsupported_confidence():
+    """Check that only confidence levels with known quantiles are accepted."""
+    with pytest.raises(ValueError):
+        measurements([1.0] * 100).median_confidence_interval(0.5)
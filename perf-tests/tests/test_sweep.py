@@ -0,0 +1,75 @@
+"""Unit tests for the Universal Scalability Law fit and sweep stop conditions."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import sweep
+
+
+def test_fit_usl_recovers_coefficients():
+    """Check that coefficients of throughputs computed from the law itself are recovered."""
+    coefficients = (10.0, 0.05, 0.002)
+    thread_counts = [1, 2, 3, 5, 8, 12, 18, 27, 40]
+    throughputs = sweep.usl_throughput(coefficients, thread_counts)
+
+    fitted = sweep.fit_usl(thread_counts, throughputs)
+    assert fitted == pytest.approx(coefficients, rel=1e-6)
+    assert sweep.usl_peak(fitted) == pytest.approx(np.sqrt(0.95 / 0.002), rel=1e-6)
+
+
+def test_fit_usl_noisy_data():
+    """Check that the fit stays close to the coefficients when throughputs are noisy."""
+    coefficients = (10.0, 0.05, 0.002)
+    thread_counts = np.arange(1, 60)
+    rng = np.random.RandomState(42)
+    throughputs = sweep.usl_throughput(coefficients, thread_counts) * \
+        rng.uniform(0.98, 1.02, len(thread_counts))
+
+    lambda_, sigma, kappa = sweep.fit_usl(thread_counts, throughputs)
+    assert lambda_ == pytest.approx(10.0, rel=0.05)
+    assert sweep.usl_peak((lambda_, sigma, kappa)) == pytest.approx(21.8, rel=0.1)
+
+
+def test_fit_usl_not_enough_data():
+    """Check that at least three steps with non-zero throughput are needed."""
+    assert sweep.fit_usl([1, 2], [10.0, 19.0]) is None
+    assert sweep.fit_usl([1, 2, 4], [10.0, 19.0, 0.0]) is None
+
+
+def test_usl_peak_without_retrograde():
+    """Check that throughput without coherency penalty does not peak."""
+    assert sweep.usl_peak((10.0, 0.1, 0.0)) is None
+    assert sweep.usl_peak((10.0, 1.0, 0.01)) is None
+
+
+def steps(*throughputs):
+    """Prepare steps with given throughputs and one thread more in each step."""
+    return [SimpleNamespace(thread_count=i + 1, throughput=throughput, values=[1.0], p99=1.0)
+            for i, throughput in enumerate(throughputs)]
+
+
+def test_saturation_step():
+    """Check that the step with peak throughput is found after patience steps."""
+    settings = sweep.SweepSettings(patience=2, growth_threshold=0.05)
+    assert sweep.saturation_step(steps(10, 20, 30), settings) is None
+    assert sweep.saturation_step(steps(10, 20, 30, 31), settings) is None
+    assert sweep.saturation_step(steps(10, 20, 30, 31, 29), settings).thread_count == 3
+
+
+def test_stop_reason():
+    """Check all reasons why the sweep stops."""
+    settings = sweep.SweepSettings(thread_max=3, p99_limit=2.0)
+    assert sweep.stop_reason(steps(10, 20), settings) == (None, None)
+
+    measured = steps(10, 20, 30)
+    assert sweep.stop_reason(measured, settings) == ("maximum number of threads reached", None)
+
+    measured[-1].p99 = 3.0
+    reason, saturation = sweep.stop_reason(measured, settings)
+    assert reason == "p99 latency limit exceeded"
+    assert saturation is measured[-2]
+
+    measured[-1].values = []
+    assert sweep.stop_reason(measured, settings) == ("all calls failed", None)